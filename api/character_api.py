@@ -4,7 +4,7 @@ SYNK MVP - 캐릭터 CRUD 엔드포인트
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from sqlalchemy.orm import Session
 
 from models.character import CharacterPersona, Location
@@ -20,6 +20,8 @@ from db.character_db import (
     get_location,
     get_all_locations,
 )
+from core.phrase_bank import phrase_bank, save_phrase_bank, PHRASE_SOURCE_FIELDS
+from utils.generation_profiles import validate_generation_overrides
 
 router = APIRouter(prefix="/api/character", tags=["character"])
 
@@ -48,6 +50,12 @@ class CharacterCreateRequest(BaseModel):
     default_emotion: str = "neutral"
     default_posture: str = "standing"
     voice_tone: str = "normal"
+    generation_overrides: dict = {}
+    
+    @field_validator("generation_overrides")
+    @classmethod
+    def check_generation_overrides(cls, value):
+        return validate_generation_overrides(value)
 
 
 class CharacterUpdateRequest(BaseModel):
@@ -69,6 +77,12 @@ class CharacterUpdateRequest(BaseModel):
     default_emotion: Optional[str] = None
     default_posture: Optional[str] = None
     voice_tone: Optional[str] = None
+    generation_overrides: Optional[dict] = None
+    
+    @field_validator("generation_overrides")
+    @classmethod
+    def check_generation_overrides(cls, value):
+        return validate_generation_overrides(value)
 
 
 class LocationCreateRequest(BaseModel):
@@ -97,6 +111,7 @@ async def api_create_character(
     
     char = CharacterPersona(**request.dict())
     created = create_character(char, db)
+    save_phrase_bank(created, db)
     
     return {
         "success": True,
@@ -139,6 +154,24 @@ async def api_get_all_characters(
     }
 
 
+@router.get("/{character_id}/phrases", response_model=dict)
+async def api_get_character_phrases(
+    character_id: str,
+    db: Session = Depends(get_db)
+):
+    """캐릭터 말투 문구 조회 (서브 리액션용, 분위기/감정 태그 포함)"""
+    char = get_character(character_id, db)
+    if not char:
+        raise HTTPException(status_code=404, detail=f"캐릭터 '{character_id}'를 찾을 수 없습니다.")
+    
+    phrases = phrase_bank.get(char)
+    return {
+        "success": True,
+        "count": len(phrases),
+        "phrases": [p.dict() for p in phrases]
+    }
+
+
 @router.put("/{character_id}", response_model=dict)
 async def api_update_character(
     character_id: str,
@@ -155,6 +188,8 @@ async def api_update_character(
     updated = update_character(character_id, updates, db)
     if not updated:
         raise HTTPException(status_code=404, detail=f"캐릭터 '{character_id}'를 찾을 수 없습니다.")
+    if PHRASE_SOURCE_FIELDS & updates.keys():
+        save_phrase_bank(updated, db)
     
     return {
         "success": True,
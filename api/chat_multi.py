@@ -2,30 +2,75 @@
 멀티 캐릭터 채팅 API
 씬 리액션 시스템: 여러 캐릭터가 동시에/순차적으로 반응
 """
+import json
+import re
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Optional, List, Dict
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional, List, Dict, Tuple, Callable, Awaitable, Set
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from db.character_db import get_db, get_characters_by_location, get_location
-from db.database import get_relationship_data, save_story_summary, get_recent_story_summaries
+from db.character_db import get_db, get_characters_by_location, get_location, SessionLocal
+from db.database import save_story_summary, get_recent_story_summaries
 from core.speaker_selector import ConversationHistory, build_conversation_context
 from core.scene_manager import scene_manager
 from core.data_collector import process_turn
 from core.user_profile_extractor import update_user_profile_from_message
-from core.scene_reaction import generate_scene_reaction, SceneReactionResult
+from core.scene_reaction import (
+    generate_scene_reaction,
+    get_cached_relationship_data,
+    MainResponse,
+    SceneReactionResult,
+    EventCallback
+)
 from core.story_analyzer import generate_story_summary, build_story_context_for_prompt
+from core.idempotency import idempotency_store, make_request_fingerprint
+from core.turn_coordinator import turn_coordinator, run_until_disconnected
+from core.turn_deadline import TurnDeadline, run_within
+from core.lazy_inner_thoughts import inner_thought_store, lazy_inner_thoughts, is_inner_thought_handle
+from core.phrase_bank import phrase_bank
+from utils.config import get_turn_deadline_seconds, is_lazy_inner_thoughts_enabled
+from utils.tracer import start_trace, span, trace_store
+from utils.metrics import metrics
+from utils.logger import get_logger, log_context
+from utils.token_accounting import usage_tags
+from utils.profiler import bind_profile_turn
 import asyncio
-from models.character import CharacterPersona
-from models.scene_context import CharacterAttention
+from models.character import CharacterPersona, Location
+from models.relationship import RelationshipData
+from models.scene_context import SceneContext
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
+logger = get_logger(__name__)
 
 # 세션별 대화 히스토리 저장
 conversation_histories: Dict[str, ConversationHistory] = {}
 
+# 중간에 취소된 턴의 스토리 요약 표시 (ai_analysis 앞에 붙음)
+PARTIAL_TURN_MARKER = "[중단된 턴]"
+
+# 턴 응답과 분리된 백그라운드 작업 (완료 전에 GC되지 않도록 참조 유지)
+_background_tasks: Set[asyncio.Task] = set()
+
+# 대화 히스토리/백그라운드 작업 지표 (/metrics)
+history_bytes = metrics.gauge("conversation_history_bytes", "Approximate in-memory conversation history size")
+background_tasks = metrics.gauge("background_tasks", "Background tasks pending after their turn responded")
+
+
+def _collect_metrics():
+    history_bytes.set(sum(
+        len((turn["message"] or "").encode("utf-8"))
+        for history in list(conversation_histories.values())
+        for turn in history.turns
+    ))
+    background_tasks.set(len(_background_tasks))
+
+
+metrics.on_collect(_collect_metrics)
+
 
 class MultiChatRequest(BaseModel):
     """멀티 캐릭터 채팅 요청"""
@@ -33,6 +78,10 @@ class MultiChatRequest(BaseModel):
     location_id: str
     message: str
     session_id: Optional[str] = None
+    scene_version: Optional[int] = None  # 클라이언트가 마지막으로 받은 씬 버전 (있으면 델타 응답)
+    client_turn_id: Optional[str] = None  # 클라이언트 턴 ID (Idempotency-Key 헤더 대신 사용 가능)
+    supersede: bool = False  # True면 같은 세션에서 진행/대기 중인 이전 턴을 취소하고 이 턴을 처리
+    lazy_inner_thoughts: Optional[bool] = None  # True면 속마음 대신 핸들 반환 (없으면 LAZY_INNER_THOUGHTS)
 
 
 class MultiChatResponse(BaseModel):
@@ -53,14 +102,21 @@ class MultiChatResponse(BaseModel):
     character_name: Optional[str] = None
     character_response: Optional[str] = None
     
-    scene_context: Optional[dict] = None
+    scene_context: Optional[dict] = None  # 전체 스냅샷 (델타 응답 시 None)
+    scene_version: int = 0  # 현재 씬 스냅샷 버전
+    scene_delta: Optional[List[dict]] = None  # scene_version 요청 시 JSON Patch 변경분
+    
+    metadata: dict = {}  # 턴 처리 정보 (load_shedding: 부하로 생략된 단계, degraded_characters: 마감 시간 초과·LLM 차단/오류로 대체된 캐릭터)
 
 
 @router.post("/location/{location_id}", response_model=MultiChatResponse)
 async def chat_in_location(
     location_id: str,
     request: MultiChatRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     """
     특정 장소에서 멀티 캐릭터 대화 (씬 리액션 시스템)
@@ -69,9 +125,232 @@ async def chat_in_location(
     - 메인 응답: 1~2명 (긴 대사)
     - 서브 리액션: 나머지 (짧은 반응)
     - 무반응: 관심 없는 캐릭터 (속마음만)
+    
+    Idempotency-Key 헤더(또는 client_turn_id)가 있으면 재시도 시 저장된 결과를 반환
+    (Idempotent-Replayed: true 헤더 포함)
+    
+    같은 세션의 턴은 도착 순서대로 처리되며, supersede=True 요청에 의해
+    취소된 이전 턴은 409를 반환
+    
+    클라이언트 연결이 끊기면 남은 LLM 호출을 취소하고 이미 생성된 대사까지만 저장
+    
+    Server-Timing 헤더로 단계별 소요 시간 반환 (재생된 응답 제외)
+    """
+    result, replayed = await run_idempotent_chat_turn(
+        location_id, request, db,
+        idempotency_key=idempotency_key,
+        is_disconnected=http_request.is_disconnected
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    else:
+        # 단계별 소요 시간 (상세 스팬 트리는 /api/debug/trace/{turn_id})
+        trace = trace_store.get(result.turn_id)
+        if trace:
+            response.headers["Server-Timing"] = trace.server_timing()
+    return result
+
+
+@router.post("/location/{location_id}/stream")
+async def chat_in_location_stream(
+    location_id: str,
+    request: MultiChatRequest,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    특정 장소에서 멀티 캐릭터 대화 - SSE 스트리밍 버전
+    
+    text/event-stream으로 다음 이벤트를 순서대로 전송:
+    - plan: 반응 계획 (turn_id, session_id, main/sub/ignore 캐릭터)
+    - main_start / token / main_done / main_error: 메인 응답자별 토큰 스트리밍
+    - sub_reaction: 서브 리액션
+    - done: 최종 MultiChatResponse (scene_context 포함)
+    - error: 오류 (status_code, detail)
+    
+    Idempotency-Key로 재시도된 턴은 진행 이벤트 없이 done만 전송
+    
+    스트림이 끊기면 턴을 취소 (같은 키로 결과를 기다리는 재시도 요청이 있으면 유지)
+    """
+    # 장소 확인은 스트림 시작 전에 수행 (404를 HTTP 상태로 반환)
+    if not get_location(location_id, db):
+        raise HTTPException(
+            status_code=404,
+            detail=f"장소 '{location_id}'를 찾을 수 없습니다."
+        )
+    # 요청 세션은 여기까지만 사용 - 스트림이 끝날 때까지 커넥션을 잡고 있지 않도록 반환
+    db.close()
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    store_key = _idempotency_store_key(request, idempotency_key)
+    
+    async def on_event(event: str, data: Dict):
+        await queue.put((event, data))
+    
+    async def run_turn():
+        # 스트리밍 응답은 엔드포인트 반환 후에도 계속되므로 별도 DB 세션 사용
+        turn_db = SessionLocal()
+        try:
+            result, _ = await run_idempotent_chat_turn(
+                location_id, request, turn_db,
+                idempotency_key=idempotency_key,
+                on_event=on_event
+            )
+            await queue.put(("done", result.dict()))
+        except HTTPException as e:
+            await queue.put(("error", {"status_code": e.status_code, "detail": e.detail}))
+        except Exception as e:
+            logger.exception("스트리밍 턴 처리 오류: %s", e)
+            await queue.put(("error", {"status_code": 500, "detail": str(e)[:200]}))
+        finally:
+            turn_db.close()
+            await queue.put(None)
+    
+    async def event_stream():
+        task = asyncio.create_task(run_turn())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                event, data = item
+                yield _format_sse(event, data)
+        finally:
+            # 클라이언트 연결 종료 - 진행 중인 턴 취소 (run_chat_turn이 부분 턴 저장)
+            if not task.done() and not (store_key and idempotency_store.has_waiters(store_key)):
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def run_idempotent_chat_turn(
+    location_id: str,
+    request: MultiChatRequest,
+    db: Session,
+    idempotency_key: Optional[str] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    **turn_kwargs
+) -> Tuple[MultiChatResponse, bool]:
+    """
+    멱등 키가 있으면 결과 재생을 적용하여 턴 처리
+    
+    키는 Idempotency-Key 헤더 또는 요청의 client_turn_id (유저 단위로 구분)
+    같은 세션의 턴은 turn_coordinator로 직렬화 (supersede=True면 이전 턴 취소)
+    
+    Args:
+        is_disconnected: 클라이언트 연결 종료 확인 함수 (주어지면 연결이 끊길 때 턴 취소,
+            단 같은 키로 결과를 기다리는 재시도 요청이 있으면 유지)
+    
+    Returns:
+        (응답, 재생 여부) 튜플
+    """
+    store_key = _idempotency_store_key(request, idempotency_key)
+    
+    def run_in_session_order():
+        turn = turn_coordinator.run(
+            session_id=request.session_id,
+            factory=lambda: run_chat_turn(location_id, request, db, **turn_kwargs),
+            supersede=request.supersede
+        )
+        if is_disconnected is None:
+            return turn
+        return run_until_disconnected(
+            turn,
+            is_disconnected,
+            keep_running=lambda: bool(store_key) and idempotency_store.has_waiters(store_key)
+        )
+    
+    if not store_key:
+        return await run_in_session_order(), False
+    
+    return await idempotency_store.run(
+        key=store_key,
+        fingerprint=make_request_fingerprint(location_id, request.session_id, request.message),
+        factory=run_in_session_order
+    )
+
+
+def _idempotency_store_key(request: MultiChatRequest, idempotency_key: Optional[str]) -> Optional[str]:
+    """멱등 저장소 키 (Idempotency-Key 헤더 또는 client_turn_id, 유저 단위로 구분)"""
+    key = idempotency_key or request.client_turn_id
+    return f"{request.user_id}:{key}" if key else None
+
+
+def _format_sse(event: str, data: Dict) -> str:
+    """SSE 이벤트 문자열 생성"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def run_chat_turn(
+    location_id: str,
+    request: MultiChatRequest,
+    db: Session,
+    on_event: Optional[EventCallback] = None,
+    location: Optional[Location] = None,
+    characters: Optional[List[CharacterPersona]] = None,
+    relationships: Optional[Dict[str, RelationshipData]] = None
+) -> MultiChatResponse:
     """
+    멀티 캐릭터 대화 턴 처리 (일반/스트리밍/WebSocket 공통)
+    
+    Args:
+        on_event: 씬 리액션 진행 상황 이벤트 콜백 (스트리밍용)
+        location: 미리 조회한 장소 (None이면 DB 조회)
+        characters: 미리 조회한 장소의 캐릭터들 (None이면 DB 조회)
+        relationships: 캐릭터별 관계 데이터 캐시 {character_id: RelationshipData}
+            (WebSocket 연결처럼 여러 턴에 걸쳐 재사용, 턴 처리 중 갱신됨)
+    """
+    # 턴 트레이스 (turn_id로 /api/debug/trace에서 조회, Server-Timing 헤더 요약)
+    # 턴 처리 중 로그에는 session_id/turn_id가, LLM 토큰 사용량에는 user_id/session_id가 자동으로 포함됨
+    turn_id = str(uuid.uuid4())
+    session_id = request.session_id or f"{request.user_id}_{location_id}_{uuid.uuid4().hex[:8]}"
+    bind_profile_turn(turn_id)
+    
+    # 지연 속마음: 속마음은 핸들로 반환하고 GET /api/chat/turn/{turn_id}/inner/{character_id}에서 생성
+    # (지연 여부와 관계없이 새 턴을 기록해서 이전 턴 속마음이 나중에 생성돼도 Scene Context를 덮지 않게 함)
+    lazy = request.lazy_inner_thoughts
+    if lazy is None:
+        lazy = is_lazy_inner_thoughts_enabled()
+    inner_thought_store.begin_turn(session_id, turn_id)
+    
+    with log_context(session_id=session_id, turn_id=turn_id), \
+            usage_tags(user_id=request.user_id, session_id=session_id), \
+            start_trace(turn_id, location_id=location_id, user_id=request.user_id), \
+            (lazy_inner_thoughts(turn_id, session_id, request.user_id) if lazy else nullcontext()):
+        return await _run_chat_turn(
+            turn_id, session_id, location_id, request, db,
+            on_event=on_event,
+            location=location,
+            characters=characters,
+            relationships=relationships
+        )
+
+
+async def _run_chat_turn(
+    turn_id: str,
+    session_id: str,
+    location_id: str,
+    request: MultiChatRequest,
+    db: Session,
+    on_event: Optional[EventCallback] = None,
+    location: Optional[Location] = None,
+    characters: Optional[List[CharacterPersona]] = None,
+    relationships: Optional[Dict[str, RelationshipData]] = None
+) -> MultiChatResponse:
+    """run_chat_turn 본체 (트레이스 안에서 실행)"""
+    # 턴 마감 시간 (TURN_DEADLINE_SECONDS, 넘기면 남은 단계는 생략/기본 대사로 대체)
+    deadline_seconds = get_turn_deadline_seconds()
+    deadline = TurnDeadline(deadline_seconds) if deadline_seconds > 0 else None
+    
     # 1. 장소 확인
-    location = get_location(location_id, db)
+    if location is None:
+        with span("location"):
+            location = get_location(location_id, db)
     if not location:
         raise HTTPException(
             status_code=404,
@@ -79,15 +358,20 @@ async def chat_in_location(
         )
     
     # 2. 장소의 캐릭터들 조회
-    characters = get_characters_by_location(location_id, db)
+    if characters is None:
+        with span("characters"):
+            characters = get_characters_by_location(location_id, db)
     if not characters:
         raise HTTPException(
             status_code=404,
             detail=f"장소 '{location_id}'에 캐릭터가 없습니다."
         )
     
-    # 3. 세션 ID 생성 또는 사용
-    session_id = request.session_id or f"{request.user_id}_{location_id}_{uuid.uuid4().hex[:8]}"
+    # 캐릭터 말투 문구 미리 로드 (서브 리액션 문구 선택 중 이벤트 루프에서 DB를 조회하지 않도록)
+    with span("phrase_bank"):
+        await phrase_bank.preload(characters)
+    
+    # 3. 세션 ID는 run_chat_turn에서 생성 (로그 상관관계 필드로 사용)
     
     # 4. Scene Context 조회 또는 생성
     characters_dict = [{"id": c.id, "name": c.name} for c in characters]
@@ -105,256 +389,154 @@ async def chat_in_location(
     # 6. 유저 메시지 히스토리에 추가
     history.add_turn("user", request.message)
     
-    # 7. 유저 프로필 자동 업데이트
-    try:
-        await update_user_profile_from_message(
-            user_id=request.user_id,
-            user_message=request.message,
-            context={
-                "location": location.name,
-                "characters": [c.name for c in characters]
-            },
-            db=db
-        )
-    except Exception as e:
-        print(f"⚠️ 유저 프로필 업데이트 오류: {str(e)}")
+    # 7. 유저 프로필 자동 업데이트 (백그라운드 - 턴 응답을 기다리게 하지 않음)
+    _schedule_profile_update(
+        user_id=request.user_id,
+        user_message=request.message,
+        context={
+            "location": location.name,
+            "characters": [c.name for c in characters]
+        }
+    )
     
     # 8. 씬 리액션 생성 (핵심 로직)
-    turn_id = str(uuid.uuid4())
+    async def on_scene_event(event: str, data: Dict):
+        # 반응 계획에 턴/세션 ID를 붙여서 전달 (클라이언트가 이모지 리액션에 사용)
+        if event == "plan":
+            data = {"turn_id": turn_id, "session_id": session_id, **data}
+        await on_event(event, data)
     
     # ⚠️ 중요: 새 턴 시작 시 모든 캐릭터의 recent 플래그 리셋
     scene_context.reset_recent_flags()
     
     # 최근 스토리 요약 조회 (프롬프트 컨텍스트용)
-    recent_story_summaries = get_recent_story_summaries(session_id, limit=5, db=db)
+    with span("story_context"):
+        recent_story_summaries = get_recent_story_summaries(session_id, limit=5, db=db)
     
-    scene_reaction = await generate_scene_reaction(
-        user_message=request.message,
-        characters=characters,
-        scene_context=scene_context,
-        location=location.name,
-        conversation_history=history.get_recent_turns(5),
-        user_id=request.user_id,
-        db=db,
-        recent_story_summaries=recent_story_summaries  # 스토리 컨텍스트 추가
-    )
+    # 완성된 응답이 생성 즉시 누적되는 진행 결과 (취소 시 부분 턴 저장에 사용)
+    progress = SceneReactionResult(main_responses=[], sub_reactions=[], no_reaction=[])
     
-    # 9. Scene Context 업데이트 (모든 반응 캐릭터)
-    # 9-1. 메인 응답자들 업데이트
-    last_main_responder = None  # 마지막 메인 응답자 추적
-    for main_resp in scene_reaction.main_responses:
-        char = next((c for c in characters if c.id == main_resp.character_id), None)
-        if char:
-            rel_data = get_relationship_data(
+    try:
+        with span("scene_reaction", characters=len(characters)):
+            scene_reaction = await generate_scene_reaction(
+                user_message=request.message,
+                characters=characters,
+                scene_context=scene_context,
+                location=location.name,
+                conversation_history=history.get_recent_turns(5),
                 user_id=request.user_id,
-                character_id=char.id,
                 db=db,
-                create_if_not_exists=True
+                recent_story_summaries=recent_story_summaries,  # 스토리 컨텍스트 추가
+                on_event=on_scene_event if on_event else None,
+                relationships=relationships,
+                progress=progress,
+                deadline=deadline
             )
-            
-            scene_manager.process_character_response(
-                session_id=session_id,
-                character_id=main_resp.character_id,
-                character_name=main_resp.character_name,
-                response=main_resp.message,
-                target="user",
-                target_name="유저",
-                inner_thought=main_resp.inner_thought,
-                mood=rel_data.emotional_stats.joy_peaks > rel_data.emotional_stats.anger_peaks and "happy" or "neutral"
-            )
-            
-            # 히스토리에 추가
-            history.add_turn(
-                speaker=main_resp.character_id,
-                message=main_resp.message,
-                character_name=main_resp.character_name
-            )
-            
-            # 마지막 메인 응답자 추적
-            last_main_responder = main_resp
+    except asyncio.CancelledError:
+        # 연결 종료/새 턴에 의한 취소 - 이미 생성된 대사까지 저장 후 취소 전파
+        _commit_partial_turn(
+            session_id=session_id,
+            request=request,
+            location_name=location.name,
+            characters=characters,
+            scene_context=scene_context,
+            history=history,
+            progress=progress,
+            turn_id=turn_id,
+            db=db,
+            relationships=relationships
+        )
+        raise
     
-    # 9-1.5. 스토리 요약 AI 생성 및 DB 저장
-    print(f"[Story Summary] 시작 - 메인 응답자 수: {len(scene_reaction.main_responses)}")
-    if scene_reaction.main_responses:
-        try:
-            # 캐릭터 응답 데이터 준비 (행동, 대사, 속마음 포함)
-            character_responses_data = []
-            for r in scene_reaction.main_responses:
-                # 속마음 정보 추출
-                inner_thought_dict = r.inner_thought if r.inner_thought else None
-                inner_thought_text = None
-                if inner_thought_dict:
-                    if isinstance(inner_thought_dict, dict):
-                        inner_thought_text = inner_thought_dict.get('thought', '')
-                    else:
-                        inner_thought_text = str(inner_thought_dict)
-                
-                character_responses_data.append({
-                    "character_id": r.character_id,
-                    "character_name": r.character_name,
-                    "message": r.message,  # 전체 메시지 (요약은 AI가 수행)
-                    "action": r.action or "",
-                    "inner_thought": inner_thought_text
-                })
-            
-            # 캐릭터 상태 데이터 준비 (모든 캐릭터의 상태와 속마음)
-            character_states_data = {}
-            if scene_context:
-                for char_id, state in scene_context.character_states.items():
-                    # 속마음 정보 추출
-                    inner_thought_str = getattr(state, 'inner_thought', None)
-                    if inner_thought_str:
-                        if isinstance(inner_thought_str, dict):
-                            inner_thought_str = inner_thought_str.get('thought', '')
-                        else:
-                            inner_thought_str = str(inner_thought_str)
-                    
-                    character_states_data[char_id] = {
-                        "character_name": state.character_name,
-                        "recent": state.recent,
-                        "attention": state.attention.value if hasattr(state.attention, 'value') else str(state.attention),
-                        "current_mood": getattr(state, 'current_mood', 'neutral'),
-                        "inner_thought": inner_thought_str
-                    }
-            
-            # 최근 스토리 요약 조회 (컨텍스트용)
-            recent_summaries = get_recent_story_summaries(session_id, limit=10, db=db)
-            
-            # AI로 스토리 요약 생성 (타임아웃 5초)
+    # 9. Scene Context / 히스토리 업데이트 (메인 응답, 서브 리액션, 무반응 속마음)
+    with span("apply_scene"):
+        last_main_responder = _apply_scene_reaction(
+            session_id=session_id,
+            characters=characters,
+            scene_reaction=scene_reaction,
+            history=history,
+            user_id=request.user_id,
+            db=db,
+            relationships=relationships
+        )
+    
+    # 9-1. 스토리 요약 AI 생성 및 DB 저장
+    with span("summary", main_responses=len(scene_reaction.main_responses)):
+        logger.debug("[Story Summary] 시작 - 메인 응답자 수: %d", len(scene_reaction.main_responses))
+        if scene_reaction.main_responses:
             try:
-                ai_summary, ai_analysis = await asyncio.wait_for(
-                    generate_story_summary(
-                        user_message=request.message,
-                        character_responses=character_responses_data,
-                        character_states=character_states_data,
-                        recent_summaries=recent_summaries
-                    ),
-                    timeout=5.0
+                # 캐릭터 응답 데이터 (행동, 대사, 속마음) 및 캐릭터 상태 데이터 준비
+                character_responses_data, character_states_data = _build_story_summary_inputs(
+                    scene_reaction.main_responses, scene_context
                 )
-                print(f"[Story Summary] AI 분석 완료: {ai_summary[:50]}...")
-            except asyncio.TimeoutError:
-                print("⚠️ 스토리 요약 생성 타임아웃 - 기본 요약 사용")
-                # 타임아웃 시 행동 중심 기본 요약 생성
-                main_resp = scene_reaction.main_responses[0] if scene_reaction.main_responses else None
-                if main_resp:
-                    action = main_resp.action or ""
-                    # 행동 중심 요약 생성
-                    if action:
-                        ai_summary = f"유저가 '{request.message[:40]}...'라고 말했고, {main_resp.character_name}이 {action} 반응했다."
-                    else:
-                        ai_summary = f"유저가 '{request.message[:40]}...'라고 말했고, {main_resp.character_name}이 응답했다."
-                    ai_analysis = f"{main_resp.character_name}이 유저의 발언에 반응하며 상황이 전개되었다."
-                else:
-                    ai_summary = f"유저가 '{request.message[:40]}...'라고 말했다."
-                    ai_analysis = "대화가 진행되었다."
-            except Exception as ai_error:
-                print(f"⚠️ 스토리 요약 AI 생성 오류: {ai_error}")
-                import traceback
-                traceback.print_exc()
-                # 에러 시 행동 중심 기본 요약 생성
-                main_resp = scene_reaction.main_responses[0] if scene_reaction.main_responses else None
-                if main_resp:
-                    action = main_resp.action or ""
-                    if action:
-                        ai_summary = f"유저가 '{request.message[:40]}...'라고 말했고, {main_resp.character_name}이 {action} 반응했다."
-                    else:
-                        ai_summary = f"유저가 '{request.message[:40]}...'라고 말했고, {main_resp.character_name}이 응답했다."
-                    ai_analysis = f"{main_resp.character_name}이 유저의 발언에 반응하며 상황이 전개되었다."
-                else:
-                    ai_summary = f"유저가 '{request.message[:40]}...'라고 말했다."
-                    ai_analysis = "대화가 진행되었다."
-            
-            # DB에 저장
-            turn_number = scene_context.total_turns if scene_context else 1
-            turn_id = str(uuid.uuid4())
-            
-            try:
-                print(f"[Story Summary] DB 저장 시도 - 세션: {session_id}, 턴: {turn_number}")
-                save_story_summary(
+                
+                # 최근 스토리 요약 조회 (컨텍스트용)
+                recent_summaries = get_recent_story_summaries(session_id, limit=10, db=db)
+                
+                # AI로 스토리 요약 생성 (타임아웃 5초, 턴 마감 시간이 더 짧으면 그 안에서)
+                try:
+                    ai_summary, ai_analysis = await run_within(
+                        deadline,
+                        generate_story_summary(
+                            user_message=request.message,
+                            character_responses=character_responses_data,
+                            character_states=character_states_data,
+                            recent_summaries=recent_summaries
+                        ),
+                        timeout=5.0
+                    )
+                    logger.debug("[Story Summary] AI 분석 완료: %s...", ai_summary[:50])
+                except asyncio.TimeoutError:
+                    logger.warning("스토리 요약 생성 타임아웃 - 기본 요약 사용")
+                    ai_summary, ai_analysis = _build_fallback_story_summary(
+                        request.message, scene_reaction.main_responses
+                    )
+                except asyncio.CancelledError:
+                    # 요약 생성 중 턴 취소 (연결 종료 등) - 기본 요약을 부분 턴으로 저장 후 취소 전파
+                    logger.warning("스토리 요약 생성 중 턴 취소 - 기본 요약을 부분 턴으로 저장")
+                    ai_summary, ai_analysis = _build_fallback_story_summary(
+                        request.message, scene_reaction.main_responses
+                    )
+                    _save_turn_story_summary(
+                        session_id=session_id,
+                        user_id=request.user_id,
+                        location_name=location.name,
+                        scene_context=scene_context,
+                        turn_id=turn_id,
+                        user_message=request.message,
+                        character_responses_data=character_responses_data,
+                        character_states_data=character_states_data,
+                        ai_summary=ai_summary,
+                        ai_analysis=f"{PARTIAL_TURN_MARKER} {ai_analysis}",
+                        db=db
+                    )
+                    raise
+                except Exception as ai_error:
+                    logger.exception("스토리 요약 AI 생성 오류: %s", ai_error)
+                    ai_summary, ai_analysis = _build_fallback_story_summary(
+                        request.message, scene_reaction.main_responses
+                    )
+                
+                # DB 및 Scene Context에 저장 (응답과 동일한 turn_id 사용)
+                _save_turn_story_summary(
                     session_id=session_id,
                     user_id=request.user_id,
-                    location=location.name,
-                    turn_number=turn_number,
+                    location_name=location.name,
+                    scene_context=scene_context,
                     turn_id=turn_id,
                     user_message=request.message,
-                    character_responses=character_responses_data,
-                    character_states=character_states_data,
+                    character_responses_data=character_responses_data,
+                    character_states_data=character_states_data,
                     ai_summary=ai_summary,
                     ai_analysis=ai_analysis,
                     db=db
                 )
-                print(f"[Story Summary] ✅ DB 저장 완료 (턴 {turn_number}): {ai_summary[:50]}...")
-            except Exception as db_error:
-                print(f"⚠️ 스토리 요약 DB 저장 오류: {db_error}")
-                import traceback
-                traceback.print_exc()
-                # DB 저장 실패해도 계속 진행
-            
-            # Scene Context에도 추가 (기존 호환성) - 대사 포함하여 추가
-            def clean_story_summary(text):
-                """형식만 정리, 대사 내용은 유지"""
-                import re
-                if not text:
-                    return text
-                # 연속 공백만 정리 (대사는 유지)
-                text = re.sub(r'\s+', ' ', text)
-                return text.strip()
-            
-            cleaned_summary = clean_story_summary(ai_summary)
-            if not cleaned_summary or len(cleaned_summary) < 5:
-                cleaned_summary = ai_summary  # 정리 실패 시 원본 사용
             
-            scene_manager.add_story_point(
-                session_id=session_id,
-                point=cleaned_summary
-            )
-            
-        except Exception as e:
-            print(f"⚠️ 스토리 요약 처리 오류: {e}")
-            import traceback
-            traceback.print_exc()
-            # 에러가 발생해도 대화는 계속 진행
-    else:
-        print(f"[Story Summary] ⚠️ 메인 응답자가 없어 스토리 요약 생성 건너뜀")
-    
-    # 9-2. 서브 리액션 캐릭터들도 속마음 업데이트 (recent=False, attention=OBSERVING)
-    # 단, 이미 메인 응답자로 처리된 캐릭터는 건드리지 않음
-    main_character_ids = {r.character_id for r in scene_reaction.main_responses}
-    for sub_react in scene_reaction.sub_reactions:
-        if sub_react.inner_thought and sub_react.character_id not in main_character_ids:
-            # 서브 리액션은 response=""로 전달하여 recent=False, attention 유지
-            scene_manager.process_character_response(
-                session_id=session_id,
-                character_id=sub_react.character_id,
-                character_name=sub_react.character_name,
-                response="",  # 빈 응답 = 서브 리액션
-                target="user",
-                target_name="유저",
-                inner_thought=sub_react.inner_thought,
-                mood=None
-            )
-            # 서브 리액션은 관찰 중 상태로 명시적 설정
-            context = scene_manager.get_context(session_id)
-            if context and sub_react.character_id in context.character_states:
-                state = context.character_states[sub_react.character_id]
-                state.attention = CharacterAttention.OBSERVING
-                state.recent = False
-    
-    # 9-3. 무반응 캐릭터들도 속마음 업데이트 (recent=False, attention 유지)
-    # 단, 이미 메인 응답자로 처리된 캐릭터는 건드리지 않음
-    for no_react in scene_reaction.no_reaction:
-        if no_react.get("inner_thought") and no_react["character_id"] not in main_character_ids:
-            # 무반응은 response=""로 전달하여 recent=False, attention 유지
-            scene_manager.process_character_response(
-                session_id=session_id,
-                character_id=no_react["character_id"],
-                character_name=no_react["character_name"],
-                response="",  # 빈 응답 = 무반응
-                target="user",
-                target_name="유저",
-                inner_thought=no_react["inner_thought"],
-                mood=None
-            )
+            except Exception as e:
+                logger.exception("스토리 요약 처리 오류: %s", e)
+                # 에러가 발생해도 대화는 계속 진행
+        else:
+            logger.debug("[Story Summary] 메인 응답자가 없어 스토리 요약 생성 건너뜀")
     
     # 10. 데이터 수집 및 관계 데이터 업데이트 (메인 응답자들)
     for main_resp in scene_reaction.main_responses:
@@ -366,15 +548,18 @@ async def chat_in_location(
         }
         
         try:
-            await process_turn(
-                user_id=request.user_id,
-                character_id=main_resp.character_id,
-                turn_data=turn_data,
-                emoji_reaction=None,
-                db=db
-            )
+            with span("process_turn", character_id=main_resp.character_id):
+                updated_rel_data = await process_turn(
+                    user_id=request.user_id,
+                    character_id=main_resp.character_id,
+                    turn_data=turn_data,
+                    emoji_reaction=None,
+                    db=db
+                )
+            if relationships is not None and updated_rel_data:
+                relationships[main_resp.character_id] = updated_rel_data
         except Exception as e:
-            print(f"⚠️ 데이터 수집 오류 ({main_resp.character_name}): {str(e)}")
+            logger.warning("데이터 수집 오류 (%s): %s", main_resp.character_name, e)
     
     # 11. 응답 데이터 구성
     all_characters_info = [
@@ -391,41 +576,28 @@ async def chat_in_location(
         scene_context.current_focus = f"유저 ↔ {last_main_responder.character_name}"
     
     # 최근 10턴의 스토리 요약 조회 (DB에서)
-    recent_story_summaries = get_recent_story_summaries(session_id, limit=10, db=db)
+    with span("story_arc"):
+        recent_story_summaries = get_recent_story_summaries(session_id, limit=10, db=db)
     story_arc_list = [s['ai_summary'] for s in recent_story_summaries] if recent_story_summaries else []
     
     # Scene Context 딕셔너리 변환
     scene_context_dict = None
+    scene_version = 0
+    scene_delta = None
     if scene_context:
-        scene_context_dict = {
-            "location": scene_context.location,
-            "tension": getattr(scene_context, 'tension_level', 0),
-            "current_focus": scene_context.current_focus,
-            "last_speaker_name": last_main_responder.character_name if last_main_responder else scene_context.last_speaker_name,
-            "character_states": {
-                char_id: {
-                    "character_name": state.character_name,
-                    "current_mood": getattr(state, 'mood', getattr(state, 'current_mood', 'neutral')),
-                    "attention": state.attention.value if state.attention and hasattr(state.attention, 'value') else (state.attention if state.attention else None),
-                    "attention_target": getattr(state, 'attention_target', None),
-                    "recent": state.recent,
-                    "inner_thought": state.inner_thought
-                }
-                for char_id, state in scene_context.character_states.items()
-            },
-            "tension_level": getattr(scene_context, 'tension_level', 5),
-            "last_speaker_name": last_main_responder.character_name if last_main_responder else scene_context.last_speaker_name,
-            "main_speakers": [r.character_name for r in scene_reaction.main_responses],  # 메인 응답자들
-            "recent_events": [
-                {
-                    "speaker_name": event.speaker_name,
-                    "target_name": event.target_name,
-                    "summary": event.summary
-                }
-                for event in scene_context.recent_events[-5:]
-            ],
-            "story_arc": story_arc_list  # 최근 10턴의 스토리 요약 (DB에서 가져옴)
-        }
+        scene_context_dict = build_scene_context_dict(
+            scene_context=scene_context,
+            main_speakers=[r.character_name for r in scene_reaction.main_responses],
+            last_speaker_name=last_main_responder.character_name if last_main_responder else None,
+            story_arc=story_arc_list
+        )
+        scene_version = scene_context.commit_snapshot(scene_context_dict)
+        
+        # 클라이언트가 마지막 버전을 보냈으면 변경분만 응답 (복원 불가하면 전체 스냅샷)
+        if request.scene_version is not None:
+            scene_delta = scene_context.get_changes_since(request.scene_version)
+            if scene_delta is not None:
+                scene_context_dict = None
     
     # 하위 호환성: 첫 번째 메인 응답자
     first_main = scene_reaction.main_responses[0] if scene_reaction.main_responses else None
@@ -459,10 +631,354 @@ async def chat_in_location(
         character_id=first_main.character_id if first_main else None,
         character_name=first_main.character_name if first_main else None,
         character_response=first_main.message if first_main else None,
-        scene_context=scene_context_dict
+        scene_context=scene_context_dict,
+        scene_version=scene_version,
+        scene_delta=scene_delta,
+        metadata=scene_reaction.metadata
     )
 
 
+def _schedule_profile_update(user_id: str, user_message: str, context: Dict):
+    """
+    유저 프로필 추출을 백그라운드 작업으로 실행
+    
+    프로필 추출은 가장 낮은 우선순위(PROFILE)의 LLM 호출이므로 턴과 분리하며,
+    턴이 끝난 뒤에도 실행되므로 별도 DB 세션 사용
+    """
+    async def run():
+        profile_db = SessionLocal()
+        try:
+            # 턴 트레이스에 기록되지만 턴 응답 시간에는 포함되지 않음 (Server-Timing 제외)
+            with span("profile_extraction", background=True):
+                await update_user_profile_from_message(
+                    user_id=user_id,
+                    user_message=user_message,
+                    context=context,
+                    db=profile_db
+                )
+        except Exception as e:
+            logger.warning("유저 프로필 업데이트 오류: %s", e)
+        finally:
+            profile_db.close()
+    
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _apply_scene_reaction(
+    session_id: str,
+    characters: List[CharacterPersona],
+    scene_reaction: SceneReactionResult,
+    history: ConversationHistory,
+    user_id: str,
+    db: Session,
+    relationships: Optional[Dict[str, RelationshipData]] = None
+) -> Optional[MainResponse]:
+    """
+    씬 리액션 결과를 Scene Context와 대화 히스토리에 반영
+    
+    Returns:
+        마지막 메인 응답자 (없으면 None)
+    """
+    # 1. 메인 응답자들 업데이트
+    last_main_responder = None  # 마지막 메인 응답자 추적
+    for main_resp in scene_reaction.main_responses:
+        char = next((c for c in characters if c.id == main_resp.character_id), None)
+        if char:
+            rel_data = get_cached_relationship_data(
+                user_id=user_id,
+                character_id=char.id,
+                db=db,
+                relationships=relationships
+            )
+            
+            scene_manager.process_character_response(
+                session_id=session_id,
+                character_id=main_resp.character_id,
+                character_name=main_resp.character_name,
+                response=main_resp.message,
+                target="user",
+                target_name="유저",
+                inner_thought=_resolved_inner_thought(main_resp.inner_thought),
+                mood=rel_data.emotional_stats.joy_peaks > rel_data.emotional_stats.anger_peaks and "happy" or "neutral"
+            )
+            
+            # 히스토리에 추가
+            history.add_turn(
+                speaker=main_resp.character_id,
+                message=main_resp.message,
+                character_name=main_resp.character_name
+            )
+            
+            # 마지막 메인 응답자 추적
+            last_main_responder = main_resp
+    
+    # 2. 서브 리액션 캐릭터들도 속마음 업데이트 (recent=False, attention=OBSERVING)
+    # 단, 이미 메인 응답자로 처리된 캐릭터는 건드리지 않음
+    main_character_ids = {r.character_id for r in scene_reaction.main_responses}
+    # 아직 생성하지 않은 지연 속마음은 조회할 때 반영됨 (scene_manager.apply_inner_thought)
+    for sub_react in scene_reaction.sub_reactions:
+        inner_thought = _resolved_inner_thought(sub_react.inner_thought)
+        if inner_thought and sub_react.character_id not in main_character_ids:
+            scene_manager.apply_inner_thought(
+                session_id=session_id,
+                character_id=sub_react.character_id,
+                character_name=sub_react.character_name,
+                inner_thought=inner_thought,
+                role="sub"
+            )
+    
+    # 3. 무반응 캐릭터들도 속마음 업데이트 (recent=False, attention 유지)
+    # 단, 이미 메인 응답자로 처리된 캐릭터는 건드리지 않음
+    for no_react in scene_reaction.no_reaction:
+        inner_thought = _resolved_inner_thought(no_react.get("inner_thought"))
+        if inner_thought and no_react["character_id"] not in main_character_ids:
+            scene_manager.apply_inner_thought(
+                session_id=session_id,
+                character_id=no_react["character_id"],
+                character_name=no_react["character_name"],
+                inner_thought=inner_thought,
+                role="no_reaction"
+            )
+    
+    return last_main_responder
+
+
+def _resolved_inner_thought(inner_thought: Optional[Dict]) -> Optional[Dict]:
+    """속마음 (지연 속마음 핸들이면 이미 생성된 속마음, 아직 생성 전이면 None)"""
+    if is_inner_thought_handle(inner_thought):
+        return inner_thought_store.peek(inner_thought)
+    return inner_thought
+
+
+def _build_story_summary_inputs(
+    main_responses: List[MainResponse],
+    scene_context: Optional[SceneContext]
+) -> Tuple[List[Dict], Dict]:
+    """
+    스토리 요약용 캐릭터 응답 데이터와 캐릭터 상태 데이터 준비
+    
+    Returns:
+        (캐릭터 응답 데이터, 캐릭터 상태 데이터) 튜플
+    """
+    # 캐릭터 응답 데이터 준비 (행동, 대사, 속마음 포함)
+    character_responses_data = []
+    for r in main_responses:
+        # 속마음 정보 추출
+        inner_thought_dict = _resolved_inner_thought(r.inner_thought)
+        inner_thought_text = None
+        if inner_thought_dict:
+            if isinstance(inner_thought_dict, dict):
+                inner_thought_text = inner_thought_dict.get('thought', '')
+            else:
+                inner_thought_text = str(inner_thought_dict)
+        
+        character_responses_data.append({
+            "character_id": r.character_id,
+            "character_name": r.character_name,
+            "message": r.message,  # 전체 메시지 (요약은 AI가 수행)
+            "action": r.action or "",
+            "inner_thought": inner_thought_text
+        })
+    
+    # 캐릭터 상태 데이터 준비 (모든 캐릭터의 상태와 속마음)
+    character_states_data = {}
+    if scene_context:
+        for char_id, state in scene_context.character_states.items():
+            # 속마음 정보 추출
+            inner_thought_str = getattr(state, 'inner_thought', None)
+            if inner_thought_str:
+                if isinstance(inner_thought_str, dict):
+                    inner_thought_str = inner_thought_str.get('thought', '')
+                else:
+                    inner_thought_str = str(inner_thought_str)
+            
+            character_states_data[char_id] = {
+                "character_name": state.character_name,
+                "recent": state.recent,
+                "attention": state.attention.value if hasattr(state.attention, 'value') else str(state.attention),
+                "current_mood": getattr(state, 'current_mood', 'neutral'),
+                "inner_thought": inner_thought_str
+            }
+    
+    return character_responses_data, character_states_data
+
+
+def _build_fallback_story_summary(
+    user_message: str,
+    main_responses: List[MainResponse]
+) -> Tuple[str, str]:
+    """
+    AI 요약을 쓸 수 없을 때(타임아웃, 오류, 취소) 행동 중심 기본 요약 생성
+    
+    Returns:
+        (ai_summary, ai_analysis) 튜플
+    """
+    main_resp = main_responses[0] if main_responses else None
+    if not main_resp:
+        return f"유저가 '{user_message[:40]}...'라고 말했다.", "대화가 진행되었다."
+    
+    action = main_resp.action or ""
+    if action:
+        ai_summary = f"유저가 '{user_message[:40]}...'라고 말했고, {main_resp.character_name}이 {action} 반응했다."
+    else:
+        ai_summary = f"유저가 '{user_message[:40]}...'라고 말했고, {main_resp.character_name}이 응답했다."
+    ai_analysis = f"{main_resp.character_name}이 유저의 발언에 반응하며 상황이 전개되었다."
+    return ai_summary, ai_analysis
+
+
+def _save_turn_story_summary(
+    session_id: str,
+    user_id: str,
+    location_name: str,
+    scene_context: Optional[SceneContext],
+    turn_id: str,
+    user_message: str,
+    character_responses_data: List[Dict],
+    character_states_data: Dict,
+    ai_summary: str,
+    ai_analysis: str,
+    db: Session
+):
+    """스토리 요약을 DB와 Scene Context(스토리 포인트)에 저장"""
+    turn_number = scene_context.total_turns if scene_context else 1
+    
+    try:
+        logger.debug("[Story Summary] DB 저장 시도 - 턴: %d", turn_number)
+        with span("db.save_summary", turn_number=turn_number):
+            save_story_summary(
+                session_id=session_id,
+                user_id=user_id,
+                location=location_name,
+                turn_number=turn_number,
+                turn_id=turn_id,
+                user_message=user_message,
+                character_responses=character_responses_data,
+                character_states=character_states_data,
+                ai_summary=ai_summary,
+                ai_analysis=ai_analysis,
+                db=db
+            )
+        logger.debug("[Story Summary] DB 저장 완료 (턴 %d): %s...", turn_number, ai_summary[:50])
+    except Exception as db_error:
+        logger.exception("스토리 요약 DB 저장 오류: %s", db_error)
+        # DB 저장 실패해도 계속 진행
+    
+    # Scene Context에도 추가 (기존 호환성) - 연속 공백만 정리하고 대사 내용은 유지
+    cleaned_summary = re.sub(r'\s+', ' ', ai_summary).strip() if ai_summary else ai_summary
+    if not cleaned_summary or len(cleaned_summary) < 5:
+        cleaned_summary = ai_summary  # 정리 실패 시 원본 사용
+    
+    scene_manager.add_story_point(
+        session_id=session_id,
+        point=cleaned_summary
+    )
+
+
+def _commit_partial_turn(
+    session_id: str,
+    request: MultiChatRequest,
+    location_name: str,
+    characters: List[CharacterPersona],
+    scene_context: Optional[SceneContext],
+    history: ConversationHistory,
+    progress: SceneReactionResult,
+    turn_id: str,
+    db: Session,
+    relationships: Optional[Dict[str, RelationshipData]] = None
+):
+    """
+    취소된 턴의 부분 상태 저장
+    
+    - 유저 메시지: 턴 시작 시 이미 히스토리에 추가됨
+    - 완성된 메인 대사 → 히스토리/Scene Context, 서브 리액션/무반응 속마음 → Scene Context
+    - 완성된 메인 대사가 있으면 기본 요약을 PARTIAL_TURN_MARKER로 표시하여 스토리 요약에 저장
+    - 관계 데이터 수집(process_turn)은 완료된 턴에만 적용하므로 건너뜀
+    """
+    logger.info(
+        "턴 취소 - 부분 저장 (메인 %d명, 서브 %d명, 무반응 %d명)",
+        len(progress.main_responses), len(progress.sub_reactions), len(progress.no_reaction)
+    )
+    try:
+        _apply_scene_reaction(
+            session_id=session_id,
+            characters=characters,
+            scene_reaction=progress,
+            history=history,
+            user_id=request.user_id,
+            db=db,
+            relationships=relationships
+        )
+        
+        if progress.main_responses:
+            character_responses_data, character_states_data = _build_story_summary_inputs(
+                progress.main_responses, scene_context
+            )
+            ai_summary, ai_analysis = _build_fallback_story_summary(request.message, progress.main_responses)
+            _save_turn_story_summary(
+                session_id=session_id,
+                user_id=request.user_id,
+                location_name=location_name,
+                scene_context=scene_context,
+                turn_id=turn_id,
+                user_message=request.message,
+                character_responses_data=character_responses_data,
+                character_states_data=character_states_data,
+                ai_summary=ai_summary,
+                ai_analysis=f"{PARTIAL_TURN_MARKER} {ai_analysis}",
+                db=db
+            )
+    except Exception as e:
+        logger.exception("부분 턴 저장 오류: %s", e)
+
+
+def build_scene_context_dict(
+    scene_context: SceneContext,
+    main_speakers: List[str],
+    last_speaker_name: Optional[str] = None,
+    story_arc: Optional[List[str]] = None
+) -> Dict:
+    """
+    Scene Context를 응답용 딕셔너리로 변환
+    
+    Args:
+        scene_context: 씬 컨텍스트
+        main_speakers: 이번 턴의 메인 응답자 이름들
+        last_speaker_name: 마지막 메인 응답자 이름 (None이면 씬 컨텍스트의 마지막 화자)
+        story_arc: 최근 스토리 요약 목록 (DB에서 조회)
+    """
+    last_speaker_name = last_speaker_name or scene_context.last_speaker_name
+    return {
+        "location": scene_context.location,
+        "tension": getattr(scene_context, 'tension_level', 0),
+        "current_focus": scene_context.current_focus,
+        "last_speaker_name": last_speaker_name,
+        "character_states": {
+            char_id: {
+                "character_name": state.character_name,
+                "current_mood": getattr(state, 'mood', getattr(state, 'current_mood', 'neutral')),
+                "attention": state.attention.value if state.attention and hasattr(state.attention, 'value') else (state.attention if state.attention else None),
+                "attention_target": getattr(state, 'attention_target', None),
+                "recent": state.recent,
+                "inner_thought": state.inner_thought
+            }
+            for char_id, state in scene_context.character_states.items()
+        },
+        "tension_level": getattr(scene_context, 'tension_level', 5),
+        "main_speakers": main_speakers,  # 메인 응답자들
+        "recent_events": [
+            {
+                "speaker_name": event.speaker_name,
+                "target_name": event.target_name,
+                "summary": event.summary
+            }
+            for event in scene_context.recent_events[-5:]
+        ],
+        "story_arc": story_arc or []  # 최근 10턴의 스토리 요약 (DB에서 가져옴)
+    }
+
+
 @router.get("/session/{session_id}/history")
 async def get_conversation_history(session_id: str):
     """대화 히스토리 조회"""
@@ -474,3 +990,27 @@ async def get_conversation_history(session_id: str):
         "turns": history.turns,
         "turn_count": history.get_turn_count()
     }
+
+
+@router.get("/turn/{turn_id}/inner/{character_id}")
+async def get_inner_thought(turn_id: str, character_id: str):
+    """
+    지연 속마음 조회 (lazy_inner_thoughts 턴의 핸들)
+    
+    처음 조회할 때 생성해서 저장하고, 이후에는 저장된 속마음 반환
+    """
+    try:
+        inner_thought = await inner_thought_store.resolve(turn_id, character_id)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"턴 '{turn_id}'의 캐릭터 '{character_id}' 속마음이 없거나 만료되었습니다."
+        )
+    if inner_thought is None:
+        raise HTTPException(status_code=503, detail="속마음을 생성하지 못했습니다. 잠시 후 다시 시도해주세요.")
+    
+    return {
+        "turn_id": turn_id,
+        "character_id": character_id,
+        "inner_thought": inner_thought
+    }
@@ -0,0 +1,222 @@
+"""
+WebSocket 채팅 API
+세션 단위로 연결을 유지하며 장소/캐릭터/씬 컨텍스트/관계 데이터를 한 번만 로드
+"""
+import asyncio
+import json
+from typing import Dict
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from db.character_db import get_characters_by_location, get_location, SessionLocal
+from db.database import get_recent_story_summaries, get_existing_relationships
+from core.scene_manager import scene_manager
+from api.chat_multi import (
+    MultiChatRequest,
+    run_idempotent_chat_turn,
+    build_scene_context_dict
+)
+from api.reaction import ReactionRequest, add_reaction
+from utils.logger import get_logger
+
+router = APIRouter(tags=["chat"])
+logger = get_logger(__name__)
+
+# WebSocket 종료 코드 (4000번대: 애플리케이션 정의)
+WS_CLOSE_BAD_HANDSHAKE = 4400
+WS_CLOSE_FORBIDDEN = 4403
+WS_CLOSE_NOT_FOUND = 4404
+
+
+@router.websocket("/ws/chat/{session_id}")
+async def chat_websocket(websocket: WebSocket, session_id: str):
+    """
+    멀티 캐릭터 채팅 WebSocket
+    
+    연결 직후 인증 메시지를 보내야 함:
+        {"type": "auth", "user_id": "...", "location_id": "..."}
+    
+    이후 메시지 형식:
+        {"type": "message", "message": "...", "client_turn_id": "..."}  (client_turn_id는 선택, 재전송 시 결과 재생)
+            "lazy_inner_thoughts": true를 넣으면 속마음 대신 핸들 (GET /api/chat/turn/{turn_id}/inner/{character_id})
+        {"type": "reaction", "character_id": "...", "turn_id": "...", "emoji": "❤️",
+         "user_message": "...", "character_response": "..."}
+        {"type": "ping"}
+    
+    서버 → 클라이언트:
+        ready: 연결 준비 완료 (캐릭터 목록, 전체 씬 컨텍스트)
+        plan / main_start / token / main_done / main_error / sub_reaction: 턴 진행 이벤트
+        turn_result: 턴 결과 (scene_context 대신 마지막 버전 이후 변경분 scene_delta)
+        reaction_result: 이모지 리액션 결과
+        error: 오류 (status_code, detail)
+    
+    턴 처리 중 연결이 끊기면 남은 LLM 호출을 취소하고 이미 생성된 대사까지만 저장
+    """
+    await websocket.accept()
+    
+    # 1. 인증 (세션 ID는 user_id로 시작해야 함 - opening/chat에서 생성하는 형식)
+    try:
+        auth = await websocket.receive_json()
+    except (WebSocketDisconnect, ValueError):
+        await websocket.close(code=WS_CLOSE_BAD_HANDSHAKE)
+        return
+    
+    user_id = auth.get("user_id") if isinstance(auth, dict) else None
+    location_id = auth.get("location_id") if isinstance(auth, dict) else None
+    if not isinstance(auth, dict) or auth.get("type") != "auth" or not user_id or not location_id:
+        await websocket.close(code=WS_CLOSE_BAD_HANDSHAKE)
+        return
+    
+    if not session_id.startswith(f"{user_id}_"):
+        await websocket.close(code=WS_CLOSE_FORBIDDEN)
+        return
+    
+    # 연결 동안 유지되는 DB 세션
+    db = SessionLocal()
+    reader = None
+    try:
+        # 2. 연결 단위 상태 로드 (장소, 캐릭터, 씬 컨텍스트, 관계 데이터)
+        location = get_location(location_id, db)
+        characters = get_characters_by_location(location_id, db) if location else []
+        if not location or not characters:
+            await websocket.close(code=WS_CLOSE_NOT_FOUND)
+            return
+        
+        scene_context = scene_manager.get_or_create_context(
+            session_id=session_id,
+            location=location.name,
+            characters=[{"id": c.id, "name": c.name} for c in characters]
+        )
+        
+        # 기존 관계만 한 번에 조회 (없는 관계는 캐릭터가 처음 반응할 때 생성)
+        relationships = get_existing_relationships(user_id, [c.id for c in characters], db)
+        
+        recent_story_summaries = get_recent_story_summaries(session_id, limit=10, db=db)
+        scene_dict = build_scene_context_dict(
+            scene_context=scene_context,
+            main_speakers=[],
+            story_arc=[s['ai_summary'] for s in recent_story_summaries]
+        )
+        scene_version = scene_context.commit_snapshot(scene_dict)
+        
+        await websocket.send_json({
+            "type": "ready",
+            "session_id": session_id,
+            "location": location.name,
+            "all_characters": [
+                {"id": c.id, "name": c.name, "location": location.name}
+                for c in characters
+            ],
+            "scene_context": scene_dict,
+            "scene_version": scene_version
+        })
+        
+        # 3. 수신 전용 태스크 (턴 처리 중에도 연결 종료를 감지)
+        incoming: asyncio.Queue = asyncio.Queue()
+        
+        async def read_messages():
+            try:
+                while True:
+                    await incoming.put(await websocket.receive_text())
+            except (WebSocketDisconnect, RuntimeError):
+                await incoming.put(None)
+        
+        reader = asyncio.create_task(read_messages())
+        
+        async def is_disconnected() -> bool:
+            return reader.done()
+        
+        async def on_event(event: str, data: Dict):
+            if not reader.done():
+                await websocket.send_json({"type": event, **data})
+        
+        # 4. 메시지 루프 (한 연결 안의 턴은 순서대로 처리)
+        while True:
+            raw = await incoming.get()
+            if raw is None:
+                raise WebSocketDisconnect()
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                await websocket.send_json({"type": "error", "status_code": 400, "detail": "JSON 형식이 아닙니다."})
+                continue
+            message_type = message.get("type") if isinstance(message, dict) else None
+            
+            try:
+                if message_type == "message":
+                    response, _ = await run_idempotent_chat_turn(
+                        location_id=location_id,
+                        request=MultiChatRequest(
+                            user_id=user_id,
+                            location_id=location_id,
+                            message=message.get("message"),
+                            session_id=session_id,
+                            scene_version=scene_version,
+                            client_turn_id=message.get("client_turn_id"),
+                            lazy_inner_thoughts=message.get("lazy_inner_thoughts")
+                        ),
+                        db=db,
+                        is_disconnected=is_disconnected,
+                        on_event=on_event,
+                        location=location,
+                        characters=characters,
+                        relationships=relationships
+                    )
+                    
+                    scene_version = response.scene_version
+                    await websocket.send_json({"type": "turn_result", **response.dict()})
+                
+                elif message_type == "reaction":
+                    reaction = await add_reaction(
+                        ReactionRequest(
+                            user_id=user_id,
+                            character_id=message.get("character_id"),
+                            turn_id=message.get("turn_id"),
+                            emoji=message.get("emoji"),
+                            user_message=message.get("user_message", ""),
+                            character_response=message.get("character_response", "")
+                        ),
+                        db=db
+                    )
+                    
+                    # 리액션으로 바뀐 관계 데이터는 다음 턴에 다시 로드
+                    relationships.pop(message.get("character_id"), None)
+                    
+                    await websocket.send_json({
+                        "type": "reaction_result",
+                        "character_id": message.get("character_id"),
+                        **reaction.dict()
+                    })
+                
+                elif message_type == "ping":
+                    await websocket.send_json({"type": "pong"})
+                
+                else:
+                    await websocket.send_json({
+                        "type": "error",
+                        "status_code": 400,
+                        "detail": f"알 수 없는 메시지 타입입니다: {message_type}"
+                    })
+            
+            except HTTPException as e:
+                if reader.done():
+                    # 턴 처리 중 연결 종료 (턴은 취소되고 부분 저장됨)
+                    raise WebSocketDisconnect()
+                await websocket.send_json({"type": "error", "status_code": e.status_code, "detail": e.detail})
+            except ValidationError as e:
+                # 메시지 필드 형식 오류 (REST 요청 검증 실패와 같은 422)
+                await websocket.send_json({"type": "error", "status_code": 422, "detail": jsonable_encoder(e.errors())})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                db.rollback()
+                logger.exception("WebSocket 턴 처리 오류: %s", e)
+                await websocket.send_json({"type": "error", "status_code": 500, "detail": str(e)[:200]})
+    
+    except WebSocketDisconnect:
+        logger.info("WebSocket 연결 종료: %s", session_id)
+    finally:
+        if reader and not reader.done():
+            reader.cancel()
+        db.close()
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from models.creator_models import (
     CharacterCreate, CharacterUpdate, CharacterResponse,
-    CharacterGenerateRequest
+    CharacterGenerateRequest, WorkResponse
 )
 from db.supabase_db import (
     create_character, get_character, get_characters_by_work,
@@ -15,12 +15,15 @@ from db.supabase_db import (
 from api.auth import get_current_user, UserInfo
 from db.supabase_db import get_work
 from utils.gemini_client import GeminiClient
+from utils.llm_scheduler import LLMCallType
+from utils.token_accounting import usage_tags
+from utils.generation_profiles import get_generation_profile, PROFILE_CHARACTER_GENERATE
 
 router = APIRouter(prefix="/api/creator/works/{work_id}/characters", tags=["creator_characters"])
 
 
-def verify_work_ownership(work_id: str, user_id: str) -> None:
-    """작품 소유권 확인"""
+def verify_work_ownership(work_id: str, user_id: str) -> WorkResponse:
+    """작품 소유권 확인 (확인한 작품 반환)"""
     work = get_work(work_id)
     if not work:
         raise HTTPException(
@@ -33,6 +36,8 @@ def verify_work_ownership(work_id: str, user_id: str) -> None:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="작품에 접근할 권한이 없습니다."
         )
+    
+    return work
 
 
 @router.post("", response_model=CharacterResponse, status_code=status.HTTP_201_CREATED)
@@ -166,7 +171,7 @@ async def generate_character_endpoint(
     current_user: UserInfo = Depends(get_current_user)
 ):
     """AI 캐릭터 자동 생성"""
-    verify_work_ownership(work_id, current_user.user_id)
+    work = verify_work_ownership(work_id, current_user.user_id)
     
     try:
         gemini_client = GeminiClient()
@@ -194,9 +199,15 @@ async def generate_character_endpoint(
 
 프롬프트만 작성하세요 (설명 없이).
 """
-        
-        # Gemini API 호출
-        generated_prompt = gemini_client.generate_response(prompt)
+
+        # Gemini API 호출 (토큰 사용량은 창작자/작품 기준으로 집계, 생성 설정은 작품 덮어쓰기 적용)
+        generation = get_generation_profile(PROFILE_CHARACTER_GENERATE, work_overrides=work.generation_overrides)
+        with usage_tags(user_id=current_user.user_id, work_id=work_id):
+            generated_prompt = await gemini_client.generate_response_async(
+                prompt,
+                call_type=LLMCallType.CHARACTER_GENERATE,
+                generation=generation
+            )
         
         # 캐릭터 이름 추출 (간단한 추론)
         # 실제로는 더 정교한 파싱 필요
@@ -210,7 +221,10 @@ async def generate_character_endpoint(
         
         character = create_character(work_id, character_data)
         return character
-        
+    
+    except HTTPException:
+        # 토큰 예산 초과(429)/서킷 브레이커(503) 등은 상태 코드 그대로 전달
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
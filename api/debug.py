@@ -0,0 +1,205 @@
+"""
+디버그 API
+SYNK MVP - 운영 중 턴 처리 진단, 요청 프로파일링, LLM 토큰 사용량/모델 라우팅/응답 캐시 조회 (ADMIN_TOKEN 설정 시에만 활성화)
+"""
+import asyncio
+import hmac
+from datetime import date, timedelta
+from typing import Optional
+from urllib.parse import parse_qs
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+
+from db.database import get_db, get_llm_usage_summary, USAGE_GROUP_COLUMNS
+from utils.config import get_admin_token
+from utils.tracer import trace_store
+from utils.token_accounting import token_accountant
+from utils.model_router import model_router
+from utils.response_cache import response_cache
+from utils.profiler import profile_store, start_request_profile, finish_request_profile
+
+router = APIRouter(prefix="/api/debug", tags=["debug"])
+
+# 프로파일링 요청 플래그 값
+PROFILE_FLAG_VALUES = ("1", "true", "yes", "on")
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """관리자 토큰 일치 여부 (ADMIN_TOKEN이 없으면 항상 False)"""
+    admin_token = get_admin_token()
+    return bool(admin_token and token and hmac.compare_digest(token, admin_token))
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    """
+    X-Admin-Token 헤더 검증
+    
+    ADMIN_TOKEN이 설정되지 않았으면 엔드포인트가 없는 것처럼 404 반환
+    """
+    if not get_admin_token():
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+class ProfilerMiddleware:
+    """
+    요청 프로파일링 미들웨어 (ASGI)
+    
+    X-Admin-Token이 맞고 X-Profile: 1 헤더 또는 ?profile=1 쿼리가 있는 요청만 샘플링 프로파일러로 실행
+    (그 외 요청은 헤더 확인만 하고 그대로 통과)
+    응답 헤더 X-Profile-Id로 프로파일 ID를 알려주며, 결과는 /api/debug/profile/{turn_id 또는 프로파일 ID}로 조회
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        profile = start_request_profile(scope["method"], scope["path"])
+        
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", [])) + [(b"x-profile-id", profile.profile_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            # 스트리밍 응답은 본문을 모두 보낼 때까지 프로파일링
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            finish_request_profile(profile)
+    
+    @staticmethod
+    def _wants_profile(scope) -> bool:
+        headers = dict(scope.get("headers") or [])
+        flag = headers.get(b"x-profile", b"").decode("latin-1").lower()
+        if flag not in PROFILE_FLAG_VALUES:
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            flag = (query.get("profile") or [""])[0].lower()
+            if flag not in PROFILE_FLAG_VALUES:
+                return False
+        token = headers.get(b"x-admin-token")
+        return is_admin_token(token.decode("latin-1") if token else None)
+
+
+@router.get("/trace/{turn_id}", dependencies=[Depends(require_admin_token)])
+async def get_turn_trace(turn_id: str):
+    """
+    턴의 스팬 트리 조회 (최근 TRACE_BUFFER_SIZE턴까지 보관)
+    
+    각 스팬: name, start_ms(턴 시작 기준), duration_ms(진행 중이면 None), status, attributes, children
+    """
+    trace = trace_store.get(turn_id)
+    if not trace:
+        raise HTTPException(
+            status_code=404,
+            detail=f"턴 '{turn_id}'의 트레이스를 찾을 수 없습니다."
+        )
+    
+    return {
+        **trace.to_dict(),
+        "server_timing": trace.server_timing()
+    }
+
+
+@router.get("/profile", dependencies=[Depends(require_admin_token)])
+async def list_profiles():
+    """보관 중인 요청 프로파일 목록 (최근 PROFILE_BUFFER_SIZE건)"""
+    return {"profiles": profile_store.list()}
+
+
+@router.get("/profile/{profile_key}", dependencies=[Depends(require_admin_token)])
+async def get_profile(
+    profile_key: str,
+    format: str = Query("folded", description="folded: 플레임 그래프용 텍스트, json: 요약")
+):
+    """
+    요청 프로파일 조회 (turn_id 또는 X-Profile-Id 값)
+    
+    folded 형식은 flamegraph.pl, speedscope 등에 그대로 넣으면 플레임 그래프로 볼 수 있음
+    """
+    profile = profile_store.get(profile_key)
+    if not profile:
+        raise HTTPException(
+            status_code=404,
+            detail=f"'{profile_key}'의 프로파일을 찾을 수 없습니다."
+        )
+    
+    if format == "json":
+        return profile.to_dict()
+    if format != "folded":
+        raise HTTPException(status_code=400, detail="format은 folded 또는 json만 가능합니다.")
+    return PlainTextResponse(profile.folded())
+
+
+@router.get("/usage", dependencies=[Depends(require_admin_token)])
+async def get_token_usage(
+    days: int = Query(7, ge=1, le=366, description="오늘 포함 최근 며칠"),
+    group_by: str = Query("call_type", description="쉼표로 구분 (day, user, session, work, call_type, model)"),
+    user_id: Optional[str] = None,
+    work_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    LLM 토큰 사용량/추정 비용 집계 (비용 큰 순)
+    
+    예: /api/debug/usage?days=1&group_by=user,call_type
+    """
+    groups = [name.strip() for name in group_by.split(",") if name.strip()]
+    unknown = [name for name in groups if name not in USAGE_GROUP_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 group_by: {', '.join(unknown)} (사용 가능: {', '.join(USAGE_GROUP_COLUMNS)})"
+        )
+    
+    # 메모리에 누적된 최근 사용량까지 포함
+    await token_accountant.flush_async()
+    since_day = (date.today() - timedelta(days=days - 1)).isoformat()
+    rows = get_llm_usage_summary(since_day, groups, db, user_id=user_id, work_id=work_id, limit=limit)
+    totals = get_llm_usage_summary(since_day, [], db, user_id=user_id, work_id=work_id)
+    return {
+        "since": since_day,
+        "group_by": groups,
+        "totals": totals[0] if totals else None,
+        "rows": rows,
+        "accounting": token_accountant.get_stats()
+    }
+
+
+@router.get("/usage/budget/{user_id}", dependencies=[Depends(require_admin_token)])
+async def get_token_budget(user_id: str):
+    """유저의 오늘 토큰 예산/사용량 (예산이 없으면 budget_tokens None)"""
+    return await asyncio.to_thread(token_accountant.get_budget_status, user_id)
+
+
+@router.get("/models", dependencies=[Depends(require_admin_token)])
+async def get_model_routing():
+    """
+    모델 라우팅 상태
+    
+    tiers(등급 → 모델), routes(호출 종류 → 등급), cooling_down(대체되어 뒤로 밀린 모델 → 남은 초), fallbacks(대체 횟수)
+    """
+    return model_router.get_stats()
+
+
+@router.get("/cache", dependencies=[Depends(require_admin_token)])
+async def get_response_cache_stats():
+    """
+    LLM 응답 캐시 상태
+    
+    call_types(캐시 사용 호출 종류), memory_entries/disk_entries(저장 항목 수), memory_hits/disk_hits/misses(적중 통계)
+    """
+    return response_cache.get_stats()
+
+
+@router.delete("/cache", dependencies=[Depends(require_admin_token)])
+async def clear_response_cache():
+    """LLM 응답 캐시 비우기 (메모리 + 디스크)"""
+    return {"cleared": response_cache.clear()}
@@ -13,6 +13,7 @@ from core.dominance_calc import update_dominance
 from core.emotion_analyzer import update_emotional_stats, detect_emotion
 from core.memory_manager import add_core_memory
 from core.trigger_detector import update_trigger_keyword
+from utils.tracer import span
 
 
 async def process_turn(
@@ -142,6 +143,7 @@ async def process_turn(
     rel_data.updated_at = datetime.now()
     
     # 8. DB에 저장
-    updated_rel_data = update_relationship_data(rel_data, db)
+    with span("db.update_relationship"):
+        updated_rel_data = update_relationship_data(rel_data, db)
     
     return updated_rel_data
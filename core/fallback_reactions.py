@@ -0,0 +1,86 @@
+"""
+로컬 대체 리액션
+SYNK MVP - LLM을 쓸 수 없을 때(서킷 브레이커 열림) 캐릭터 말투 예시로 만든 짧은 반응/속마음
+"""
+import uuid
+import zlib
+from typing import List
+
+from models.character import CharacterPersona
+from models.inner_thought import InnerThought
+
+# 말투 예시가 없는 캐릭터의 기본 반응
+DEFAULT_SUB_LINE = "*말없이 상황을 지켜본다*"
+
+# 서브 리액션으로 쓰기에 너무 긴 예시는 제외 (글자 수)
+MAX_SUB_LINE_LENGTH = 60
+
+# 속마음 문장 틀 ({line}: 말투 예시)
+INNER_THOUGHT_TEMPLATES = [
+    "\"{line}\"... 지금은 이 정도만 해두자.",
+    "괜히 나설 필요는 없지. \"{line}\" 정도면 충분해.",
+    "일단 지켜보자. 필요하면 \"{line}\"라고 해주면 되니까.",
+]
+
+
+def _pick(options: List[str], character: CharacterPersona, user_message: str) -> str:
+    """캐릭터와 유저 메시지로 정해지는 선택 (같은 입력이면 같은 결과, 턴마다 다양하게)"""
+    index = zlib.crc32(f"{character.id}:{user_message}".encode("utf-8")) % len(options)
+    return options[index]
+
+
+def _sub_lines(character: CharacterPersona) -> List[str]:
+    """서브 리액션에 쓸 수 있는 짧은 말투 예시"""
+    examples = [e.strip() for e in character.speech_examples if e and e.strip()]
+    short = [e for e in examples if len(e) <= MAX_SUB_LINE_LENGTH]
+    return short or [e[:MAX_SUB_LINE_LENGTH] for e in examples]
+
+
+def canned_sub_reaction(character: CharacterPersona, user_message: str) -> str:
+    """
+    말투 예시 중 하나로 서브 리액션 생성 (LLM 호출 없음)
+    
+    Args:
+        character: 캐릭터 정보
+        user_message: 유저 메시지 (예시 선택용)
+    
+    Returns:
+        반응 텍스트 (예시가 없으면 기본 반응)
+    """
+    lines = _sub_lines(character)
+    if not lines:
+        return DEFAULT_SUB_LINE
+    return _pick(lines, character, user_message)
+
+
+def canned_inner_thought(character: CharacterPersona, user_message: str) -> InnerThought:
+    """
+    말투 예시로 속마음 생성 (LLM 호출 없음)
+    
+    Args:
+        character: 캐릭터 정보
+        user_message: 유저 메시지 (예시 선택용)
+    
+    Returns:
+        InnerThought 객체 (감정/평가는 중립)
+    """
+    lines = _sub_lines(character)
+    if lines:
+        thought = _pick(INNER_THOUGHT_TEMPLATES, character, user_message).format(
+            line=_pick(lines, character, user_message)
+        )
+    else:
+        thought = "일단 지켜보자."
+    
+    return InnerThought(
+        character_id=character.id,
+        character_name=character.name,
+        turn_id=str(uuid.uuid4()),
+        thought=thought,
+        surface_emotion="중립",
+        inner_emotion="중립",
+        emotion_gap=False,
+        user_evaluation="평가 중",
+        attitude_toward_user="중립",
+        intention="관망"
+    )
@@ -0,0 +1,139 @@
+"""
+멱등 턴 처리
+SYNK MVP - 같은 Idempotency-Key로 재시도된 턴은 저장된 결과를 재생
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+
+from utils.config import get_idempotency_cache_size, get_idempotency_ttl_seconds
+from utils.metrics import record_cache_lookup
+
+
+class _IdempotencyEntry:
+    """키별 진행 중/완료된 턴 결과"""
+    
+    def __init__(self, fingerprint: str, future: asyncio.Future):
+        self.fingerprint = fingerprint
+        self.future = future
+        self.created_at = time.monotonic()
+        self.waiters = 0  # 같은 키로 결과를 기다리는 중복 요청 수
+
+
+class IdempotencyStore:
+    """
+    멱등 키별 턴 결과 저장소 (싱글톤 패턴)
+    
+    - 완료된 결과는 TTL 동안 보관하고 재시도 시 그대로 반환
+    - 진행 중인 키로 동시에 들어온 요청은 새로 실행하지 않고 같은 결과를 기다림
+    - 실패한 턴은 저장하지 않음 (재시도하면 다시 실행)
+    - 최대 개수를 넘으면 오래된 완료 항목부터 제거 (LRU)
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IdempotencyStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._entries: "OrderedDict[str, _IdempotencyEntry]" = OrderedDict()
+        self.max_entries = get_idempotency_cache_size()
+        self.ttl_seconds = get_idempotency_ttl_seconds()
+        self._initialized = True
+    
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        멱등 키로 턴 실행
+        
+        Args:
+            key: 멱등 키 (유저 단위로 구분된 키)
+            fingerprint: 요청 내용 지문 (같은 키로 다른 요청이 오면 422)
+            factory: 실제 턴을 실행하는 코루틴 함수
+        
+        Returns:
+            (결과, 재생 여부) 튜플
+        """
+        self._evict_expired()
+        
+        entry = self._entries.get(key)
+        record_cache_lookup("idempotency", entry is not None)
+        if entry:
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail="같은 Idempotency-Key로 다른 요청이 전송되었습니다."
+                )
+            self._entries.move_to_end(key)
+            # 진행 중이면 완료될 때까지 대기 (대기 요청이 취소돼도 원래 턴은 계속)
+            entry.waiters += 1
+            try:
+                result = await asyncio.shield(entry.future)
+            finally:
+                entry.waiters -= 1
+            return result, True
+        
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = _IdempotencyEntry(fingerprint, future)
+        self._evict_overflow()
+        
+        try:
+            result = await factory()
+        except BaseException as e:
+            # 실패한 턴은 저장하지 않음 (대기 중인 요청에는 같은 오류 전달)
+            self._entries.pop(key, None)
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # 대기자가 없어도 경고가 나지 않도록 조회 처리
+            raise
+        
+        future.set_result(result)
+        return result, False
+    
+    def has_waiters(self, key: str) -> bool:
+        """진행 중인 키의 결과를 기다리는 중복 요청이 있는지 확인 (원래 요청이 끊겨도 턴을 유지할지 판단)"""
+        entry = self._entries.get(key)
+        return bool(entry and entry.waiters > 0 and not entry.future.done())
+    
+    def _evict_expired(self):
+        """TTL이 지난 완료 항목 제거"""
+        now = time.monotonic()
+        expired = [
+            key for key, entry in self._entries.items()
+            if entry.future.done() and now - entry.created_at > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
+    
+    def _evict_overflow(self):
+        """최대 개수 초과 시 오래된 완료 항목부터 제거 (진행 중인 항목은 유지)"""
+        overflow = len(self._entries) - self.max_entries
+        if overflow <= 0:
+            return
+        for key in [k for k, e in self._entries.items() if e.future.done()][:overflow]:
+            del self._entries[key]
+
+
+def make_request_fingerprint(*parts: Optional[str]) -> str:
+    """요청 내용 지문 생성"""
+    raw = "\x1f".join(part or "" for part in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# 전역 인스턴스
+idempotency_store = IdempotencyStore()
@@ -5,14 +5,23 @@ SYNK MVP - 캐릭터의 속마음(Inner Thought) 생성
 from typing import Optional, TYPE_CHECKING
 from models.character import CharacterPersona
 from models.relationship import RelationshipData
-from models.inner_thought import InnerThought, INNER_THOUGHT_PROMPT
+from models.inner_thought import InnerThought, InnerThoughtOutput, INNER_THOUGHT_PROMPT
 from utils.gemini_client import gemini_client
-import json
+from utils.llm_scheduler import LLMCallType
+from utils.generation_profiles import get_generation_profile, PROFILE_INNER_THOUGHT
+from utils.structured_output import gemini_schema, parse_structured
+from utils.circuit_breaker import CircuitOpenError
+from core.fallback_reactions import canned_inner_thought
+from utils.tracer import traced
+from utils.logger import get_logger
 
 if TYPE_CHECKING:
     from models.scene_context import SceneContext
 
+logger = get_logger(__name__)
 
+
+@traced("inner_thought", character=lambda args: args["character"].name)
 async def generate_inner_thought(
     character: CharacterPersona,
     character_dialogue: str,
@@ -33,7 +42,7 @@ async def generate_inner_thought(
         scene_context: 씬 컨텍스트
     
     Returns:
-        InnerThought 객체 또는 None
+        InnerThought 객체 또는 None (LLM 차단 중이면 말투 예시로 만든 속마음)
     """
     # 관계 상태
     relationship_status = "알 수 없음"
@@ -54,7 +63,7 @@ async def generate_inner_thought(
 - 분위기: {scene_context.atmosphere} (긴장도: {scene_context.tension_level}/10)
 - 최근 이벤트: {', '.join([e.summary for e in scene_context.recent_events[-3:]]) if scene_context.recent_events else '없음'}
 """
-    
+
     # 프롬프트 생성
     prompt = INNER_THOUGHT_PROMPT.format(
         character_name=character.name,
@@ -67,56 +76,41 @@ async def generate_inner_thought(
     )
     
     try:
-        # AI로 속마음 생성
-        response_text = gemini_client.generate_response(prompt)
+        # AI로 속마음 생성 (JSON 모드 + 응답 스키마)
+        generation = get_generation_profile(PROFILE_INNER_THOUGHT, character).with_response_schema(
+            gemini_schema(InnerThoughtOutput)
+        )
+        response_text = await gemini_client.generate_response_async(
+            prompt,
+            call_type=LLMCallType.INNER_THOUGHT,
+            generation=generation
+        )
         
-        # JSON 파싱 시도
-        try:
-            # JSON 부분만 추출 (마크다운 코드 블록 제거)
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            thought_data = json.loads(response_text)
-        except json.JSONDecodeError:
-            # JSON 파싱 실패 시 기본값 사용
-            thought_data = {
-                "thought": response_text[:100] + "...",
-                "surface_emotion": "중립",
-                "inner_emotion": "중립",
-                "emotion_gap": False,
-                "user_evaluation": "평가 중",
-                "attitude_toward_user": "중립",
-                "intention": "관찰 중"
-            }
+        output = await parse_structured(response_text, InnerThoughtOutput, LLMCallType.INNER_THOUGHT)
+        if output is None:
+            # 파싱 실패 시 기본값 사용
+            output = InnerThoughtOutput(
+                thought=response_text[:100] + "...",
+                user_evaluation="평가 중",
+                attitude_toward_user="중립",
+                intention="관찰 중"
+            )
         
         # InnerThought 객체 생성
-        from datetime import datetime
         import uuid
         
         inner_thought = InnerThought(
             character_id=character.id,
             character_name=character.name,
             turn_id=str(uuid.uuid4()),
-            thought=thought_data.get("thought", ""),
-            surface_emotion=thought_data.get("surface_emotion", "중립"),
-            inner_emotion=thought_data.get("inner_emotion", "중립"),
-            emotion_gap=thought_data.get("emotion_gap", False),
-            user_evaluation=thought_data.get("user_evaluation"),
-            attitude_toward_user=thought_data.get("attitude_toward_user"),
-            intention=thought_data.get("intention"),
-            next_plan=thought_data.get("next_plan")
+            **output.dict()
         )
         
         return inner_thought
     
+    except CircuitOpenError:
+        # LLM 차단 중 - 말투 예시로 만든 속마음으로 대체
+        return canned_inner_thought(character, user_message)
     except Exception as e:
-        import traceback
-        print(f"⚠️ 속마음 생성 오류: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("속마음 생성 오류: %s", e)
         return None
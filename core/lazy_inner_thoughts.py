@@ -0,0 +1,310 @@
+"""
+지연 속마음 (Lazy Inner Thoughts)
+UI는 유저가 펼칠 때만 속마음을 보여주므로, 턴에서는 핸들만 돌려주고
+GET /api/chat/turn/{turn_id}/inner/{character_id}로 처음 조회할 때 생성
+
+- 턴 처리 중 lazy_inner_thoughts() 안에서는 속마음 생성 대신 생성 입력을 저장하고 핸들 반환
+- 처음 조회할 때 생성해서 저장 (동시에 여러 번 조회해도 한 번만 생성), 이후에는 저장된 속마음
+- 생성한 속마음은 그 턴이 세션의 마지막 턴일 때만 Scene Context에 반영 (지난 턴 속마음이 새 상태를 덮지 않도록)
+- 핸들은 INNER_THOUGHT_HANDLE_TTL_SECONDS 동안 보관, INNER_THOUGHT_HANDLE_MAX_ENTRIES를 넘으면 오래된 것부터 제거
+"""
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from models.character import CharacterPersona
+from models.relationship import RelationshipData
+from models.scene_context import SceneContext
+from core.inner_thought_generator import generate_inner_thought
+from core.scene_manager import scene_manager
+from utils.logger import get_logger, log_context
+from utils.token_accounting import usage_tags
+from utils.metrics import metrics, record_cache_lookup
+from utils.config import get_inner_thought_handle_ttl_seconds, get_inner_thought_handle_max_entries
+
+logger = get_logger(__name__)
+
+# 응답에 넣는 속마음 필드 (무반응 캐릭터는 의도/태도 제외)
+INNER_THOUGHT_FIELDS = (
+    "thought", "surface_emotion", "inner_emotion", "emotion_gap",
+    "user_evaluation", "attitude_toward_user", "intention"
+)
+NO_REACTION_THOUGHT_FIELDS = INNER_THOUGHT_FIELDS[:5]
+
+# 속마음을 만든 캐릭터의 역할 (Scene Context 반영 방식이 다름)
+ROLE_MAIN = "main"
+ROLE_SUB = "sub"
+ROLE_NO_REACTION = "no_reaction"
+
+HANDLE_STATUS_PENDING = "pending"
+
+# 지연 속마음 지표 (/metrics)
+# - deferred: 핸들로 대체, generated: 조회 시 생성, failed: 조회 시 생성 실패
+lazy_inner_thoughts_total = metrics.counter(
+    "lazy_inner_thoughts_total",
+    "Inner thoughts deferred to handles and generated on first access",
+    ["outcome"]
+)
+
+
+def inner_thought_to_dict(inner_thought_obj, fields: Sequence[str] = INNER_THOUGHT_FIELDS) -> Optional[Dict]:
+    """InnerThought 객체 → 응답용 dict (없으면 None)"""
+    if not inner_thought_obj:
+        return None
+    return {field: getattr(inner_thought_obj, field) for field in fields}
+
+
+def inner_thought_url(turn_id: str, character_id: str) -> str:
+    """속마음 조회 경로"""
+    return f"/api/chat/turn/{turn_id}/inner/{character_id}"
+
+
+def is_inner_thought_handle(value: Any) -> bool:
+    """아직 생성하지 않은 속마음 핸들인지"""
+    return isinstance(value, dict) and value.get("status") == HANDLE_STATUS_PENDING
+
+
+class LazyTurn:
+    """속마음을 지연 생성하는 턴 정보"""
+    
+    def __init__(self, turn_id: str, session_id: str, user_id: str):
+        self.turn_id = turn_id
+        self.session_id = session_id
+        self.user_id = user_id
+
+
+_current_lazy_turn: ContextVar[Optional[LazyTurn]] = ContextVar("lazy_inner_thought_turn", default=None)
+
+
+@contextmanager
+def lazy_inner_thoughts(turn_id: str, session_id: str, user_id: str):
+    """이 블록 안의 씬 리액션은 속마음 대신 핸들을 반환"""
+    token = _current_lazy_turn.set(LazyTurn(turn_id, session_id, user_id))
+    try:
+        yield
+    finally:
+        _current_lazy_turn.reset(token)
+
+
+def current_lazy_turn() -> Optional[LazyTurn]:
+    """현재 지연 속마음 턴 (지연 모드가 아니면 None)"""
+    return _current_lazy_turn.get()
+
+
+class PendingInnerThought:
+    """핸들 하나 (생성 입력 → 생성 후에는 결과만 보관)"""
+    
+    def __init__(
+        self,
+        lazy_turn: LazyTurn,
+        character: CharacterPersona,
+        character_dialogue: str,
+        user_message: str,
+        relationship_data: Optional[RelationshipData],
+        location: str,
+        scene_context: Optional[SceneContext],
+        fields: Sequence[str],
+        role: str
+    ):
+        self.turn = lazy_turn
+        self.character = character
+        self.character_dialogue = character_dialogue
+        self.user_message = user_message
+        self.relationship_data = relationship_data
+        self.location = location
+        self.scene_context = scene_context
+        self.fields = tuple(fields)
+        self.role = role
+        self.created_at = time.monotonic()
+        self.result: Optional[Dict] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+def _snapshot_scene(scene_context: Optional[SceneContext]) -> Optional[SceneContext]:
+    """
+    턴 시점의 씬 컨텍스트 (속마음 프롬프트에 쓰는 장소/분위기/긴장도/최근 이벤트만 고정)
+    
+    씬 컨텍스트는 다음 턴에 계속 바뀌므로 얕은 복사 후 최근 이벤트 목록만 따로 복사
+    """
+    if scene_context is None:
+        return None
+    snapshot = copy.copy(scene_context)
+    snapshot.recent_events = list(scene_context.recent_events[-3:])
+    return snapshot
+
+
+class InnerThoughtStore:
+    """
+    지연 속마음 저장소 (싱글톤 패턴)
+    
+    (turn_id, character_id) → 생성 입력/결과, 세션별 마지막 턴 ID
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(InnerThoughtStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.ttl_seconds = get_inner_thought_handle_ttl_seconds()
+        self.max_entries = get_inner_thought_handle_max_entries()
+        self._entries: "OrderedDict[Tuple[str, str], PendingInnerThought]" = OrderedDict()
+        self._latest_turns: "OrderedDict[str, str]" = OrderedDict()
+        self._initialized = True
+    
+    def begin_turn(self, session_id: str, turn_id: str):
+        """세션의 새 턴 시작 기록 (이전 턴 속마음은 조회는 되지만 Scene Context에는 반영하지 않음)"""
+        self._latest_turns[session_id] = turn_id
+        self._latest_turns.move_to_end(session_id)
+        while len(self._latest_turns) > self.max_entries:
+            self._latest_turns.popitem(last=False)
+    
+    def is_latest_turn(self, session_id: str, turn_id: str) -> bool:
+        """세션의 마지막 턴인지"""
+        return self._latest_turns.get(session_id) == turn_id
+    
+    def defer(
+        self,
+        lazy_turn: LazyTurn,
+        character: CharacterPersona,
+        character_dialogue: str,
+        user_message: str,
+        relationship_data: Optional[RelationshipData],
+        location: str,
+        scene_context: Optional[SceneContext],
+        fields: Sequence[str] = INNER_THOUGHT_FIELDS,
+        role: str = ROLE_MAIN
+    ) -> Dict:
+        """
+        속마음 생성 입력을 저장하고 핸들 반환
+        
+        Returns:
+            {"status": "pending", "turn_id", "character_id", "url"}
+        """
+        key = (lazy_turn.turn_id, character.id)
+        self._entries[key] = PendingInnerThought(
+            lazy_turn=lazy_turn,
+            character=character,
+            character_dialogue=character_dialogue,
+            user_message=user_message,
+            relationship_data=relationship_data,
+            location=location,
+            scene_context=_snapshot_scene(scene_context),
+            fields=fields,
+            role=role
+        )
+        self._entries.move_to_end(key)
+        self._evict()
+        lazy_inner_thoughts_total.inc(outcome="deferred")
+        return {
+            "status": HANDLE_STATUS_PENDING,
+            "turn_id": lazy_turn.turn_id,
+            "character_id": character.id,
+            "url": inner_thought_url(lazy_turn.turn_id, character.id)
+        }
+    
+    def peek(self, handle: Dict) -> Optional[Dict]:
+        """핸들의 속마음이 이미 생성됐으면 반환 (생성하지 않음)"""
+        entry = self._entries.get((handle.get("turn_id"), handle.get("character_id")))
+        return entry.result if entry else None
+    
+    async def resolve(self, turn_id: str, character_id: str) -> Optional[Dict]:
+        """
+        속마음 조회 (처음 조회할 때 생성)
+        
+        Returns:
+            속마음 dict (생성 실패 시 None - 다시 조회하면 재시도)
+        
+        Raises:
+            KeyError: 핸들이 없거나 만료됨
+        """
+        key = (turn_id, character_id)
+        self._evict()
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        
+        record_cache_lookup("inner_thought_handle", entry.result is not None)
+        if entry.result is not None:
+            return entry.result
+        
+        # 동시에 조회하면 같은 생성 작업을 기다림
+        if entry.task is None:
+            entry.task = asyncio.create_task(self._generate(entry))
+        try:
+            return await asyncio.shield(entry.task)
+        finally:
+            if entry.task is not None and entry.task.done() and entry.result is None:
+                entry.task = None
+    
+    def get_stats(self) -> Dict:
+        """보관 중인 핸들 수"""
+        resolved = sum(1 for entry in self._entries.values() if entry.result is not None)
+        return {
+            "entries": len(self._entries),
+            "resolved": resolved,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+        }
+    
+    async def _generate(self, entry: PendingInnerThought) -> Optional[Dict]:
+        """속마음 생성 (토큰 사용량/로그는 원래 턴의 유저/세션으로 기록)"""
+        lazy_turn = entry.turn
+        with log_context(session_id=lazy_turn.session_id, turn_id=lazy_turn.turn_id), \
+                usage_tags(user_id=lazy_turn.user_id, session_id=lazy_turn.session_id):
+            try:
+                inner_thought_obj = await generate_inner_thought(
+                    character=entry.character,
+                    character_dialogue=entry.character_dialogue,
+                    user_message=entry.user_message,
+                    relationship_data=entry.relationship_data,
+                    location=entry.location,
+                    scene_context=entry.scene_context
+                )
+            except Exception as e:
+                logger.warning("지연 속마음 생성 오류 (%s): %s", entry.character.name, e)
+                inner_thought_obj = None
+        
+        inner_thought_dict = inner_thought_to_dict(inner_thought_obj, entry.fields)
+        if inner_thought_dict is None:
+            lazy_inner_thoughts_total.inc(outcome="failed")
+            return None
+        
+        lazy_inner_thoughts_total.inc(outcome="generated")
+        entry.result = inner_thought_dict
+        # 생성 입력은 더 이상 필요 없음
+        entry.character_dialogue = entry.user_message = ""
+        entry.relationship_data = entry.scene_context = None
+        
+        if self.is_latest_turn(lazy_turn.session_id, lazy_turn.turn_id):
+            scene_manager.apply_inner_thought(
+                session_id=lazy_turn.session_id,
+                character_id=entry.character.id,
+                character_name=entry.character.name,
+                inner_thought=inner_thought_dict,
+                role=entry.role
+            )
+        return inner_thought_dict
+    
+    def _evict(self):
+        """만료/초과 핸들 제거 (오래된 순서로 저장되므로 앞에서부터)"""
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_entries or now - entry.created_at > self.ttl_seconds:
+                self._entries.popitem(last=False)
+            else:
+                break
+
+
+# 전역 인스턴스
+inner_thought_store = InnerThoughtStore()
@@ -0,0 +1,140 @@
+"""
+부하 적응형 단계 생략 컨트롤러
+SYNK MVP - LLM 지연/대기열이 늘어나면 선택 단계를 순서대로 끄고, 회복되면 다시 켬
+"""
+import time
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+from utils.llm_scheduler import llm_scheduler
+from utils.logger import get_logger
+from utils.config import (
+    is_load_shedding_enabled,
+    get_load_shed_target_p95_seconds,
+    get_load_shed_target_queue_depth,
+    get_load_shed_window_seconds,
+    get_load_shed_hold_seconds
+)
+
+logger = get_logger(__name__)
+
+
+class SheddableStage(str, Enum):
+    """부하 시 생략할 수 있는 씬 리액션 단계"""
+    INTERVENTION = "intervention"                # 끼어들기
+    NO_REACTION_THOUGHT = "no_reaction_thought"  # 무반응 캐릭터 속마음
+    SUB_REACTION = "sub_reaction"                # 서브 리액션
+    TIKITAKA = "tikitaka"                        # 캐릭터 간 티키타카
+
+
+# 부하가 커질수록 앞에서부터 생략 (레벨 n = 앞의 n개 단계 생략)
+SHED_ORDER: List[SheddableStage] = [
+    SheddableStage.INTERVENTION,
+    SheddableStage.NO_REACTION_THOUGHT,
+    SheddableStage.SUB_REACTION,
+    SheddableStage.TIKITAKA,
+]
+
+# 레벨별 진입 부하 (부하 = max(p95 / 기준 p95, 대기열 / 기준 대기열))
+LEVEL_ENTER_PRESSURE = [1.0, 1.5, 2.0, 3.0]
+
+# 레벨을 내리려면 현재 레벨 진입 부하의 이 비율 아래로 내려가야 함 (히스테리시스)
+RECOVERY_RATIO = 0.8
+
+
+class LoadShedDecision(BaseModel):
+    """턴 단위 단계 생략 결정 (턴 metadata에 그대로 기록)"""
+    level: int = 0
+    disabled_stages: List[str] = []
+    pressure: float = 0.0
+    p95_latency: Optional[float] = None
+    queue_depth: int = 0
+    reason: str = "정상"
+    
+    def allows(self, stage: SheddableStage) -> bool:
+        """단계 실행 여부"""
+        return stage.value not in self.disabled_stages
+
+
+class LoadShedder:
+    """
+    단계 생략 컨트롤러 (싱글톤 패턴)
+    
+    - 최근 LOAD_SHED_WINDOW_SECONDS 동안의 LLM 호출 p95 지연 시간과 현재 대기열 길이로 부하 계산
+    - 부하가 진입 기준을 넘으면 즉시 레벨을 올림
+      (끼어들기 → 무반응 속마음 → 서브 리액션 → 티키타카 순으로 생략)
+    - 부하가 줄면 LOAD_SHED_HOLD_SECONDS마다 한 단계씩 다시 켬
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LoadShedder, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.enabled = is_load_shedding_enabled()
+        self.target_p95 = get_load_shed_target_p95_seconds()
+        self.target_queue_depth = max(1, get_load_shed_target_queue_depth())
+        self.window_seconds = get_load_shed_window_seconds()
+        self.hold_seconds = get_load_shed_hold_seconds()
+        
+        self.level = 0
+        self._changed_at = time.monotonic()
+        self._initialized = True
+    
+    def decide(self) -> LoadShedDecision:
+        """
+        현재 부하로 이번 턴의 단계 생략 수준 결정
+        
+        Returns:
+            LoadShedDecision: 생략 레벨, 생략된 단계, 판단 근거
+        """
+        if not self.enabled:
+            return LoadShedDecision(reason="비활성화")
+        
+        p95 = llm_scheduler.latency_percentile(0.95, window_seconds=self.window_seconds)
+        queue_depth = llm_scheduler.queue_depth()
+        latency_pressure = p95 / self.target_p95 if p95 and self.target_p95 > 0 else 0.0
+        queue_pressure = queue_depth / self.target_queue_depth
+        pressure = max(latency_pressure, queue_pressure)
+        
+        target_level = sum(1 for threshold in LEVEL_ENTER_PRESSURE if pressure >= threshold)
+        now = time.monotonic()
+        previous_level = self.level
+        
+        if target_level > self.level:
+            # 악화: 즉시 필요한 레벨로
+            self.level = target_level
+            self._changed_at = now
+        elif target_level < self.level and now - self._changed_at >= self.hold_seconds:
+            # 회복: 충분히 내려갔을 때만 한 단계씩
+            if pressure < LEVEL_ENTER_PRESSURE[self.level - 1] * RECOVERY_RATIO:
+                self.level -= 1
+                self._changed_at = now
+        
+        if latency_pressure >= queue_pressure:
+            reason = f"p95 {p95:.1f}s / 기준 {self.target_p95:.1f}s" if p95 else "지연 표본 없음"
+        else:
+            reason = f"대기열 {queue_depth} / 기준 {self.target_queue_depth}"
+        
+        if self.level != previous_level:
+            logger.warning("부하 레벨 %s → %s (부하 %.2f, %s)", previous_level, self.level, pressure, reason)
+        
+        return LoadShedDecision(
+            level=self.level,
+            disabled_stages=[stage.value for stage in SHED_ORDER[:self.level]],
+            pressure=round(pressure, 3),
+            p95_latency=round(p95, 3) if p95 is not None else None,
+            queue_depth=queue_depth,
+            reason=reason
+        )
+
+
+# 전역 인스턴스
+load_shedder = LoadShedder()
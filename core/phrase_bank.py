@@ -0,0 +1,355 @@
+"""
+말투 문구 모음
+SYNK MVP - 캐릭터의 말투 예시/성격/감정 트리거로 만든 짧은 대사를 분위기·감정별로 저장하고,
+서브 리액션 단계에서 LLM 호출 없이 골라 씀
+
+- 생성: 캐릭터 저장 시, scripts/build_phrase_bank.py (규칙 기반, LLM 호출 없음)
+- 선택: 유저 메시지의 감정(감정 트리거 우선)과 씬 분위기가 맞는 문구 중 하나
+- 긴장도가 SUB_REACTION_LLM_MIN_TENSION 이상인 씬은 LLM으로 생성 (설정한 경우만)
+"""
+import asyncio
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from models.character import CharacterPersona, CharacterPhrase
+from models.scene_context import SceneContext
+from db.character_db import SessionLocal, get_character_phrases, get_characters_phrases, replace_character_phrases
+from core.emotion_analyzer import detect_emotion
+from core.fallback_reactions import DEFAULT_SUB_LINE, MAX_SUB_LINE_LENGTH
+from utils.config import is_phrase_bank_enabled, get_sub_reaction_llm_min_tension
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# 분위기
+MOOD_CALM = "calm"
+MOOD_PLAYFUL = "playful"
+MOOD_HOSTILE = "hostile"
+
+EMOTION_NEUTRAL = "neutral"
+
+# 문구 출처
+SOURCE_SPEECH_EXAMPLE = "speech_example"
+SOURCE_PERSONALITY = "personality"
+SOURCE_EMOTION_TRIGGER = "emotion_trigger"
+SOURCE_DEFAULT = "default"
+
+# 문구를 만드는 캐릭터 필드 (수정되면 다시 생성)
+PHRASE_SOURCE_FIELDS = frozenset({"speech_examples", "personality", "emotion_triggers"})
+
+# 서브 리액션 대사 출처 지표 (/metrics) - phrase_bank / llm / canned(LLM 차단 시 대체)
+sub_reaction_lines = metrics.counter(
+    "sub_reaction_lines_total",
+    "Sub reaction lines by source",
+    ["source"]
+)
+
+# 감정 트리거 값 → 감정 (emotion_analyzer.detect_emotion과 같은 이름으로 통일)
+EMOTION_ALIASES = {
+    "angry": "anger",
+    "happy": "joy",
+    "excited": "excitement",
+    "sad": "sadness",
+    "nervous": "fear",
+    "scared": "fear",
+    "afraid": "fear",
+    "shy": "embarrassed",
+}
+
+# 문구 분위기 판단 키워드
+HOSTILE_KEYWORDS = ["꺼져", "닥쳐", "죽고", "죽을", "경고", "감히", "건드리", "거지", "짜증", "뭐야", "웃기지 마"]
+PLAYFUL_KEYWORDS = ["크큭", "후후", "ㅋㅋ", "하하", "헤헤", "히히", "재미있", "재밌", "~"]
+
+# 성격 키워드 → 문구 (텍스트, 분위기, 감정)
+PERSONALITY_LINES: List[Tuple[List[str], List[Tuple[str, str, str]]]] = [
+    (["오만", "건방", "거만", "양아치"], [
+        ("*코웃음*", MOOD_HOSTILE, EMOTION_NEUTRAL),
+        ("흥...", MOOD_HOSTILE, EMOTION_NEUTRAL),
+    ]),
+    (["냉정", "냉소", "차갑", "독설", "살벌"], [
+        ("*차갑게 바라본다*", MOOD_HOSTILE, EMOTION_NEUTRAL),
+        ("...하.", MOOD_CALM, EMOTION_NEUTRAL),
+    ]),
+    (["밝", "명랑", "활발", "쾌활"], [
+        ("*생긋 웃는다*", MOOD_PLAYFUL, "joy"),
+        ("오~", MOOD_PLAYFUL, "excitement"),
+    ]),
+    (["다정", "상냥", "친절", "배려"], [
+        ("*걱정스럽게 바라본다*", MOOD_CALM, EMOTION_NEUTRAL),
+    ]),
+    (["졸", "게으", "나른", "귀찮"], [
+        ("*하품한다*", MOOD_CALM, EMOTION_NEUTRAL),
+        ("으음... 귀찮아.", MOOD_CALM, EMOTION_NEUTRAL),
+    ]),
+    (["소심", "수줍", "겁"], [
+        ("*움찔한다*", MOOD_CALM, "fear"),
+        ("아, 저기...", MOOD_CALM, "fear"),
+    ]),
+    (["광기", "미친", "전투광"], [
+        ("*히죽 웃는다*", MOOD_PLAYFUL, "excitement"),
+    ]),
+]
+
+# 감정 트리거가 있는 감정 → 문구 (텍스트, 분위기)
+EMOTION_LINES: Dict[str, List[Tuple[str, str]]] = {
+    "anger": [("*표정이 굳는다*", MOOD_HOSTILE), ("...뭐?", MOOD_HOSTILE)],
+    "sadness": [("*시선을 떨군다*", MOOD_CALM)],
+    "fear": [("*움찔한다*", MOOD_CALM)],
+    "embarrassed": [("*헛기침을 한다*", MOOD_CALM)],
+    "joy": [("*입꼬리가 올라간다*", MOOD_PLAYFUL)],
+    "excitement": [("*눈을 반짝인다*", MOOD_PLAYFUL)],
+}
+
+# 이 긴장도 이상이거나 분위기가 험악하면 hostile, friendly 분위기면 playful
+HOSTILE_TENSION = 7
+HOSTILE_ATMOSPHERES = ("hostile", "tense")
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?…~])\s+")
+
+
+def normalize_emotion(emotion: str) -> str:
+    """감정 이름 통일 (sad → sadness 등)"""
+    emotion = (emotion or "").strip().lower()
+    return EMOTION_ALIASES.get(emotion, emotion) or EMOTION_NEUTRAL
+
+
+def classify_mood(line: str) -> str:
+    """문구의 분위기 (키워드 기준)"""
+    if any(keyword in line for keyword in HOSTILE_KEYWORDS):
+        return MOOD_HOSTILE
+    if any(keyword in line for keyword in PLAYFUL_KEYWORDS):
+        return MOOD_PLAYFUL
+    return MOOD_CALM
+
+
+def _short_lines(example: str) -> List[str]:
+    """말투 예시에서 서브 리액션 길이의 문장만 (긴 예시는 문장 단위로 나눔)"""
+    example = example.strip()
+    if len(example) <= MAX_SUB_LINE_LENGTH:
+        return [example] if example else []
+    return [s for s in _SENTENCE_PATTERN.split(example) if s and len(s) <= MAX_SUB_LINE_LENGTH]
+
+
+def build_phrase_bank(character: CharacterPersona) -> List[CharacterPhrase]:
+    """
+    캐릭터 말투 문구 생성 (LLM 호출 없음)
+    
+    말투 예시 → 성격 키워드 → 감정 트리거 → 기본 문구 순으로 모으고 같은 문구는 한 번만
+    
+    Args:
+        character: 캐릭터 정보
+    
+    Returns:
+        말투 문구 목록
+    """
+    phrases: List[CharacterPhrase] = []
+    seen = set()
+    
+    def add(text: str, mood: str, emotion: str, source: str):
+        if text not in seen:
+            seen.add(text)
+            phrases.append(CharacterPhrase(text=text, mood=mood, emotion=emotion, source=source))
+    
+    for example in character.speech_examples:
+        for line in _short_lines(example or ""):
+            mood = classify_mood(line)
+            emotion = detect_emotion(line) or EMOTION_NEUTRAL
+            if mood == MOOD_HOSTILE and emotion == "joy":
+                # "웃기지 마" 같은 비웃음은 기쁨이 아님
+                emotion = EMOTION_NEUTRAL
+            add(line, mood, emotion, SOURCE_SPEECH_EXAMPLE)
+    
+    for keywords, lines in PERSONALITY_LINES:
+        if any(keyword in character.personality for keyword in keywords):
+            for text, mood, emotion in lines:
+                add(text, mood, emotion, SOURCE_PERSONALITY)
+    
+    for emotion in dict.fromkeys(normalize_emotion(value) for value in character.emotion_triggers.values()):
+        for text, mood in EMOTION_LINES.get(emotion, []):
+            add(text, mood, emotion, SOURCE_EMOTION_TRIGGER)
+    
+    add(DEFAULT_SUB_LINE, MOOD_CALM, EMOTION_NEUTRAL, SOURCE_DEFAULT)
+    return phrases
+
+
+def message_emotion(character: CharacterPersona, user_message: str) -> str:
+    """유저 메시지가 불러일으키는 감정 (캐릭터 감정 트리거 우선, 없으면 메시지 감정)"""
+    for trigger, emotion in character.emotion_triggers.items():
+        if trigger and trigger in user_message:
+            return normalize_emotion(emotion)
+    return detect_emotion(user_message) or EMOTION_NEUTRAL
+
+
+def scene_mood(scene_context: Optional[SceneContext], emotion: str) -> str:
+    """지금 씬에 어울리는 분위기 (긴장도/분위기, 없으면 감정 기준)"""
+    if scene_context is not None:
+        if scene_context.tension_level >= HOSTILE_TENSION or scene_context.atmosphere in HOSTILE_ATMOSPHERES:
+            return MOOD_HOSTILE
+        if scene_context.atmosphere == "friendly":
+            return MOOD_PLAYFUL
+    if emotion == "anger":
+        return MOOD_HOSTILE
+    if emotion in ("joy", "excitement"):
+        return MOOD_PLAYFUL
+    return MOOD_CALM
+
+
+class PhraseBank:
+    """
+    말투 문구 모음 (싱글톤 패턴)
+    
+    - 캐릭터별 문구는 턴 시작 때 preload로 장소 캐릭터 것을 한 번에 DB에서 읽어 메모리에 보관
+      (스레드에서 조회, 캐릭터가 수정되면 다시 읽음) - pick은 메모리에서만 고름
+    - DB에 문구가 없으면 캐릭터 정보로 바로 만들어 사용 (저장하지 않음)
+    - 같은 캐릭터가 직전 턴과 같은 문구를 반복하지 않도록 후보가 여럿이면 직전 문구 제외
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PhraseBank, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.enabled = is_phrase_bank_enabled()
+        self.llm_min_tension = get_sub_reaction_llm_min_tension()
+        self._lock = threading.Lock()
+        # 캐릭터 ID → (캐릭터 수정 시각, 문구 목록)
+        self._phrases: Dict[str, Tuple[object, List[CharacterPhrase]]] = {}
+        self._last_picked: Dict[str, str] = {}
+        self._initialized = True
+    
+    def use_llm(self, scene_context: Optional[SceneContext]) -> bool:
+        """
+        서브 리액션을 LLM으로 생성할지
+        
+        문구 모음을 끄거나, 긴장도가 SUB_REACTION_LLM_MIN_TENSION 이상인 씬이면 True
+        """
+        if not self.enabled:
+            return True
+        if self.llm_min_tension <= 0 or scene_context is None:
+            return False
+        return scene_context.tension_level >= self.llm_min_tension
+    
+    def _cached(self, character: CharacterPersona) -> Optional[List[CharacterPhrase]]:
+        """메모리에 보관한 문구 (없거나 캐릭터가 수정되었으면 None)"""
+        with self._lock:
+            cached = self._phrases.get(character.id)
+        if cached is not None and cached[0] == character.updated_at:
+            return cached[1]
+        return None
+    
+    async def preload(self, characters: List[CharacterPersona]):
+        """
+        장소 캐릭터들의 문구를 메모리에 올림 (턴 시작 시 호출)
+        
+        메모리에 없는 캐릭터만 한 번의 DB 조회로 읽으며, 조회는 스레드에서 실행해 이벤트 루프를 막지 않음
+        """
+        if not self.enabled:
+            return
+        missing = [c for c in characters if self._cached(c) is None]
+        if not missing:
+            return
+        loaded = await asyncio.to_thread(self._load_many, [c.id for c in missing])
+        with self._lock:
+            for character in missing:
+                phrases = loaded.get(character.id) or build_phrase_bank(character)
+                self._phrases[character.id] = (character.updated_at, phrases)
+    
+    def get(self, character: CharacterPersona) -> List[CharacterPhrase]:
+        """캐릭터 말투 문구 (메모리 → DB → 캐릭터 정보로 생성, preload한 턴에서는 메모리에서만)"""
+        cached = self._cached(character)
+        if cached is not None:
+            return cached
+        
+        phrases = self._load(character.id) or build_phrase_bank(character)
+        with self._lock:
+            self._phrases[character.id] = (character.updated_at, phrases)
+        return phrases
+    
+    def pick(
+        self,
+        character: CharacterPersona,
+        user_message: str,
+        scene_context: Optional[SceneContext] = None
+    ) -> str:
+        """
+        서브 리액션 문구 선택 (LLM 호출 없음)
+        
+        감정이 맞으면 2점, 분위기가 맞으면 1점으로 가장 잘 맞는 문구 중
+        캐릭터/메시지/턴으로 정해지는 하나를 고름
+        
+        Args:
+            character: 캐릭터 정보
+            user_message: 유저 메시지
+            scene_context: 씬 컨텍스트 (긴장도/분위기)
+        
+        Returns:
+            반응 텍스트
+        """
+        phrases = self.get(character)
+        emotion = message_emotion(character, user_message)
+        mood = scene_mood(scene_context, emotion)
+        
+        scores = [2 * (p.emotion == emotion) + (p.mood == mood) for p in phrases]
+        best = max(scores)
+        candidates = [p.text for p, score in zip(phrases, scores) if score == best]
+        with self._lock:
+            last = self._last_picked.get(character.id)
+            if len(candidates) > 1 and last in candidates:
+                candidates.remove(last)
+            turn = scene_context.total_turns if scene_context is not None else 0
+            index = zlib.crc32(f"{character.id}:{user_message}:{turn}".encode("utf-8")) % len(candidates)
+            self._last_picked[character.id] = candidates[index]
+        return candidates[index]
+    
+    def invalidate(self, character_id: str):
+        """메모리에 보관한 캐릭터 문구 제거 (다음 사용 때 DB에서 다시 읽음)"""
+        with self._lock:
+            self._phrases.pop(character_id, None)
+    
+    def _load_many(self, character_ids: List[str]) -> Dict[str, List[CharacterPhrase]]:
+        db = SessionLocal()
+        try:
+            return get_characters_phrases(character_ids, db)
+        except SQLAlchemyError as e:
+            logger.warning("말투 문구 조회 실패 (%d명): %s", len(character_ids), e)
+            return {}
+        finally:
+            db.close()
+    
+    def _load(self, character_id: str) -> List[CharacterPhrase]:
+        db = SessionLocal()
+        try:
+            return get_character_phrases(character_id, db)
+        except SQLAlchemyError as e:
+            logger.warning("말투 문구 조회 실패 (%s): %s", character_id, e)
+            return []
+        finally:
+            db.close()
+
+
+def save_phrase_bank(character: CharacterPersona, db: Session) -> int:
+    """
+    캐릭터 말투 문구를 생성해 DB에 저장 (캐릭터 생성/수정 시, scripts/build_phrase_bank.py)
+    
+    Returns:
+        저장한 문구 수
+    """
+    count = replace_character_phrases(character.id, build_phrase_bank(character), db)
+    phrase_bank.invalidate(character.id)
+    return count
+
+
+# 전역 인스턴스
+phrase_bank = PhraseBank()
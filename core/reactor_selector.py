@@ -0,0 +1,150 @@
+"""
+반응 캐릭터 선택
+SYNK MVP - 장소의 캐릭터가 많아도 턴당 LLM 호출 수가 늘지 않도록 점수순으로 메인/서브 반응자를 제한
+
+- 점수: 직접 호명, 최근 대화 참여(recent), 시선(attention), 이번 씬 발화 횟수(turn_count),
+  기분 강도(mood_intensity), 유저와의 친밀도
+- 메인은 최대 REACTOR_MAX_MAIN명, 나머지 중 서브 리액션/무반응 속마음은 최대 REACTOR_MAX_SUB명
+- 그 밖의 캐릭터는 LLM 호출 없이 무반응(속마음 없음)으로 기록
+"""
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+from models.character import CharacterPersona
+from models.relationship import RelationshipData
+from models.scene_context import SceneContext, CharacterAttention
+from utils.metrics import metrics
+from utils.config import get_reactor_max_main, get_reactor_max_sub
+
+# 점수 가중치
+SCORE_MENTIONED = 100.0     # 직접 호명
+SCORE_RECENT = 30.0         # 최근 대화 참여
+SCORE_ATTENTION = {
+    CharacterAttention.USER: 20.0,
+    CharacterAttention.OBSERVING: 10.0,
+    CharacterAttention.CHARACTER: 5.0,
+    CharacterAttention.NONE: 0.0,
+}
+SCORE_PER_TURN = 2.0        # 이번 씬 발화 1회당
+MAX_TURN_BONUS = 5          # 발화 횟수 가산 상한
+SCORE_PER_MOOD = 1.0        # 기분 강도 1당 (1~10)
+SCORE_PER_INTIMACY = 2.0    # 친밀도 1당 (0~10)
+
+# 역할별 선택 수 (/metrics) - skipped: 제한을 넘어 LLM 호출 없이 무반응 처리
+reactors_selected = metrics.counter(
+    "scene_reactors_total",
+    "Characters per scene reaction role after reactor selection",
+    ["role"]
+)
+
+
+class ReactorSelection(BaseModel):
+    """턴 단위 반응 캐릭터 선택 결과 (캐릭터 순서 유지)"""
+    main: List[str] = []       # 메인 응답
+    sub: List[str] = []        # 서브 리액션
+    ignore: List[str] = []     # 무반응 (속마음 생성)
+    skipped: List[str] = []    # 무반응 (LLM 호출 없음)
+    scores: Dict[str, float] = {}
+
+
+def reactor_score(
+    character_id: str,
+    scene_context: Optional[SceneContext],
+    relationship_data: Optional[RelationshipData] = None,
+    mentioned: bool = False
+) -> float:
+    """캐릭터 반응 우선순위 점수 (높을수록 먼저 반응)"""
+    score = SCORE_MENTIONED if mentioned else 0.0
+    
+    state = scene_context.character_states.get(character_id) if scene_context else None
+    if state:
+        if state.recent:
+            score += SCORE_RECENT
+        score += SCORE_ATTENTION.get(state.attention, 0.0)
+        score += min(state.turn_count, MAX_TURN_BONUS) * SCORE_PER_TURN
+        score += state.mood_intensity * SCORE_PER_MOOD
+    
+    if relationship_data:
+        score += relationship_data.intimacy * SCORE_PER_INTIMACY
+    
+    return round(score, 2)
+
+
+def _top(candidates: List[str], scores: Dict[str, float], order: Dict[str, int], limit: int) -> List[str]:
+    """점수 상위 limit명 (동점이면 캐릭터 순서, limit 0이면 전원)"""
+    ranked = sorted(candidates, key=lambda cid: (-scores[cid], order[cid]))
+    return ranked if limit <= 0 else ranked[:limit]
+
+
+def select_reactors(
+    characters: List[CharacterPersona],
+    reaction_types: Dict[str, str],
+    mentioned_ids: List[str],
+    scene_context: Optional[SceneContext],
+    relationships: Optional[Dict[str, Optional[RelationshipData]]] = None,
+    max_main: Optional[int] = None,
+    max_sub: Optional[int] = None
+) -> ReactorSelection:
+    """
+    메인/서브 반응 캐릭터 선택
+    
+    Args:
+        characters: 장소의 캐릭터들
+        reaction_types: 캐릭터별 기본 반응 타입 {character_id: "main" | "reaction" | "ignore"}
+            (determine_reaction_type 결과)
+        mentioned_ids: 유저 메시지에서 직접 호명된 캐릭터 ID
+        scene_context: 씬 컨텍스트
+        relationships: 캐릭터별 관계 데이터 (친밀도 점수용, 없는 캐릭터는 친밀도 0)
+        max_main: 메인 최대 인원 (None이면 REACTOR_MAX_MAIN, 0이면 제한 없음)
+        max_sub: 서브 리액션 + 무반응 속마음 최대 인원 (None이면 REACTOR_MAX_SUB, 0이면 제한 없음)
+    
+    Returns:
+        ReactorSelection
+    """
+    if max_main is None:
+        max_main = get_reactor_max_main()
+    if max_sub is None:
+        max_sub = get_reactor_max_sub()
+    relationships = relationships or {}
+    
+    order = {c.id: i for i, c in enumerate(characters)}
+    scores = {
+        c.id: reactor_score(c.id, scene_context, relationships.get(c.id), c.id in mentioned_ids)
+        for c in characters
+    }
+    
+    # 1. 메인 후보: 직접 호명 > 기본 타입 main > 이전 턴 마지막 화자 > 최고 점수
+    if mentioned_ids:
+        main_candidates = [cid for cid in mentioned_ids if cid in order]
+    else:
+        main_candidates = [c.id for c in characters if reaction_types.get(c.id) == "main"]
+    if not main_candidates and characters:
+        last_speaker_id = scene_context.last_speaker_id if scene_context else None
+        if last_speaker_id in order:
+            main_candidates = [last_speaker_id]
+        else:
+            main_candidates = _top([c.id for c in characters], scores, order, 1)
+    
+    main_ids = set(_top(main_candidates, scores, order, max_main))
+    
+    # 2. 나머지 중 점수 상위만 서브 리액션/무반응 속마음 (메인에서 밀려난 후보는 서브 리액션)
+    side_candidates = [c.id for c in characters if c.id not in main_ids]
+    side_ids = set(_top(side_candidates, scores, order, max_sub))
+    
+    selection = ReactorSelection(scores=scores)
+    for c in characters:
+        if c.id in main_ids:
+            selection.main.append(c.id)
+        elif c.id not in side_ids:
+            selection.skipped.append(c.id)
+        elif c.id in main_candidates or reaction_types.get(c.id) in ("main", "reaction"):
+            selection.sub.append(c.id)
+        else:
+            selection.ignore.append(c.id)
+    
+    for role in ("main", "sub", "ignore", "skipped"):
+        count = len(getattr(selection, role))
+        if count:
+            reactors_selected.inc(count, role=role)
+    
+    return selection
@@ -4,6 +4,7 @@ SYNK MVP - 씬 상태 관리 및 업데이트
 """
 from typing import Optional, List, Dict
 from datetime import datetime
+import json
 import re
 
 from models.scene_context import (
@@ -13,6 +14,18 @@ from models.scene_context import (
     CharacterAttention,
     create_scene_context
 )
+from utils.metrics import metrics
+
+# 세션 지표 (/metrics)
+active_sessions = metrics.gauge("active_sessions", "Sessions with an in-memory scene context")
+session_bytes = metrics.gauge("session_memory_bytes", "Approximate in-memory scene context size (JSON bytes)")
+
+
+def estimate_context_bytes(context: SceneContext) -> int:
+    """씬 컨텍스트 메모리 사용량 추정 (JSON 직렬화 크기, 델타용 마지막 스냅샷 포함)"""
+    data = json.dumps(context.dict(), ensure_ascii=False, default=str)
+    snapshot = json.dumps(context.last_snapshot, ensure_ascii=False, default=str)
+    return len(data.encode("utf-8")) + len(snapshot.encode("utf-8"))
 
 
 class SceneManager:
@@ -31,6 +44,7 @@ class SceneManager:
             return
         # 세션별 씬 컨텍스트 저장
         self._contexts: Dict[str, SceneContext] = {}
+        metrics.on_collect(self._collect_metrics)
         self._initialized = True
     
     def get_or_create_context(
@@ -219,6 +233,45 @@ class SceneManager:
                 if state.attention != CharacterAttention.NONE:
                     state.attention = CharacterAttention.OBSERVING
     
+    def apply_inner_thought(
+        self,
+        session_id: str,
+        character_id: str,
+        character_name: str,
+        inner_thought,
+        role: str
+    ):
+        """
+        응답과 따로 생성된 속마음 반영 (턴 처리 때와 같은 상태가 되도록)
+        
+        - main: 속마음만 업데이트 (대사/이벤트는 턴 처리 때 이미 반영)
+        - sub: 속마음 + recent=False, attention=OBSERVING
+        - no_reaction: 속마음 + recent=False, attention 유지 (NONE이 아니면 OBSERVING)
+        """
+        if role == "main":
+            context = self.get_context(session_id)
+            if context and character_id in context.character_states and inner_thought:
+                if isinstance(inner_thought, dict):
+                    inner_thought = inner_thought.get("thought", "")
+                context.character_states[character_id].inner_thought = inner_thought
+            return
+        
+        # 서브/무반응은 response=""로 전달하여 recent=False, attention 유지
+        self.process_character_response(
+            session_id=session_id,
+            character_id=character_id,
+            character_name=character_name,
+            response="",
+            inner_thought=inner_thought
+        )
+        if role == "sub":
+            # 서브 리액션은 관찰 중 상태로 명시적 설정
+            context = self.get_context(session_id)
+            if context and character_id in context.character_states:
+                state = context.character_states[character_id]
+                state.attention = CharacterAttention.OBSERVING
+                state.recent = False
+    
     def add_story_point(self, session_id: str, point: str):
         """스토리 포인트 추가"""
         context = self.get_context(session_id)
@@ -231,6 +284,19 @@ class SceneManager:
         if context:
             context.tension_level = max(1, min(10, context.tension_level + delta))
     
+    def get_stats(self) -> Dict:
+        """세션 수 및 씬 컨텍스트 메모리 사용량 추정"""
+        contexts = list(self._contexts.values())
+        return {
+            "sessions": len(contexts),
+            "session_bytes": sum(estimate_context_bytes(c) for c in contexts)
+        }
+    
+    def _collect_metrics(self):
+        stats = self.get_stats()
+        active_sessions.set(stats["sessions"])
+        session_bytes.set(stats["session_bytes"])
+    
     def _summarize_response(self, response: str, max_length: int = 50) -> str:
         """응답 요약"""
         # 간단한 요약 (첫 문장 또는 일부)
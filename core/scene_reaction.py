@@ -2,17 +2,42 @@
 씬 리액션 시스템
 여러 캐릭터가 동시에/순차적으로 반응하는 시스템
 """
-from typing import List, Dict, Optional, Tuple
-from pydantic import BaseModel
+import asyncio
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable
+from pydantic import BaseModel, Field
 from models.character import CharacterPersona
 from models.scene_context import SceneContext, CharacterAttention
 from utils.gemini_client import gemini_client
+from utils.llm_scheduler import LLMCallType
+from utils.generation_profiles import GenerationProfile, get_generation_profile, PROFILE_DIALOGUE, PROFILE_SUB_REACTION
+from utils.circuit_breaker import llm_circuit_breaker, CircuitOpenError
 from core.prompt_builder_v2 import build_relationship_context, build_multi_character_context
 from core.inner_thought_generator import generate_inner_thought
+from core.lazy_inner_thoughts import (
+    inner_thought_store,
+    current_lazy_turn,
+    inner_thought_to_dict,
+    INNER_THOUGHT_FIELDS,
+    NO_REACTION_THOUGHT_FIELDS,
+    ROLE_MAIN,
+    ROLE_SUB,
+    ROLE_NO_REACTION
+)
+from core.fallback_reactions import canned_sub_reaction
+from core.phrase_bank import phrase_bank, sub_reaction_lines
+from core.load_shedder import load_shedder, SheddableStage
+from core.reactor_selector import select_reactors
+from core.turn_deadline import TurnDeadline, run_within
+from utils.tracer import traced
+from utils.metrics import record_cache_lookup
+from utils.logger import get_logger
 # build_conversation_context는 더 이상 사용하지 않음
-from db.database import get_relationship_data
+from db.database import get_relationship_data, get_existing_relationships
+from models.relationship import RelationshipData
 from sqlalchemy.orm import Session
 
+logger = get_logger(__name__)
+
 
 class MainResponse(BaseModel):
     """메인 응답 (긴 대사)"""
@@ -36,6 +61,105 @@ class SceneReactionResult(BaseModel):
     main_responses: List[MainResponse]  # 메인 응답자들 (제한 없음)
     sub_reactions: List[SubReaction]  # 서브 리액션 (나머지)
     no_reaction: List[Dict]  # 무반응 캐릭터 (속마음만)
+    metadata: Dict = Field(default_factory=dict)  # 턴 처리 정보 (load_shedding 등)
+
+
+# 스트리밍 콜백 타입
+# - TokenCallback(delta): 대사 토큰 델타 전달
+# - EventCallback(event, data): 씬 이벤트 전달 (plan, main_start, token, main_done, sub_reaction)
+TokenCallback = Callable[[str], Awaitable[None]]
+EventCallback = Callable[[str, Dict], Awaitable[None]]
+
+
+async def _emit(on_event: Optional[EventCallback], event: str, data: Dict):
+    """이벤트 콜백이 있으면 이벤트 전달"""
+    if on_event:
+        await on_event(event, data)
+
+
+async def _generate_dialogue(
+    prompt: str,
+    on_token: Optional[TokenCallback] = None,
+    call_type: LLMCallType = LLMCallType.MAIN,
+    generation: Optional[GenerationProfile] = None
+) -> str:
+    """
+    대사 생성
+    
+    on_token이 있으면 스트리밍으로 생성하며 토큰 델타를 전달,
+    없으면 기존처럼 한 번에 생성
+    generation: 생성 설정 프로필 (캐릭터별 덮어쓰기 적용, 없으면 호출 종류의 기본 프로필)
+    """
+    if on_token is None:
+        return await gemini_client.generate_response_async(prompt, call_type=call_type, generation=generation)
+    
+    chunks = []
+    stream = gemini_client.stream_response(prompt, call_type=call_type, generation=generation)
+    try:
+        async for delta in stream:
+            chunks.append(delta)
+            await on_token(delta)
+    finally:
+        # 취소/마감 초과 시에도 스트림과 스케줄러 슬롯을 바로 정리
+        await stream.aclose()
+    
+    response_text = "".join(chunks).strip()
+    if not response_text:
+        raise ValueError("캐릭터 응답이 비어있습니다.")
+    return response_text
+
+
+async def _gather_or_cancel(coros: List[Awaitable]) -> List:
+    """코루틴들을 동시에 실행 (하나라도 실패하면 나머지는 취소하고 오류 전파)"""
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def get_cached_relationship_data(
+    user_id: str,
+    character_id: str,
+    db: Session,
+    relationships: Optional[Dict[str, RelationshipData]] = None
+) -> Optional[RelationshipData]:
+    """
+    관계 데이터 조회 (캐시 우선)
+    
+    relationships 캐시가 주어지면 캐시에서 먼저 찾고, 없으면 DB에서 조회 후 캐시에 저장
+    """
+    if relationships is not None:
+        hit = character_id in relationships
+        record_cache_lookup("relationship", hit)
+        if hit:
+            return relationships[character_id]
+    
+    rel_data = get_relationship_data(
+        user_id=user_id,
+        character_id=character_id,
+        db=db,
+        create_if_not_exists=True
+    )
+    if relationships is not None and rel_data:
+        relationships[character_id] = rel_data
+    return rel_data
+
+
+def _token_forwarder(
+    on_event: Optional[EventCallback],
+    character_id: str
+) -> Optional[TokenCallback]:
+    """캐릭터별 토큰 델타를 token 이벤트로 전달하는 콜백 생성"""
+    if on_event is None:
+        return None
+    
+    async def on_token(delta: str):
+        await on_event("token", {"character_id": character_id, "delta": delta})
+    
+    return on_token
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -53,6 +177,100 @@ GROUP_REACTION_TRIGGERS = {
 }
 
 
+# 턴 마감 시간을 넘긴 캐릭터의 기본 대사 (LLM 호출 없음)
+FALLBACK_MAIN_MESSAGE = "*잠시 말을 고르며 상대를 바라본다* ...."
+FALLBACK_SUB_REACTION = "*조용히 지켜본다*"
+
+
+def _mark_degraded(
+    deadline: Optional[TurnDeadline],
+    character: CharacterPersona,
+    stage: str,
+    fallback: str,
+    degraded: Optional[List[Dict]] = None
+):
+    """
+    마감 시간 초과/LLM 차단/오류 때문에 생략/대체된 캐릭터 기록
+    
+    deadline이 있으면 deadline.degraded에, 없으면 degraded(턴 metadata 목록)에 추가
+    """
+    if deadline is not None:
+        deadline.mark_degraded(character.id, character.name, stage, fallback)
+        return
+    logger.warning("%s %s → %s", character.name, stage, fallback)
+    if degraded is not None:
+        degraded.append({
+            "character_id": character.id,
+            "character_name": character.name,
+            "stage": stage,
+            "fallback": fallback
+        })
+
+
+async def _generate_inner_thought_dict(
+    character: CharacterPersona,
+    character_dialogue: str,
+    user_message: str,
+    relationship_data,
+    location: str,
+    scene_context: Optional[SceneContext],
+    role: str = ROLE_MAIN,
+    deadline: Optional[TurnDeadline] = None,
+    stage: str = "inner_thought"
+) -> Optional[Dict]:
+    """
+    속마음 생성 후 응답용 dict로 변환
+    
+    지연 속마음 턴(lazy_inner_thoughts)이면 생성하지 않고 핸들 반환
+    (GET /api/chat/turn/{turn_id}/inner/{character_id}로 처음 조회할 때 생성)
+    
+    Returns:
+        속마음 dict 또는 핸들 (생성 실패/마감 시간 초과 시 None)
+    """
+    fields = NO_REACTION_THOUGHT_FIELDS if role == ROLE_NO_REACTION else INNER_THOUGHT_FIELDS
+    
+    lazy_turn = current_lazy_turn()
+    if lazy_turn is not None:
+        return inner_thought_store.defer(
+            lazy_turn,
+            character=character,
+            character_dialogue=character_dialogue,
+            user_message=user_message,
+            relationship_data=relationship_data,
+            location=location,
+            scene_context=scene_context,
+            fields=fields,
+            role=role
+        )
+    
+    inner_thought_obj = None
+    try:
+        inner_thought_obj = await run_within(deadline, generate_inner_thought(
+            character=character,
+            character_dialogue=character_dialogue,
+            user_message=user_message,
+            relationship_data=relationship_data,
+            location=location,
+            scene_context=scene_context
+        ))
+    except asyncio.TimeoutError:
+        _mark_degraded(deadline, character, stage, "dropped")
+    except Exception as e:
+        logger.warning("속마음 생성 오류 (%s): %s", character.name, e)
+    
+    return inner_thought_to_dict(inner_thought_obj, fields)
+
+
+def _fallback_main_response(character: CharacterPersona) -> MainResponse:
+    """마감 시간 초과 시 메인 응답 대체 (행동 묘사만)"""
+    return MainResponse(
+        character_id=character.id,
+        character_name=character.name,
+        message=FALLBACK_MAIN_MESSAGE,
+        action="잠시 말을 고르며 상대를 바라본다"
+    )
+
+
 def analyze_reaction_scope(user_message: str) -> str:
     """
     반응 범위 분석
@@ -120,6 +338,8 @@ def determine_reaction_type(
     """
     캐릭터별 반응 타입 결정
     
+    기본 타입만 결정하고, 실제 메인/서브 인원은 core.reactor_selector에서 점수순으로 제한
+    
     Returns:
         "main" - 메인 응답자 (긴 대사)
         "reaction" - 서브 리액션 (짧은 반응)
@@ -131,7 +351,7 @@ def determine_reaction_type(
     
     # 2. "모두" 트리거면 전원 reaction 이상
     if reaction_scope == "all":
-        # 최근 대화 참여자는 main (제한 없음)
+        # 최근 대화 참여자는 main
         if scene_context and character_id in scene_context.character_states:
             state = scene_context.character_states[character_id]
             if state.recent:
@@ -139,7 +359,7 @@ def determine_reaction_type(
         # 나머지는 reaction
         return "reaction"
     
-    # 3. selective 범위에서 recent 캐릭터는 main (제한 없음)
+    # 3. selective 범위에서 recent 캐릭터는 main
     if reaction_scope == "selective":
         if scene_context and character_id in scene_context.character_states:
             state = scene_context.character_states[character_id]
@@ -160,6 +380,7 @@ def determine_reaction_type(
 # 메인 응답 생성
 # ═══════════════════════════════════════════════════════════════
 
+@traced("main_response", character=lambda args: args["character"].name)
 async def generate_main_response(
     character: CharacterPersona,
     user_message: str,
@@ -169,9 +390,16 @@ async def generate_main_response(
     conversation_history: List[Dict],
     relationship_data,
     user_id: str,
-    recent_story_summaries: List[Dict] = None
+    recent_story_summaries: List[Dict] = None,
+    on_token: Optional[TokenCallback] = None,
+    deadline: Optional[TurnDeadline] = None
 ) -> MainResponse:
-    """메인 응답 생성 (긴 대사)"""
+    """
+    메인 응답 생성 (긴 대사)
+    
+    deadline이 있으면 대사가 마감 안에 끝나지 않을 때 asyncio.TimeoutError,
+    대사 이후 속마음이 마감을 넘기면 속마음 없이 응답
+    """
     
     # 프롬프트 구성
     relationship_context = build_relationship_context(relationship_data)
@@ -204,7 +432,7 @@ async def generate_main_response(
 - 마지막 화자: {scene_context.last_speaker_name or '없음'}
 - 최근 이벤트: {', '.join([e.summary for e in scene_context.recent_events[-3:]]) if scene_context.recent_events else '없음'}
 """
-    
+
     prompt = f"""
 당신은 '{character.name}'입니다.
 
@@ -247,36 +475,23 @@ async def generate_main_response(
 - 이전 대화의 맥락을 활용하여 일관성 있는 응답을 하세요.
 - 응답은 대사만 작성하세요. (설명이나 행동 묘사는 *별표* 안에)
 """
+
+    # 응답 생성 (on_token이 있으면 스트리밍)
+    response_text = await run_within(
+        deadline,
+        _generate_dialogue(prompt, on_token, generation=get_generation_profile(PROFILE_DIALOGUE, character))
+    )
     
-    # 응답 생성
-    response_text = gemini_client.generate_response(prompt)
-    
-    # 속마음 생성 (객체 전체 전달)
-    inner_thought_obj = None
-    try:
-        inner_thought_obj = await generate_inner_thought(
-            character=character,
-            character_dialogue=response_text,
-            user_message=user_message,
-            relationship_data=relationship_data,
-            location=location,
-            scene_context=scene_context
-        )
-    except Exception as e:
-        print(f"⚠️ 속마음 생성 오류 ({character.name}): {str(e)}")
-    
-    # inner_thought 객체를 dict로 변환
-    inner_thought_dict = None
-    if inner_thought_obj:
-        inner_thought_dict = {
-            "thought": inner_thought_obj.thought,
-            "surface_emotion": inner_thought_obj.surface_emotion,
-            "inner_emotion": inner_thought_obj.inner_emotion,
-            "emotion_gap": inner_thought_obj.emotion_gap,
-            "user_evaluation": inner_thought_obj.user_evaluation,
-            "attitude_toward_user": inner_thought_obj.attitude_toward_user,
-            "intention": inner_thought_obj.intention
-        }
+    # 속마음 생성 (지연 속마음 턴이면 핸들)
+    inner_thought_dict = await _generate_inner_thought_dict(
+        character=character,
+        character_dialogue=response_text,
+        user_message=user_message,
+        relationship_data=relationship_data,
+        location=location,
+        scene_context=scene_context,
+        deadline=deadline
+    )
     
     return MainResponse(
         character_id=character.id,
@@ -290,16 +505,12 @@ async def generate_main_response(
 # 서브 리액션 생성
 # ═══════════════════════════════════════════════════════════════
 
-async def generate_sub_reaction(
+async def _generate_sub_reaction_line(
     character: CharacterPersona,
-    character_id: str,
     user_message: str,
-    main_responses: List[MainResponse],
-    scene_context: Optional[SceneContext],
-    relationship_data,
-    location: str
-) -> SubReaction:
-    """서브 리액션 생성 (짧은 반응)"""
+    main_responses: List[MainResponse]
+) -> str:
+    """서브 리액션 대사를 LLM으로 생성 (LLM 차단 중이면 말투 예시로 대체)"""
     
     # 간단한 프롬프트로 짧은 반응 생성
     main_speakers = [r.character_name for r in main_responses]
@@ -323,35 +534,53 @@ async def generate_sub_reaction(
 [응답 형식]
 대사만 작성하세요. 행동 묘사는 *별표* 안에.
 """
-    
-    reaction_text = gemini_client.generate_response(prompt)
-    
-    # 속마음 생성 (객체 전체 전달)
-    inner_thought_obj = None
+
     try:
-        inner_thought_obj = await generate_inner_thought(
-            character=character,
-            character_dialogue=reaction_text,
-            user_message=user_message,
-            relationship_data=relationship_data,
-            location=location,
-            scene_context=scene_context
+        reaction_text = await gemini_client.generate_response_async(
+            prompt,
+            call_type=LLMCallType.SUB,
+            generation=get_generation_profile(PROFILE_SUB_REACTION, character)
         )
-    except Exception as e:
-        print(f"⚠️ 속마음 생성 오류 ({character.name}): {str(e)}")
-    
-    # inner_thought 객체를 dict로 변환
-    inner_thought_dict = None
-    if inner_thought_obj:
-        inner_thought_dict = {
-            "thought": inner_thought_obj.thought,
-            "surface_emotion": inner_thought_obj.surface_emotion,
-            "inner_emotion": inner_thought_obj.inner_emotion,
-            "emotion_gap": inner_thought_obj.emotion_gap,
-            "user_evaluation": inner_thought_obj.user_evaluation,
-            "attitude_toward_user": inner_thought_obj.attitude_toward_user,
-            "intention": inner_thought_obj.intention
-        }
+    except CircuitOpenError:
+        # LLM 차단 중 - 말투 예시로 대체 (속마음도 같은 방식으로 대체됨)
+        sub_reaction_lines.inc(source="canned")
+        return canned_sub_reaction(character, user_message)
+    sub_reaction_lines.inc(source="llm")
+    return reaction_text
+
+
+@traced("sub_reaction", character=lambda args: args["character"].name)
+async def generate_sub_reaction(
+    character: CharacterPersona,
+    character_id: str,
+    user_message: str,
+    main_responses: List[MainResponse],
+    scene_context: Optional[SceneContext],
+    relationship_data,
+    location: str
+) -> SubReaction:
+    """
+    서브 리액션 생성 (짧은 반응)
+    
+    대사는 캐릭터 말투 문구 모음에서 골라 LLM을 호출하지 않음
+    (PHRASE_BANK_ENABLED=false이거나 긴장도가 SUB_REACTION_LLM_MIN_TENSION 이상인 씬만 LLM으로 생성)
+    """
+    if phrase_bank.use_llm(scene_context):
+        reaction_text = await _generate_sub_reaction_line(character, user_message, main_responses)
+    else:
+        reaction_text = phrase_bank.pick(character, user_message, scene_context)
+        sub_reaction_lines.inc(source="phrase_bank")
+    
+    # 속마음 생성 (지연 속마음 턴이면 핸들)
+    inner_thought_dict = await _generate_inner_thought_dict(
+        character=character,
+        character_dialogue=reaction_text,
+        user_message=user_message,
+        relationship_data=relationship_data,
+        location=location,
+        scene_context=scene_context,
+        role=ROLE_SUB
+    )
     
     return SubReaction(
         character_id=character.id,
@@ -365,6 +594,7 @@ async def generate_sub_reaction(
 # 끼어들기 응답 생성
 # ═══════════════════════════════════════════════════════════════
 
+@traced("intervention", character=lambda args: args["character"].name)
 async def generate_intervention_response(
     character: CharacterPersona,
     user_message: str,
@@ -373,7 +603,8 @@ async def generate_intervention_response(
     characters: List[CharacterPersona],
     location: str,
     relationship_data,
-    recent_story_summaries: List[Dict] = None
+    recent_story_summaries: List[Dict] = None,
+    on_token: Optional[TokenCallback] = None
 ) -> Optional[MainResponse]:
     """끼어들기 응답 생성 (캐릭터가 대화에 끼어드는 경우)"""
     
@@ -422,36 +653,21 @@ async def generate_intervention_response(
 [응답 형식]
 대사만 작성하세요. 행동 묘사는 *별표* 안에.
 """
-    
+
     try:
-        response_text = gemini_client.generate_response(prompt)
-        
-        # 속마음 생성
-        inner_thought_obj = None
-        try:
-            inner_thought_obj = await generate_inner_thought(
-                character=character,
-                character_dialogue=response_text,
-                user_message=user_message,
-                relationship_data=relationship_data,
-                location=location,
-                scene_context=scene_context
-            )
-        except Exception as e:
-            print(f"⚠️ 속마음 생성 오류 ({character.name}): {str(e)}")
+        response_text = await _generate_dialogue(
+            prompt, on_token, LLMCallType.INTERVENTION, get_generation_profile(PROFILE_DIALOGUE, character)
+        )
         
-        # inner_thought 객체를 dict로 변환
-        inner_thought_dict = None
-        if inner_thought_obj:
-            inner_thought_dict = {
-                "thought": inner_thought_obj.thought,
-                "surface_emotion": inner_thought_obj.surface_emotion,
-                "inner_emotion": inner_thought_obj.inner_emotion,
-                "emotion_gap": inner_thought_obj.emotion_gap,
-                "user_evaluation": inner_thought_obj.user_evaluation,
-                "attitude_toward_user": inner_thought_obj.attitude_toward_user,
-                "intention": inner_thought_obj.intention
-            }
+        # 속마음 생성 (지연 속마음 턴이면 핸들)
+        inner_thought_dict = await _generate_inner_thought_dict(
+            character=character,
+            character_dialogue=response_text,
+            user_message=user_message,
+            relationship_data=relationship_data,
+            location=location,
+            scene_context=scene_context
+        )
         
         return MainResponse(
             character_id=character.id,
@@ -461,7 +677,7 @@ async def generate_intervention_response(
             inner_thought=inner_thought_dict
         )
     except Exception as e:
-        print(f"⚠️ 끼어들기 응답 생성 오류 ({character.name}): {str(e)}")
+        logger.warning("끼어들기 응답 생성 오류 (%s): %s", character.name, e)
         return None
 
 
@@ -520,6 +736,7 @@ def detect_mentioned_characters_in_response(
     return mentioned
 
 
+@traced("tikitaka", character=lambda args: args["mentioned_character"].name)
 async def generate_tikitaka_response(
     mentioned_character: CharacterPersona,
     mentioning_character: CharacterPersona,
@@ -530,7 +747,8 @@ async def generate_tikitaka_response(
     location: str,
     relationship_data,
     user_id: str,
-    recent_story_summaries: List[Dict] = None
+    recent_story_summaries: List[Dict] = None,
+    on_token: Optional[TokenCallback] = None
 ) -> Optional[MainResponse]:
     """캐릭터 간 티키타카 응답 생성"""
     
@@ -570,36 +788,21 @@ async def generate_tikitaka_response(
 [응답 형식]
 대사만 작성하세요. 행동 묘사는 *별표* 안에.
 """
-    
+
     try:
-        response_text = gemini_client.generate_response(prompt)
-        
-        # 속마음 생성
-        inner_thought_obj = None
-        try:
-            inner_thought_obj = await generate_inner_thought(
-                character=mentioned_character,
-                character_dialogue=response_text,
-                user_message=user_message,
-                relationship_data=relationship_data,
-                location=location,
-                scene_context=scene_context
-            )
-        except Exception as e:
-            print(f"⚠️ 속마음 생성 오류 ({mentioned_character.name}): {str(e)}")
+        response_text = await _generate_dialogue(
+            prompt, on_token, LLMCallType.TIKITAKA, get_generation_profile(PROFILE_DIALOGUE, mentioned_character)
+        )
         
-        # inner_thought 객체를 dict로 변환
-        inner_thought_dict = None
-        if inner_thought_obj:
-            inner_thought_dict = {
-                "thought": inner_thought_obj.thought,
-                "surface_emotion": inner_thought_obj.surface_emotion,
-                "inner_emotion": inner_thought_obj.inner_emotion,
-                "emotion_gap": inner_thought_obj.emotion_gap,
-                "user_evaluation": inner_thought_obj.user_evaluation,
-                "attitude_toward_user": inner_thought_obj.attitude_toward_user,
-                "intention": inner_thought_obj.intention
-            }
+        # 속마음 생성 (지연 속마음 턴이면 핸들)
+        inner_thought_dict = await _generate_inner_thought_dict(
+            character=mentioned_character,
+            character_dialogue=response_text,
+            user_message=user_message,
+            relationship_data=relationship_data,
+            location=location,
+            scene_context=scene_context
+        )
         
         return MainResponse(
             character_id=mentioned_character.id,
@@ -609,7 +812,7 @@ async def generate_tikitaka_response(
             inner_thought=inner_thought_dict
         )
     except Exception as e:
-        print(f"⚠️ 티키타카 응답 생성 오류 ({mentioned_character.name}): {str(e)}")
+        logger.warning("티키타카 응답 생성 오류 (%s): %s", mentioned_character.name, e)
         return None
 
 
@@ -625,25 +828,66 @@ async def generate_scene_reaction(
     conversation_history: List[Dict],
     user_id: str,
     db: Session,
-    recent_story_summaries: List[Dict] = None
+    recent_story_summaries: List[Dict] = None,
+    on_event: Optional[EventCallback] = None,
+    relationships: Optional[Dict[str, RelationshipData]] = None,
+    progress: Optional[SceneReactionResult] = None,
+    deadline: Optional[TurnDeadline] = None
 ) -> SceneReactionResult:
     """
     씬 리액션 생성
     
+    on_event가 주어지면 진행 상황을 이벤트로 전달 (SSE 스트리밍용):
+    - plan: 반응 계획 (main/sub/ignore 캐릭터)
+    - main_start / token / main_done / main_error: 메인 응답 시작, 토큰 델타, 완료, 실패
+    - sub_reaction: 서브 리액션 완료
+    
+    relationships가 주어지면 관계 데이터를 캐시에서 재사용 (WebSocket 세션용),
+    없으면 이번 턴 안에서만 쓰는 캐시를 만들어 단계마다 다시 조회하지 않음
+    
+    progress가 주어지면 완성된 응답을 생성 즉시 그 안에 채움
+    (턴이 중간에 취소돼도 호출자가 이미 생성된 대사까지는 저장할 수 있음)
+    
+    메인/서브 인원은 반응 점수 상위 REACTOR_MAX_MAIN/REACTOR_MAX_SUB명으로 제한하고
+    나머지는 LLM 호출 없이 무반응 (인원은 metadata["reactor_selection"])
+    
+    LLM 부하가 높으면 load_shedder 결정에 따라 선택 단계를 생략하고
+    결정 내용을 결과 metadata["load_shedding"]에 기록
+    
+    LLM 서킷 브레이커가 열려 있으면 메인은 기본 대사, 서브 리액션/속마음은
+    캐릭터 말투 예시로 대체 (브레이커 상태는 metadata["llm_circuit"])
+    
+    deadline이 있으면 각 단계를 남은 시간 안에서 실행하고, 넘기면
+    메인/서브는 기본 대사로 대체, 티키타카/끼어들기/속마음은 생략
+    (마감 시간 초과, LLM 차단/오류로 대체/생략된 캐릭터는 마감 시간 여부와 관계없이
+    metadata["degraded_characters"]에 기록)
+    
+    지연 속마음 턴(core.lazy_inner_thoughts.lazy_inner_thoughts) 안에서 호출하면
+    속마음 대신 핸들({"status": "pending", "url": ...})을 채움
+    
     Returns:
         SceneReactionResult: 메인 응답, 서브 리액션, 무반응 캐릭터
     """
     
+    # 관계 데이터 캐시 (REST/SSE는 턴 단위)
+    if relationships is None:
+        relationships = {}
+    
+    # 0. 부하에 따른 선택 단계 생략 결정
+    shed = load_shedder.decide()
+    if shed.level > 0:
+        logger.info("[Scene Reaction] 부하 레벨 %s - 생략 단계: %s (%s)", shed.level, shed.disabled_stages, shed.reason)
+    
     # 1. 반응 범위 분석
     reaction_scope = analyze_reaction_scope(user_message)
-    print(f"[Scene Reaction] 반응 범위: {reaction_scope} (메시지: '{user_message}')")
+    logger.debug("[Scene Reaction] 반응 범위: %s (메시지: '%s')", reaction_scope, user_message)
     
     # 2. 직접 호명된 캐릭터 확인
     mentioned_characters = []
     for char in characters:
         if is_directly_mentioned(char, user_message):
             mentioned_characters.append(char.id)
-            print(f"[Scene Reaction] 직접 호명: {char.name}")
+            logger.debug("[Scene Reaction] 직접 호명: %s", char.name)
     
     # 3. 캐릭터별 반응 타입 결정
     reaction_types = {}  # {character_id: "main" | "reaction" | "ignore"}
@@ -659,41 +903,86 @@ async def generate_scene_reaction(
             directly_mentioned=directly_mentioned
         )
         reaction_types[char.id] = reaction_type
-        print(f"[Scene Reaction] {char.name}: {reaction_type}")
-    
-    # 4. 메인 응답자 결정 (제한 없음)
-    main_character_ids = [cid for cid, rtype in reaction_types.items() if rtype == "main"]
-    
-    # 직접 호명된 캐릭터 우선
-    if mentioned_characters:
-        main_character_ids = mentioned_characters  # 제한 없음
-    elif not main_character_ids:
-        # 메인 응답자가 없으면 이전 턴의 마지막 화자 선택
-        if scene_context and scene_context.last_speaker_id:
-            # 이전 마지막 화자가 있으면 그 캐릭터 선택
-            main_character_ids = [scene_context.last_speaker_id]
-        else:
-            # 없으면 첫 번째 캐릭터 선택
-            main_character_ids = [characters[0].id]
+        logger.debug("[Scene Reaction] %s: %s", char.name, reaction_type)
     
-    # 제한 없음 - 모든 메인 응답자가 참여 가능
+    # 4. 반응 점수 상위만 메인/서브로 선택 (REACTOR_MAX_MAIN/REACTOR_MAX_SUB)
+    # 직접 호명 > 최근 대화 참여자 > 이전 턴 마지막 화자 순으로 메인 후보, 나머지는 LLM 호출 없이 무반응
+    # 점수용 관계 데이터는 캐시에 없는 캐릭터만 한 번에 조회 (관계를 새로 만들지 않음, 없으면 친밀도 0)
+    uncached_ids = [char.id for char in characters if char.id not in relationships]
+    if uncached_ids:
+        relationships.update(get_existing_relationships(user_id, uncached_ids, db))
+    selection = select_reactors(
+        characters=characters,
+        reaction_types=reaction_types,
+        mentioned_ids=mentioned_characters,
+        scene_context=scene_context,
+        relationships=relationships
+    )
+    main_character_ids = list(selection.main)
+    skipped_character_ids = set(selection.skipped)
+    reaction_types = {cid: "reaction" for cid in selection.sub}
+    reaction_types.update({cid: "ignore" for cid in selection.ignore})
+    
+    # 서브 리액션 단계가 생략되면 무반응으로 처리
+    if not shed.allows(SheddableStage.SUB_REACTION):
+        reaction_types = {cid: "ignore" for cid in reaction_types}
     
-    print(f"[Scene Reaction] 메인 응답자: {main_character_ids}")
+    logger.debug(
+        "[Scene Reaction] 메인 응답자: %s, 제한으로 무반응: %d명",
+        main_character_ids, len(skipped_character_ids)
+    )
+    
+    await _emit(on_event, "plan", {
+        "reaction_scope": reaction_scope,
+        "load_shedding": shed.dict(),
+        "main": [
+            {"character_id": c.id, "character_name": c.name}
+            for c in characters if c.id in main_character_ids
+        ],
+        "sub": [
+            {"character_id": c.id, "character_name": c.name}
+            for c in characters
+            if c.id not in main_character_ids and reaction_types.get(c.id) == "reaction"
+        ],
+        "ignore": [
+            {"character_id": c.id, "character_name": c.name}
+            for c in characters
+            if c.id not in main_character_ids and (reaction_types.get(c.id) == "ignore" or c.id in skipped_character_ids)
+        ]
+    })
+    
+    # 완성된 응답은 progress에 바로 누적 (취소 시 부분 결과로 사용)
+    result = progress if progress is not None else SceneReactionResult(
+        main_responses=[], sub_reactions=[], no_reaction=[]
+    )
+    result.metadata["load_shedding"] = shed.dict()
+    result.metadata["reactor_selection"] = {
+        "main": len(selection.main),
+        "sub": len(selection.sub),
+        "ignore": len(selection.ignore),
+        "skipped": len(selection.skipped)
+    }
+    # 생략/대체된 캐릭터 (마감 시간이 있으면 그 기록을 함께 사용)
+    degraded = deadline.degraded if deadline is not None else []
+    result.metadata["degraded_characters"] = degraded
+    if deadline is not None:
+        result.metadata["deadline_seconds"] = deadline.seconds
     
     # 5. 메인 응답 생성
-    main_responses = []
+    main_responses = result.main_responses
     for char_id in main_character_ids:
         char = next((c for c in characters if c.id == char_id), None)
         if char:
-            print(f"[Main Response] {char.name} 응답 생성 시작...")
-            rel_data = get_relationship_data(
+            logger.debug("[Main Response] %s 응답 생성 시작...", char.name)
+            rel_data = get_cached_relationship_data(
                 user_id=user_id,
                 character_id=char.id,
                 db=db,
-                create_if_not_exists=True
+                relationships=relationships
             )
             
             try:
+                await _emit(on_event, "main_start", {"character_id": char.id, "character_name": char.name})
                 main_resp = await generate_main_response(
                     character=char,
                     user_message=user_message,
@@ -703,27 +992,43 @@ async def generate_scene_reaction(
                     conversation_history=conversation_history,
                     relationship_data=rel_data,
                     user_id=user_id,
-                    recent_story_summaries=recent_story_summaries or []
+                    recent_story_summaries=recent_story_summaries or [],
+                    on_token=_token_forwarder(on_event, char.id),
+                    deadline=deadline
                 )
                 main_responses.append(main_resp)
-                print(f"[Main Response] {char.name} 응답 생성 완료: {main_resp.message[:50]}...")
+                await _emit(on_event, "main_done", main_resp.dict())
+                logger.debug("[Main Response] %s 응답 생성 완료: %s...", char.name, main_resp.message[:50])
+            except asyncio.TimeoutError:
+                # 턴 마감 시간 초과 - 기본 대사로 대체 (스트리밍 중이던 말풍선도 교체됨)
+                _mark_degraded(deadline, char, "main", "default_line", degraded)
+                main_resp = _fallback_main_response(char)
+                main_responses.append(main_resp)
+                await _emit(on_event, "main_done", main_resp.dict())
+            except CircuitOpenError:
+                # LLM 차단 중 - 기본 대사로 대체하여 씬 유지
+                _mark_degraded(deadline, char, "main", "circuit_open", degraded)
+                main_resp = _fallback_main_response(char)
+                main_responses.append(main_resp)
+                await _emit(on_event, "main_done", main_resp.dict())
             except Exception as e:
-                print(f"⚠️ {char.name} 응답 생성 오류: {e}")
-                import traceback
-                traceback.print_exc()
+                await _emit(on_event, "main_error", {"character_id": char.id, "character_name": char.name})
+                logger.exception("%s 응답 생성 오류: %s", char.name, e)
         else:
-            print(f"⚠️ 캐릭터 ID '{char_id}'를 찾을 수 없음")
+            logger.warning("캐릭터 ID '%s'를 찾을 수 없음", char_id)
     
-    print(f"[Main Response] 총 {len(main_responses)}명의 메인 응답 생성 완료")
+    logger.debug("[Main Response] 총 %d명의 메인 응답 생성 완료", len(main_responses))
     
     # ════════════════════════════════════════════════════════════
     # 5.3. 캐릭터 간 티키타카 (Mention Detection)
     # ════════════════════════════════════════════════════════════
     # 메인 응답에서 다른 캐릭터 이름이 언급되었는지 확인
-    tikitaka_responses = []
     responded_character_ids = set(main_character_ids)  # 이미 응답한 캐릭터
     
-    for main_resp in main_responses:
+    # 티키타카 응답은 바로 메인 응답에 추가하므로 원래 메인 응답만 순회
+    # (부하로 티키타카 단계가 생략되면 건너뜀)
+    tikitaka_sources = list(main_responses) if shed.allows(SheddableStage.TIKITAKA) else []
+    for main_resp in tikitaka_sources:
         # 이 응답에서 언급된 다른 캐릭터 찾기
         mentioned_chars = detect_mentioned_characters_in_response(
             response_text=main_resp.message,
@@ -736,14 +1041,14 @@ async def generate_scene_reaction(
             if mentioned_char.id in responded_character_ids:
                 continue
             
-            print(f"[Tiki-Taka] {main_resp.character_name} → {mentioned_char.name} 언급 감지")
+            logger.debug("[Tiki-Taka] %s → %s 언급 감지", main_resp.character_name, mentioned_char.name)
             
             # 티키타카 응답 생성
-            rel_data = get_relationship_data(
+            rel_data = get_cached_relationship_data(
                 user_id=user_id,
                 character_id=mentioned_char.id,
                 db=db,
-                create_if_not_exists=True
+                relationships=relationships
             )
             
             # 언급한 캐릭터 찾기
@@ -751,27 +1056,37 @@ async def generate_scene_reaction(
             if not mentioning_char:
                 continue
             
-            tikitaka_resp = await generate_tikitaka_response(
-                mentioned_character=mentioned_char,
-                mentioning_character=mentioning_char,
-                mentioning_message=main_resp.message,
-                user_message=user_message,
-                scene_context=scene_context,
-                characters=characters,
-                location=location,
-                relationship_data=rel_data,
-                user_id=user_id,
-                recent_story_summaries=recent_story_summaries or []
-            )
+            if deadline is not None and deadline.expired():
+                _mark_degraded(deadline, mentioned_char, "tikitaka", "dropped", degraded)
+                continue
+            
+            await _emit(on_event, "main_start", {"character_id": mentioned_char.id, "character_name": mentioned_char.name})
+            try:
+                tikitaka_resp = await run_within(deadline, generate_tikitaka_response(
+                    mentioned_character=mentioned_char,
+                    mentioning_character=mentioning_char,
+                    mentioning_message=main_resp.message,
+                    user_message=user_message,
+                    scene_context=scene_context,
+                    characters=characters,
+                    location=location,
+                    relationship_data=rel_data,
+                    user_id=user_id,
+                    recent_story_summaries=recent_story_summaries or [],
+                    on_token=_token_forwarder(on_event, mentioned_char.id)
+                ))
+            except asyncio.TimeoutError:
+                _mark_degraded(deadline, mentioned_char, "tikitaka", "dropped", degraded)
+                tikitaka_resp = None
             
             if tikitaka_resp:
-                tikitaka_responses.append(tikitaka_resp)
+                await _emit(on_event, "main_done", tikitaka_resp.dict())
+                main_responses.append(tikitaka_resp)
                 responded_character_ids.add(mentioned_char.id)
                 main_character_ids.append(mentioned_char.id)
-                print(f"[Tiki-Taka] {mentioned_char.name} 응답 생성 완료")
-    
-    # 티키타카 응답을 메인 응답에 추가
-    main_responses.extend(tikitaka_responses)
+                logger.debug("[Tiki-Taka] %s 응답 생성 완료", mentioned_char.name)
+            else:
+                await _emit(on_event, "main_error", {"character_id": mentioned_char.id, "character_name": mentioned_char.name})
     
     # ════════════════════════════════════════════════════════════
     # 5.5. 끼어들기(Intervention) - 30% 확률, 최대 3명
@@ -782,16 +1097,22 @@ async def generate_scene_reaction(
     
     # ⚠️ 핵심 수정: 먼저 전체적으로 끼어들기 여부를 30% 확률로 결정
     should_intervene = random.random() < INTERVENTION_PROBABILITY
+    if should_intervene and not shed.allows(SheddableStage.INTERVENTION):
+        logger.debug("[Intervention] 부하로 끼어들기 단계 생략")
+        should_intervene = False
     
-    print(f"[Intervention] 끼어들기 체크: {should_intervene} (확률: {INTERVENTION_PROBABILITY*100}%)")
+    logger.debug("[Intervention] 끼어들기 체크: %s (확률: %.0f%%)", should_intervene, INTERVENTION_PROBABILITY * 100)
     
     if should_intervene:
         # 끼어들기로 결정됨 → 최대 3명까지 선택
         intervention_count = 0
         intervened_ids = set(main_character_ids)  # 이미 메인 응답자인 캐릭터 제외
         
-        # 끼어들 수 있는 캐릭터 목록 (메인 응답자 제외)
-        available_chars = [c for c in characters if c.id not in intervened_ids]
+        # 끼어들 수 있는 캐릭터 목록 (반응 캐릭터 제한 안의 서브/무반응 캐릭터만)
+        available_chars = [
+            c for c in characters
+            if c.id not in intervened_ids and c.id not in skipped_character_ids
+        ]
         
         # 랜덤하게 섞어서 최대 3명 선택
         random.shuffle(available_chars)
@@ -799,109 +1120,147 @@ async def generate_scene_reaction(
         for char in available_chars:
             if intervention_count >= MAX_INTERVENTIONS:
                 break
+            if deadline is not None and deadline.expired():
+                _mark_degraded(deadline, char, "intervention", "dropped", degraded)
+                break
             
-            print(f"[Intervention] {char.name} 끼어들기 선택됨 ({intervention_count + 1}/{MAX_INTERVENTIONS})")
+            logger.debug("[Intervention] %s 끼어들기 선택됨 (%d/%d)", char.name, intervention_count + 1, MAX_INTERVENTIONS)
             
-            rel_data = get_relationship_data(
+            rel_data = get_cached_relationship_data(
                 user_id=user_id,
                 character_id=char.id,
                 db=db,
-                create_if_not_exists=True
+                relationships=relationships
             )
             
             # 끼어들기용 프롬프트로 응답 생성
-            intervention_resp = await generate_intervention_response(
-                character=char,
-                user_message=user_message,
-                main_responses=main_responses,
-                scene_context=scene_context,
-                characters=characters,
-                location=location,
-                relationship_data=rel_data,
-                recent_story_summaries=recent_story_summaries or []
-            )
+            await _emit(on_event, "main_start", {"character_id": char.id, "character_name": char.name})
+            try:
+                intervention_resp = await run_within(deadline, generate_intervention_response(
+                    character=char,
+                    user_message=user_message,
+                    main_responses=main_responses,
+                    scene_context=scene_context,
+                    characters=characters,
+                    location=location,
+                    relationship_data=rel_data,
+                    recent_story_summaries=recent_story_summaries or [],
+                    on_token=_token_forwarder(on_event, char.id)
+                ))
+            except asyncio.TimeoutError:
+                _mark_degraded(deadline, char, "intervention", "dropped", degraded)
+                intervention_resp = None
             
             if intervention_resp:
+                await _emit(on_event, "main_done", intervention_resp.dict())
                 main_responses.append(intervention_resp)
                 intervened_ids.add(char.id)
                 intervention_count += 1
                 
                 # 메인 응답자 목록에도 추가
                 main_character_ids.append(char.id)
+            else:
+                await _emit(on_event, "main_error", {"character_id": char.id, "character_name": char.name})
         
-        print(f"[Intervention] 총 {intervention_count}명 끼어듦")
+        logger.debug("[Intervention] 총 %d명 끼어듦", intervention_count)
     else:
-        print(f"[Intervention] 끼어들기 없음 (확률 미통과)")
+        logger.debug("[Intervention] 끼어들기 없음 (확률 미통과)")
     
-    # 6. 서브 리액션 생성 (메인 응답자 + 끼어든 캐릭터 제외)
-    sub_reactions = []
-    for char in characters:
-        if char.id not in main_character_ids:
-            reaction_type = reaction_types.get(char.id, "reaction")
-            if reaction_type == "reaction":
-                rel_data = get_relationship_data(
-                    user_id=user_id,
-                    character_id=char.id,
-                    db=db,
-                    create_if_not_exists=True
-                )
-                
-                sub_react = await generate_sub_reaction(
-                    character=char,
-                    character_id=char.id,
-                    user_message=user_message,
-                    main_responses=main_responses,
-                    scene_context=scene_context,
-                    relationship_data=rel_data,
-                    location=location
-                )
-                sub_reactions.append(sub_react)
+    # 6~7. 서브 리액션 + 무반응 캐릭터 속마음 (서로 독립이므로 동시에 생성)
+    # 완성되는 대로 결과에 추가하고, 끝나면 캐릭터 순서로 정렬
+    sub_reactions = result.sub_reactions
+    no_reaction = result.no_reaction
     
-    # 7. 무반응 캐릭터 (속마음만)
-    no_reaction = []
+    async def run_sub_reaction(char: CharacterPersona):
+        rel_data = get_cached_relationship_data(
+            user_id=user_id,
+            character_id=char.id,
+            db=db,
+            relationships=relationships
+        )
+        
+        try:
+            sub_react = await run_within(deadline, generate_sub_reaction(
+                character=char,
+                character_id=char.id,
+                user_message=user_message,
+                main_responses=main_responses,
+                scene_context=scene_context,
+                relationship_data=rel_data,
+                location=location
+            ))
+        except asyncio.TimeoutError:
+            # 턴 마감 시간 초과 - 짧은 기본 리액션으로 대체
+            _mark_degraded(deadline, char, "sub_reaction", "default_line", degraded)
+            sub_react = SubReaction(
+                character_id=char.id,
+                character_name=char.name,
+                reaction=FALLBACK_SUB_REACTION
+            )
+        except Exception as e:
+            # LLM 오류(재시도 후에도 실패, 빈 응답 등) - 말투 예시로 대체하여 턴 유지
+            logger.warning("%s 서브 리액션 생성 오류 → 말투 예시로 대체: %s", char.name, e)
+            _mark_degraded(deadline, char, "sub_reaction", "canned", degraded)
+            sub_reaction_lines.inc(source="canned")
+            sub_react = SubReaction(
+                character_id=char.id,
+                character_name=char.name,
+                reaction=canned_sub_reaction(char, user_message)
+            )
+        sub_reactions.append(sub_react)
+        await _emit(on_event, "sub_reaction", sub_react.dict())
+    
+    async def run_no_reaction(char: CharacterPersona):
+        rel_data = get_cached_relationship_data(
+            user_id=user_id,
+            character_id=char.id,
+            db=db,
+            relationships=relationships
+        )
+        
+        # 속마음만 생성 (부하로 무반응 속마음 단계가 생략되면 속마음 없이 무반응 처리)
+        inner_thought_dict = None
+        if shed.allows(SheddableStage.NO_REACTION_THOUGHT):
+            inner_thought_dict = await _generate_inner_thought_dict(
+                character=char,
+                character_dialogue="",
+                user_message=user_message,
+                relationship_data=rel_data,
+                location=location,
+                scene_context=scene_context,
+                role=ROLE_NO_REACTION,
+                deadline=deadline,
+                stage="no_reaction_thought"
+            )
+        
+        no_reaction.append({
+            "character_id": char.id,
+            "character_name": char.name,
+            "inner_thought": inner_thought_dict
+        })
+    
+    side_tasks = []
     for char in characters:
         if char.id not in main_character_ids:
-            reaction_type = reaction_types.get(char.id, "reaction")
-            if reaction_type == "ignore":
-                rel_data = get_relationship_data(
-                    user_id=user_id,
-                    character_id=char.id,
-                    db=db,
-                    create_if_not_exists=True
-                )
-                
-                # 속마음만 생성
-                inner_thought_obj = None
-                try:
-                    inner_thought_obj = await generate_inner_thought(
-                        character=char,
-                        character_dialogue="",
-                        user_message=user_message,
-                        relationship_data=rel_data,
-                        location=location,
-                        scene_context=scene_context
-                    )
-                except Exception as e:
-                    print(f"⚠️ 속마음 생성 오류 ({char.name}): {str(e)}")
-                
-                inner_thought_dict = None
-                if inner_thought_obj:
-                    inner_thought_dict = {
-                        "thought": inner_thought_obj.thought,
-                        "surface_emotion": inner_thought_obj.surface_emotion,
-                        "inner_emotion": inner_thought_obj.inner_emotion,
-                        "emotion_gap": inner_thought_obj.emotion_gap,
-                        "user_evaluation": inner_thought_obj.user_evaluation,
-                    }
-                
+            if char.id in skipped_character_ids:
+                # 반응 캐릭터 제한 밖 - LLM 호출 없이 무반응
                 no_reaction.append({
                     "character_id": char.id,
                     "character_name": char.name,
-                    "inner_thought": inner_thought_dict
+                    "inner_thought": None
                 })
+                continue
+            reaction_type = reaction_types.get(char.id, "reaction")
+            if reaction_type == "reaction":
+                side_tasks.append(run_sub_reaction(char))
+            elif reaction_type == "ignore":
+                side_tasks.append(run_no_reaction(char))
     
-    return SceneReactionResult(
-        main_responses=main_responses,
-        sub_reactions=sub_reactions,
-        no_reaction=no_reaction
-    )
+    await _gather_or_cancel(side_tasks)
+    
+    character_order = {c.id: i for i, c in enumerate(characters)}
+    sub_reactions.sort(key=lambda r: character_order.get(r.character_id, len(characters)))
+    no_reaction.sort(key=lambda r: character_order.get(r["character_id"], len(characters)))
+    
+    result.metadata["llm_circuit"] = llm_circuit_breaker.state
+    return result
@@ -3,6 +3,11 @@
 """
 from typing import List, Dict, Optional
 from utils.gemini_client import gemini_client
+from utils.llm_scheduler import LLMCallType
+from utils.generation_profiles import get_generation_profile, PROFILE_SUMMARY
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 async def generate_story_summary(
@@ -130,9 +135,13 @@ ai_analysis: [상세 분석 - 소설처럼 생생한 묘사, 행동과 대사 
 - 캐릭터들의 내면 심리와 관계 역학을 깊이 있게 묘사하세요!
 - 대사는 따옴표 없이 자연스럽게 문장에 포함시키세요!
 """
-    
+
     try:
-        response = gemini_client.generate_response(prompt)
+        response = await gemini_client.generate_response_async(
+            prompt,
+            call_type=LLMCallType.SUMMARY,
+            generation=get_generation_profile(PROFILE_SUMMARY)
+        )
         
         # 응답 파싱
         lines = response.strip().split("\n")
@@ -183,7 +192,7 @@ ai_analysis: [상세 분석 - 소설처럼 생생한 묘사, 행동과 대사 
         
         return ai_summary.strip(), ai_analysis.strip()
     except Exception as e:
-        print(f"⚠️ 스토리 요약 생성 오류: {e}")
+        logger.warning("스토리 요약 생성 오류: %s", e)
         # 기본 요약 반환
         summary = f"유저: '{user_message[:50]}...' → {len(character_responses)}명 응답"
         analysis = f"이번 턴에서 {len(character_responses)}명의 캐릭터가 응답했습니다."
@@ -0,0 +1,179 @@
+"""
+세션 단위 턴 직렬화
+SYNK MVP - 같은 세션의 턴은 도착 순서대로 하나씩 처리하고, 새 메시지가 이전 턴을 대체할 수 있음
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional
+
+from fastapi import HTTPException
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TurnSuperseded(HTTPException):
+    """새 메시지에 의해 대체(취소)된 턴"""
+    
+    def __init__(self):
+        super().__init__(
+            status_code=409,
+            detail="같은 세션의 새 메시지로 대체되어 턴이 취소되었습니다."
+        )
+
+
+class ClientDisconnected(HTTPException):
+    """클라이언트 연결 종료로 취소된 턴 (nginx 관례의 499)"""
+    
+    def __init__(self):
+        super().__init__(
+            status_code=499,
+            detail="클라이언트 연결이 종료되어 턴이 취소되었습니다."
+        )
+
+
+# 연결 종료 확인 주기 (초)
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+class _SessionTurnState:
+    """세션별 락, 진행 중인 턴, 대체 기준 순번"""
+    
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.next_seq = 0
+        self.superseded_before = 0  # 이 순번보다 앞선 턴은 실행하지 않음
+        self.running_task: Optional[asyncio.Task] = None
+        self.running_seq = -1
+        self.refs = 0
+
+
+class TurnCoordinator:
+    """
+    세션별 턴 조율기 (싱글톤 패턴)
+    
+    - 같은 세션의 턴은 락으로 직렬화 (asyncio.Lock은 FIFO이므로 도착 순서 유지)
+      → scene_context 플래그 초기화, 대화 히스토리, 관계 데이터 갱신이 턴 단위로 원자적
+    - supersede=True로 들어온 턴은 진행 중인 이전 턴을 취소 (진행 중인 LLM 호출도 함께 취소)
+      하고, 아직 대기 중인 이전 턴은 실행하지 않고 409로 종료
+    - 세션 ID가 없는 턴(새 세션)은 경합할 상대가 없으므로 바로 실행
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TurnCoordinator, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._sessions: Dict[str, _SessionTurnState] = {}
+        self._initialized = True
+    
+    async def run(
+        self,
+        session_id: Optional[str],
+        factory: Callable[[], Awaitable[Any]],
+        supersede: bool = False
+    ) -> Any:
+        """
+        세션 순서에 맞춰 턴 실행
+        
+        Args:
+            session_id: 세션 ID (None이면 직렬화 없이 실행)
+            factory: 실제 턴을 실행하는 코루틴 함수
+            supersede: True면 같은 세션의 이전 턴(진행 중/대기 중)을 취소
+        
+        Returns:
+            factory 결과
+        
+        Raises:
+            TurnSuperseded: 이 턴이 더 새로운 턴에 의해 대체된 경우 (409)
+        """
+        if not session_id:
+            return await factory()
+        
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = _SessionTurnState()
+            self._sessions[session_id] = state
+        
+        seq = state.next_seq
+        state.next_seq += 1
+        state.refs += 1
+        
+        try:
+            if supersede:
+                state.superseded_before = seq
+                if state.running_task and not state.running_task.done():
+                    logger.info("세션 %s: 진행 중인 턴 #%d 취소 (새 턴 #%d)", session_id, state.running_seq, seq)
+                    state.running_task.cancel()
+            
+            async with state.lock:
+                if seq < state.superseded_before:
+                    raise TurnSuperseded()
+                
+                task = asyncio.ensure_future(factory())
+                state.running_task = task
+                state.running_seq = seq
+                try:
+                    return await task
+                except asyncio.CancelledError:
+                    # 새 턴에 의해 취소된 경우 409로 변환 (그 외 취소는 그대로 전파)
+                    if seq < state.superseded_before:
+                        raise TurnSuperseded()
+                    raise
+                finally:
+                    if state.running_task is task:
+                        state.running_task = None
+                        state.running_seq = -1
+        finally:
+            state.refs -= 1
+            if state.refs == 0 and self._sessions.get(session_id) is state:
+                del self._sessions[session_id]
+
+
+async def run_until_disconnected(
+    coro: Coroutine[Any, Any, Any],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keep_running: Optional[Callable[[], bool]] = None
+) -> Any:
+    """
+    클라이언트 연결이 끊기면 진행 중인 턴을 취소하며 코루틴 실행
+    
+    턴 태스크가 취소되면 진행 중인 LLM 호출도 함께 취소되고,
+    run_chat_turn이 이미 생성된 대사까지 부분 턴으로 저장함
+    
+    Args:
+        coro: 턴 코루틴
+        is_disconnected: 연결 종료 여부 확인 함수 (Request.is_disconnected 등)
+        keep_running: True를 반환하면 연결이 끊겨도 턴 유지 (같은 키로 결과를 기다리는 재시도 요청 등)
+    
+    Raises:
+        ClientDisconnected: 연결 종료로 턴이 취소된 경우 (499)
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            
+            if await is_disconnected() and not (keep_running and keep_running()):
+                logger.info("클라이언트 연결 종료 - 진행 중인 턴 취소")
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+# 전역 인스턴스
+turn_coordinator = TurnCoordinator()
@@ -0,0 +1,87 @@
+"""
+턴 마감 시간
+SYNK MVP - 턴 전체 시간 예산을 씬 리액션 각 단계에 전달하고, 시간 안에 끝나지 못한 캐릭터를 기록
+"""
+import asyncio
+import inspect
+import time
+from typing import Awaitable, Dict, List, Optional, TypeVar
+
+from utils.logger import get_logger
+
+T = TypeVar("T")
+
+logger = get_logger(__name__)
+
+
+class TurnDeadline:
+    """
+    턴 마감 시간 (턴 시작 시 생성하여 각 단계에 전달)
+    
+    - run_within()으로 감싼 단계는 남은 시간 안에 끝나지 않으면 asyncio.TimeoutError
+    - 마감 때문에 생략되거나 기본값으로 대체된 캐릭터는 degraded에 기록 (턴 metadata로 응답)
+    """
+    
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds
+        self.degraded: List[Dict] = []
+    
+    def remaining(self) -> float:
+        """남은 시간 (초)"""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """마감 시간 경과 여부"""
+        return self.remaining() <= 0
+    
+    def elapsed(self) -> float:
+        """턴 시작 후 경과 시간 (초)"""
+        return time.monotonic() - self.started_at
+    
+    def mark_degraded(self, character_id: str, character_name: str, stage: str, fallback: str):
+        """
+        마감 시간 때문에 품질이 낮아진 캐릭터 기록
+        
+        Args:
+            stage: 단계 (main, inner_thought, tikitaka, intervention, sub_reaction, no_reaction_thought)
+            fallback: 처리 방식 (default_line: 기본 대사로 대체, canned: 말투 예시로 대체, circuit_open: LLM 차단으로 대체, dropped: 생략)
+        """
+        logger.warning("%s %s 마감 초과 → %s (경과 %.1fs)", character_name, stage, fallback, self.elapsed())
+        self.degraded.append({
+            "character_id": character_id,
+            "character_name": character_name,
+            "stage": stage,
+            "fallback": fallback
+        })
+
+
+async def run_within(
+    deadline: Optional[TurnDeadline],
+    awaitable: Awaitable[T],
+    timeout: Optional[float] = None
+) -> T:
+    """
+    마감 시간 안에 단계 실행
+    
+    Args:
+        deadline: 턴 마감 시간 (None이면 마감 없음)
+        awaitable: 실행할 코루틴
+        timeout: 단계 자체 제한 시간 (마감 시간과 둘 중 짧은 쪽 적용)
+    
+    Raises:
+        asyncio.TimeoutError: 제한 시간 안에 끝나지 않은 경우 (진행 중인 LLM 호출은 취소됨)
+    """
+    limit = timeout
+    if deadline is not None:
+        limit = deadline.remaining() if limit is None else min(limit, deadline.remaining())
+    
+    if limit is None:
+        return await awaitable
+    if limit <= 0:
+        # 이미 마감 - 시작하지 않음
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise asyncio.TimeoutError()
+    return await asyncio.wait_for(awaitable, timeout=limit)
@@ -3,10 +3,14 @@
 SYNK MVP - 대화에서 유저 정보 자동 추출
 """
 from typing import Optional, Dict
-from models.user_profile import UserProfile
+from models.user_profile import UserProfile, ProfileExtraction
 from utils.gemini_client import gemini_client
-import json
-import re
+from utils.llm_scheduler import LLMCallType
+from utils.generation_profiles import get_generation_profile, PROFILE_EXTRACTION
+from utils.structured_output import gemini_schema, parse_structured
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 EXTRACTION_PROMPT = """
@@ -66,47 +70,21 @@ async def extract_user_info(
     )
     
     try:
-        response_text = gemini_client.generate_response(prompt)
-        
-        # JSON 파싱
-        try:
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            extracted_data = json.loads(response_text)
-        except json.JSONDecodeError:
-            # 파싱 실패 시 기본값
-            extracted_data = {
-                "nickname": None,
-                "ability": None,
-                "traits": [],
-                "action": None,
-                "facts": [],
-                "likes": [],
-                "dislikes": []
-            }
+        # JSON 모드 + 응답 스키마
+        generation = get_generation_profile(PROFILE_EXTRACTION).with_response_schema(gemini_schema(ProfileExtraction))
+        response_text = await gemini_client.generate_response_async(
+            prompt,
+            call_type=LLMCallType.PROFILE,
+            generation=generation
+        )
         
-        return extracted_data
+        # JSON 파싱 (실패 시 기본값)
+        extracted = await parse_structured(response_text, ProfileExtraction, LLMCallType.PROFILE)
+        return (extracted or ProfileExtraction()).dict()
     
     except Exception as e:
-        import traceback
-        print(f"⚠️ 유저 정보 추출 오류: {str(e)}")
-        print(traceback.format_exc())
-        return {
-            "nickname": None,
-            "ability": None,
-            "traits": [],
-            "action": None,
-            "facts": [],
-            "likes": [],
-            "dislikes": []
-        }
+        logger.exception("유저 정보 추출 오류: %s", e)
+        return ProfileExtraction().dict()
 
 
 async def update_user_profile_from_message(
@@ -129,15 +107,15 @@ async def update_user_profile_from_message(
     """
     from db.user_profile_db import get_user_profile, update_user_profile
     
+    # 정보 추출 (DB 조회 전에 실행 - LLM 응답을 기다리는 동안 DB 커넥션을 잡고 있지 않도록)
+    extracted = await extract_user_info(user_message, context)
+    
     # 프로필 가져오기
     profile = get_user_profile(user_id, db)
     if not profile:
         from db.user_profile_db import create_user_profile
         profile = create_user_profile(user_id, db)
     
-    # 정보 추출
-    extracted = await extract_user_info(user_message, context)
-    
     # 프로필 업데이트
     if extracted.get("nickname"):
         profile.nickname = extracted["nickname"]
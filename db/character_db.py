@@ -4,11 +4,11 @@ SYNK MVP - 캐릭터 저장/조회
 """
 import json
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import create_engine, Column, String, Float, Text, DateTime
+from typing import Dict, Optional, List
+from sqlalchemy import create_engine, inspect, text, Column, String, Float, Integer, Text, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from models.character import CharacterPersona, Location
+from models.character import CharacterPersona, CharacterPhrase, Location
 
 Base = declarative_base()
 
@@ -42,10 +42,26 @@ class CharacterTable(Base):
     default_posture = Column(String, default="standing")
     voice_tone = Column(String, default="normal")
     
+    generation_overrides = Column(Text)  # JSON object (프로필 이름 → 생성 설정)
+    
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
+class CharacterPhraseTable(Base):
+    """캐릭터 말투 문구 테이블 (서브 리액션용, core.phrase_bank에서 생성)"""
+    __tablename__ = "character_phrases"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    character_id = Column(String, nullable=False, index=True)
+    text = Column(Text, nullable=False)
+    mood = Column(String, default="calm")
+    emotion = Column(String, default="neutral")
+    source = Column(String, default="speech_example")
+    
+    created_at = Column(DateTime, default=datetime.now)
+
+
 class LocationTable(Base):
     """장소 테이블"""
     __tablename__ = "locations"
@@ -62,6 +78,7 @@ class LocationTable(Base):
 
 # DB 연결
 from utils.config import get_database_url
+from utils.metrics import instrument_engine
 
 DATABASE_URL = get_database_url()
 engine = create_engine(
@@ -70,10 +87,25 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 쿼리 지연 지표 (/metrics)
+instrument_engine(engine, "character")
+
+
+# 기존 DB에 없으면 추가할 컬럼 (나중에 추가된 컬럼: 이름 → 타입)
+ADDED_CHARACTER_COLUMNS = {
+    "generation_overrides": "TEXT",
+}
+
 
 def init_character_db():
-    """캐릭터 DB 초기화"""
+    """캐릭터 DB 초기화 (기존 테이블에는 추가된 컬럼만 보충)"""
     Base.metadata.create_all(bind=engine)
+    
+    existing = {column["name"] for column in inspect(engine).get_columns(CharacterTable.__tablename__)}
+    with engine.begin() as conn:
+        for name, column_type in ADDED_CHARACTER_COLUMNS.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {CharacterTable.__tablename__} ADD COLUMN {name} {column_type}"))
 
 
 def get_db():
@@ -110,6 +142,7 @@ def character_to_model(row: CharacterTable) -> CharacterPersona:
         default_emotion=row.default_emotion or "neutral",
         default_posture=row.default_posture or "standing",
         voice_tone=row.voice_tone or "normal",
+        generation_overrides=json.loads(row.generation_overrides or "{}"),
         created_at=row.created_at,
         updated_at=row.updated_at,
     )
@@ -137,6 +170,7 @@ def model_to_row(char: CharacterPersona, existing: CharacterTable = None) -> Cha
     row.default_emotion = char.default_emotion
     row.default_posture = char.default_posture
     row.voice_tone = char.voice_tone
+    row.generation_overrides = json.dumps(char.generation_overrides, ensure_ascii=False)
     row.updated_at = datetime.now()
     
     return row
@@ -183,7 +217,7 @@ def update_character(character_id: str, updates: dict, db: Session) -> Optional[
         if hasattr(row, key):
             if key in ["speech_examples", "secrets", "sensitive_topics", "tags"]:
                 setattr(row, key, json.dumps(value, ensure_ascii=False))
-            elif key == "emotion_triggers":
+            elif key in ["emotion_triggers", "generation_overrides"]:
                 setattr(row, key, json.dumps(value, ensure_ascii=False))
             else:
                 setattr(row, key, value)
@@ -200,10 +234,62 @@ def delete_character(character_id: str, db: Session) -> bool:
     if not row:
         return False
     db.delete(row)
+    db.query(CharacterPhraseTable).filter(CharacterPhraseTable.character_id == character_id).delete()
     db.commit()
     return True
 
 
+# ═══════════════════════════════════════════════════════════
+# 말투 문구
+# ═══════════════════════════════════════════════════════════
+
+def get_character_phrases(character_id: str, db: Session) -> List[CharacterPhrase]:
+    """캐릭터 말투 문구 조회 (생성된 적 없으면 빈 리스트)"""
+    rows = (
+        db.query(CharacterPhraseTable)
+        .filter(CharacterPhraseTable.character_id == character_id)
+        .order_by(CharacterPhraseTable.id)
+        .all()
+    )
+    return [
+        CharacterPhrase(text=row.text, mood=row.mood, emotion=row.emotion, source=row.source)
+        for row in rows
+    ]
+
+
+def get_characters_phrases(character_ids: List[str], db: Session) -> Dict[str, List[CharacterPhrase]]:
+    """여러 캐릭터의 말투 문구를 한 번에 조회 (문구가 없는 캐릭터는 결과에서 빠짐)"""
+    if not character_ids:
+        return {}
+    rows = (
+        db.query(CharacterPhraseTable)
+        .filter(CharacterPhraseTable.character_id.in_(character_ids))
+        .order_by(CharacterPhraseTable.id)
+        .all()
+    )
+    phrases: Dict[str, List[CharacterPhrase]] = {}
+    for row in rows:
+        phrases.setdefault(row.character_id, []).append(
+            CharacterPhrase(text=row.text, mood=row.mood, emotion=row.emotion, source=row.source)
+        )
+    return phrases
+
+
+def replace_character_phrases(character_id: str, phrases: List[CharacterPhrase], db: Session) -> int:
+    """
+    캐릭터 말투 문구 교체 (기존 문구 삭제 후 저장)
+    
+    Returns:
+        저장한 문구 수
+    """
+    db.query(CharacterPhraseTable).filter(CharacterPhraseTable.character_id == character_id).delete()
+    now = datetime.now()
+    for phrase in phrases:
+        db.add(CharacterPhraseTable(character_id=character_id, created_at=now, **phrase.dict()))
+    db.commit()
+    return len(phrases)
+
+
 # ═══════════════════════════════════════════════════════════
 # 장소 CRUD
 # ═══════════════════════════════════════════════════════════
@@ -5,13 +5,15 @@ SYNK MVP - 유저와 캐릭터 간의 관계 데이터 저장/조회
 import json
 from datetime import datetime
 from typing import Optional, List, Dict
-from sqlalchemy import create_engine, Column, String, Float, Integer, Text, DateTime
+from sqlalchemy import create_engine, Column, String, Float, Integer, Text, DateTime, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from models.relationship import RelationshipData, EmotionalStats, Dominance, CoreMemory, TriggerKeyword
 from models.user_profile import UserProfile, CharacterImpression, UserAction
+from utils.logger import get_logger
 
 Base = declarative_base()
+logger = get_logger(__name__)
 
 
 class RelationshipTable(Base):
@@ -110,8 +112,32 @@ class StorySummaryTable(Base):
     created_at = Column(DateTime, default=datetime.now)
 
 
+class LLMUsageTable(Base):
+    """LLM 토큰 사용량 일별 집계 테이블 (날짜 + 유저/세션/작품/호출 종류/모델별 1행)"""
+    __tablename__ = "llm_usage_daily"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(String, nullable=False, index=True)  # YYYY-MM-DD
+    user_id = Column(String, nullable=False, index=True, default="")  # 알 수 없으면 빈 문자열
+    session_id = Column(String, nullable=False, default="")
+    work_id = Column(String, nullable=False, default="")
+    call_type = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    
+    # 집계
+    calls = Column(Integer, default=0)
+    estimated_calls = Column(Integer, default=0)  # 토큰 수를 추정한 호출 수 (API 응답에 사용량이 없던 호출)
+    prompt_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    cost_usd = Column(Float, default=0.0)
+    
+    # 메타데이터
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
 # DB 연결 (캐릭터 DB와 동일한 DB 사용)
 from utils.config import get_database_url
+from utils.metrics import instrument_engine
 
 DATABASE_URL = get_database_url()
 engine = create_engine(
@@ -120,6 +146,9 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 쿼리 지연 지표 (/metrics)
+instrument_engine(engine, "main")
+
 
 def init_db():
     """관계 데이터 DB 초기화 (user_profiles 테이블 포함)"""
@@ -177,7 +206,7 @@ def row_to_model(row: RelationshipTable) -> RelationshipData:
             core_memories.append(CoreMemory(**m))
         except Exception as e:
             # 개별 메모리 파싱 실패 시 스킵
-            print(f"⚠️ CoreMemory 파싱 오류: {e}")
+            logger.warning("CoreMemory 파싱 오류: %s", e)
             continue
     
     # TriggerKeywords
@@ -206,7 +235,7 @@ def row_to_model(row: RelationshipTable) -> RelationshipData:
             trigger_keywords.append(TriggerKeyword(**t))
         except Exception as e:
             # 개별 트리거 파싱 실패 시 스킵
-            print(f"⚠️ TriggerKeyword 파싱 오류: {e}")
+            logger.warning("TriggerKeyword 파싱 오류: %s", e)
             continue
     
     return RelationshipData(
@@ -304,9 +333,7 @@ def model_to_row(rel_data: RelationshipData, existing: RelationshipTable = None)
         
         return row
     except Exception as e:
-        import traceback
-        print(f"⚠️ model_to_row 오류: {e}")
-        print(traceback.format_exc())
+        logger.exception("model_to_row 오류: %s", e)
         raise
 
 
@@ -344,6 +371,21 @@ def get_relationship_data(
     return None
 
 
+def get_existing_relationships(
+    user_id: str,
+    character_ids: List[str],
+    db: Session
+) -> Dict[str, RelationshipData]:
+    """여러 캐릭터의 관계 데이터를 한 번에 조회 (없는 관계는 만들지 않고 결과에서 빠짐)"""
+    if not character_ids:
+        return {}
+    rows = db.query(RelationshipTable).filter(
+        RelationshipTable.user_id == user_id,
+        RelationshipTable.character_id.in_(character_ids)
+    ).all()
+    return {row.character_id: row_to_model(row) for row in rows}
+
+
 def create_relationship_data(rel_data: RelationshipData, db: Session) -> RelationshipData:
     """관계 데이터 생성"""
     row = model_to_row(rel_data)
@@ -371,9 +413,7 @@ def update_relationship_data(rel_data: RelationshipData, db: Session) -> Relatio
     except Exception as e:
         # 오류 발생 시 롤백
         db.rollback()
-        import traceback
-        print(f"⚠️ 관계 데이터 업데이트 오류: {e}")
-        print(traceback.format_exc())
+        logger.exception("관계 데이터 업데이트 오류: %s", e)
         # 기존 데이터 반환 시도
         try:
             existing = get_relationship_data(rel_data.user_id, rel_data.character_id, db, create_if_not_exists=False)
@@ -447,3 +487,105 @@ def get_recent_story_summaries(
         })
     
     return summaries
+
+
+# ═══════════════════════════════════════════════════════════
+# LLM 토큰 사용량 CRUD
+# ═══════════════════════════════════════════════════════════
+
+USAGE_GROUP_COLUMNS = {
+    "day": LLMUsageTable.day,
+    "user": LLMUsageTable.user_id,
+    "session": LLMUsageTable.session_id,
+    "work": LLMUsageTable.work_id,
+    "call_type": LLMUsageTable.call_type,
+    "model": LLMUsageTable.model,
+}
+
+
+def add_llm_usage(rollups: List[Dict], db: Session):
+    """
+    토큰 사용량 집계 반영 (같은 키의 행이 있으면 누적, 없으면 추가)
+    
+    Args:
+        rollups: [{day, user_id, session_id, work_id, call_type, model,
+                   calls, estimated_calls, prompt_tokens, output_tokens, cost_usd}]
+    """
+    for rollup in rollups:
+        row = db.query(LLMUsageTable).filter(
+            LLMUsageTable.day == rollup["day"],
+            LLMUsageTable.user_id == rollup["user_id"],
+            LLMUsageTable.session_id == rollup["session_id"],
+            LLMUsageTable.work_id == rollup["work_id"],
+            LLMUsageTable.call_type == rollup["call_type"],
+            LLMUsageTable.model == rollup["model"]
+        ).first()
+        if row is None:
+            db.add(LLMUsageTable(**rollup))
+            continue
+        row.calls += rollup["calls"]
+        row.estimated_calls += rollup["estimated_calls"]
+        row.prompt_tokens += rollup["prompt_tokens"]
+        row.output_tokens += rollup["output_tokens"]
+        row.cost_usd += rollup["cost_usd"]
+    db.commit()
+
+
+def get_user_daily_tokens(user_id: str, day: str, db: Session) -> int:
+    """유저의 하루 토큰 사용량 합계 (프롬프트 + 출력)"""
+    total = db.query(
+        func.sum(LLMUsageTable.prompt_tokens + LLMUsageTable.output_tokens)
+    ).filter(
+        LLMUsageTable.user_id == user_id,
+        LLMUsageTable.day == day
+    ).scalar()
+    return int(total or 0)
+
+
+def get_llm_usage_summary(
+    since_day: str,
+    group_by: List[str],
+    db: Session,
+    user_id: Optional[str] = None,
+    work_id: Optional[str] = None,
+    limit: int = 100
+) -> List[Dict]:
+    """
+    토큰 사용량 집계 조회 (비용 큰 순)
+    
+    Args:
+        since_day: 시작 날짜 (YYYY-MM-DD, 포함)
+        group_by: 묶을 기준 (USAGE_GROUP_COLUMNS의 키)
+        user_id: 특정 유저만 조회
+        work_id: 특정 작품만 조회
+        limit: 최대 행 수
+    """
+    columns = [USAGE_GROUP_COLUMNS[name].label(name) for name in group_by]
+    cost = func.sum(LLMUsageTable.cost_usd)
+    query = db.query(
+        *columns,
+        func.sum(LLMUsageTable.calls).label("calls"),
+        func.sum(LLMUsageTable.estimated_calls).label("estimated_calls"),
+        func.sum(LLMUsageTable.prompt_tokens).label("prompt_tokens"),
+        func.sum(LLMUsageTable.output_tokens).label("output_tokens"),
+        cost.label("cost_usd")
+    ).filter(LLMUsageTable.day >= since_day)
+    if user_id is not None:
+        query = query.filter(LLMUsageTable.user_id == user_id)
+    if work_id is not None:
+        query = query.filter(LLMUsageTable.work_id == work_id)
+    if group_by:
+        query = query.group_by(*[USAGE_GROUP_COLUMNS[name] for name in group_by])
+    
+    rows = query.order_by(cost.desc()).limit(limit).all()
+    return [
+        {
+            **{name: getattr(row, name) for name in group_by},
+            "calls": int(row.calls or 0),
+            "estimated_calls": int(row.estimated_calls or 0),
+            "prompt_tokens": int(row.prompt_tokens or 0),
+            "output_tokens": int(row.output_tokens or 0),
+            "cost_usd": round(float(row.cost_usd or 0.0), 6)
+        }
+        for row in rows
+    ]
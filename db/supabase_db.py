@@ -33,6 +33,7 @@ def create_work(creator_id: str, work_data: WorkCreate) -> WorkResponse:
         "target_audience": work_data.target_audience.value,
         "visibility": work_data.visibility.value,
         "is_adult": work_data.is_adult,
+        "generation_overrides": work_data.generation_overrides,
     }
     
     result = supabase.table("works").insert(data).execute()
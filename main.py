@@ -5,15 +5,17 @@ FastAPI 기반 캐릭터 채팅 시스템
 import os
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # 라우터 import
 from api.character_api import router as character_router
 from api.chat_multi import router as chat_multi_router
+from api.chat_ws import router as chat_ws_router
 from api.opening import router as opening_router
 from api.reaction import router as reaction_router
 from api.user_profile import router as user_profile_router
+from api.debug import router as debug_router, ProfilerMiddleware
 
 # 창작자 스튜디오 라우터 (Supabase 연동 - 현재 비활성화)
 # from api.auth import router as auth_router
@@ -27,6 +29,10 @@ from api.user_profile import router as user_profile_router
 from db.character_db import init_character_db
 from db.database import init_db
 
+# 운영 지표
+from utils.metrics import metrics
+from utils.token_accounting import token_accountant
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="SYNK MVP - 캐릭터 채팅 시스템",
@@ -43,12 +49,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 프로파일링 (관리자 토큰 + X-Profile 헤더/profile 쿼리가 있는 요청만)
+app.add_middleware(ProfilerMiddleware)
+
 # 라우터 등록
 app.include_router(character_router)
 app.include_router(chat_multi_router)
+app.include_router(chat_ws_router)
 app.include_router(opening_router)
 app.include_router(reaction_router)
 app.include_router(user_profile_router)
+app.include_router(debug_router)
 
 # 창작자 스튜디오 라우터 (Supabase 연동 - 현재 비활성화)
 # app.include_router(auth_router)
@@ -84,6 +95,12 @@ async def creator_studio():
     return {"error": "Creator studio not found"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus 지표 (LLM 호출/지연/오류, DB 쿼리 지연, 캐시 적중률, 세션/대기열 상태)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 실행"""
@@ -102,6 +119,12 @@ async def startup_event():
     print("=" * 60)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 실행 - 메모리에 누적된 토큰 사용량 DB 반영"""
+    await token_accountant.flush_async()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
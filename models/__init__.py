@@ -5,6 +5,7 @@ from .user_profile import UserProfile, CharacterImpression, UserAction
 from .inner_thought import InnerThought
 from .scene_context import (
     SceneContext,
+    SceneChange,
     CharacterState,
     RecentEvent,
     CharacterAttention,
@@ -20,6 +21,7 @@ __all__ = [
     "UserAction",
     "InnerThought",
     "SceneContext",
+    "SceneChange",
     "CharacterState",
     "RecentEvent",
     "CharacterAttention",
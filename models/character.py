@@ -2,7 +2,7 @@
 캐릭터 모델
 SYNK MVP - DB 기반 캐릭터 시스템
 """
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -56,6 +56,11 @@ class CharacterPersona(BaseModel):
     default_posture: str = "standing"    # 기본 자세
     voice_tone: str = "normal"           # 목소리 톤
     
+    # ═══════════════════════════════════════
+    # 생성 설정 (utils.generation_profiles 프로필 덮어쓰기)
+    # ═══════════════════════════════════════
+    generation_overrides: Dict[str, Dict[str, Any]] = Field(default_factory=dict)  # {"sub_reaction": {"max_output_tokens": 32}}
+    
     # ═══════════════════════════════════════
     # 메타데이터
     # ═══════════════════════════════════════
@@ -84,6 +89,14 @@ class CharacterPersona(BaseModel):
         return prompt
 
 
+class CharacterPhrase(BaseModel):
+    """말투 문구 (서브 리액션용 짧은 대사, core.phrase_bank에서 생성)"""
+    text: str                        # "크큭... 웃기네 진짜."
+    mood: str = "calm"               # 어울리는 분위기 (calm / playful / hostile)
+    emotion: str = "neutral"         # 감정 (neutral / joy / anger / excitement / sadness / fear / embarrassed)
+    source: str = "speech_example"   # 출처 (speech_example / personality / emotion_trigger / default)
+
+
 class Location(BaseModel):
     """장소 모델"""
     id: str                          # "베타_동_로비"
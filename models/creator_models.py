@@ -2,11 +2,13 @@
 창작자 스튜디오 데이터 모델
 SYNK 창작자 스튜디오 v1.0
 """
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from enum import Enum
 
+from utils.generation_profiles import validate_generation_overrides
+
 
 class TargetAudience(str, Enum):
     """타겟 유저"""
@@ -35,6 +37,14 @@ class WorkCreate(BaseModel):
     target_audience: TargetAudience = TargetAudience.ALL
     visibility: Visibility = Visibility.PRIVATE
     is_adult: bool = False
+    generation_overrides: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict, description="생성 설정 프로필 덮어쓰기 (프로필 이름 → 설정)"
+    )
+    
+    @field_validator("generation_overrides")
+    @classmethod
+    def check_generation_overrides(cls, value):
+        return validate_generation_overrides(value)
 
 
 class WorkUpdate(BaseModel):
@@ -46,6 +56,12 @@ class WorkUpdate(BaseModel):
     target_audience: Optional[TargetAudience] = None
     visibility: Optional[Visibility] = None
     is_adult: Optional[bool] = None
+    generation_overrides: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    @field_validator("generation_overrides")
+    @classmethod
+    def check_generation_overrides(cls, value):
+        return validate_generation_overrides(value)
 
 
 class WorkResponse(BaseModel):
@@ -59,6 +75,7 @@ class WorkResponse(BaseModel):
     target_audience: str
     visibility: str
     is_adult: bool
+    generation_overrides: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
     view_count: int
     like_count: int
     play_count: int
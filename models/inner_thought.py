@@ -56,6 +56,23 @@ class InnerThought(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class InnerThoughtOutput(BaseModel):
+    """
+    속마음 생성 응답 형식 (JSON 모드 스키마)
+    
+    InnerThought의 내용 필드와 같음 (ID/시간은 생성 후 채움)
+    """
+    
+    thought: str
+    surface_emotion: str = "중립"
+    inner_emotion: str = "중립"
+    emotion_gap: bool = False
+    user_evaluation: Optional[str] = None
+    attitude_toward_user: Optional[str] = None
+    intention: Optional[str] = None
+    next_plan: Optional[str] = None
+
+
 # ═══════════════════════════════════════════════════════════════
 # 속마음 생성 프롬프트
 # ═══════════════════════════════════════════════════════════════
@@ -2,12 +2,17 @@
 Scene Context 모델
 SYNK MVP - 씬 상태 관리 및 맥락 유지
 """
+import copy
 from typing import List, Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
 
 
+# 변경 로그 최대 보관 개수 (이보다 오래된 버전은 전체 스냅샷으로 응답)
+MAX_SCENE_CHANGE_LOG = 20
+
+
 class CharacterAttention(str, Enum):
     """캐릭터 시선/관심 상태"""
     USER = "user"              # 유저를 보고 있음
@@ -76,6 +81,14 @@ class RecentEvent(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class SceneChange(BaseModel):
+    """씬 스냅샷 변경 기록 (JSON Patch 형식 연산 목록)"""
+    
+    version: int
+    ops: List[Dict]                 # [{"op": "replace", "path": "/tension_level", "value": 7}]
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+
 class SceneContext(BaseModel):
     """
     씬 컨텍스트 - 모든 캐릭터가 공유하는 현재 상황
@@ -131,6 +144,52 @@ class SceneContext(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     
+    # ═══════════════════════════════════════
+    # 스냅샷 버전 관리 (델타 응답용)
+    # ═══════════════════════════════════════
+    version: int = 0                    # 응답 스냅샷 버전 (변경될 때마다 단조 증가)
+    change_log: List[SceneChange] = Field(default_factory=list)
+    last_snapshot: Dict = Field(default_factory=dict, exclude=True)
+    
+    def commit_snapshot(self, snapshot: Dict) -> int:
+        """
+        응답용 스냅샷 기록
+        
+        이전 스냅샷과 비교해 변경분이 있으면 버전을 올리고 변경 로그에 추가
+        
+        Returns:
+            현재 버전
+        """
+        ops = diff_snapshot(self.last_snapshot, snapshot)
+        if ops:
+            self.version += 1
+            self.change_log.append(SceneChange(version=self.version, ops=ops))
+            if len(self.change_log) > MAX_SCENE_CHANGE_LOG:
+                self.change_log = self.change_log[-MAX_SCENE_CHANGE_LOG:]
+            self.last_snapshot = copy.deepcopy(snapshot)
+        return self.version
+    
+    def get_changes_since(self, version: int) -> Optional[List[Dict]]:
+        """
+        특정 버전 이후의 변경분 (JSON Patch 연산 목록)
+        
+        Returns:
+            변경 연산 목록 (변경 없으면 빈 리스트),
+            변경 로그로 복원할 수 없는 버전이면 None (전체 스냅샷 필요)
+        """
+        if version == self.version:
+            return []
+        if version > self.version or not self.change_log:
+            return None
+        if version < self.change_log[0].version - 1:
+            return None
+        
+        ops = []
+        for change in self.change_log:
+            if change.version > version:
+                ops.extend(change.ops)
+        return ops
+    
     def add_event(self, event: RecentEvent):
         """이벤트 추가 (최근 10개만 유지)"""
         self.recent_events.append(event)
@@ -252,6 +311,39 @@ class SceneContext(BaseModel):
 """
 
 
+# ═══════════════════════════════════════════════════════════════
+# 스냅샷 비교 (JSON Patch 형식)
+# ═══════════════════════════════════════════════════════════════
+
+def _escape_pointer(key: str) -> str:
+    """JSON Pointer 토큰 이스케이프 (RFC 6901)"""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def diff_snapshot(old: Dict, new: Dict, path: str = "") -> List[Dict]:
+    """
+    두 스냅샷의 차이를 JSON Patch(RFC 6902) 연산 목록으로 계산
+    
+    딕셔너리는 키 단위로 재귀 비교, 리스트와 값은 통째로 replace
+    """
+    ops = []
+    
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{path}/{_escape_pointer(key)}"})
+    
+    for key, value in new.items():
+        key_path = f"{path}/{_escape_pointer(key)}"
+        if key not in old:
+            ops.append({"op": "add", "path": key_path, "value": copy.deepcopy(value)})
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            ops.extend(diff_snapshot(old[key], value, key_path))
+        elif old[key] != value:
+            ops.append({"op": "replace", "path": key_path, "value": copy.deepcopy(value)})
+    
+    return ops
+
+
 # ═══════════════════════════════════════════════════════════════
 # 씬 컨텍스트 생성 헬퍼
 # ═══════════════════════════════════════════════════════════════
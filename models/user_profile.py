@@ -23,6 +23,25 @@ class UserAction(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class ExtractedAbility(BaseModel):
+    """대화에서 추출한 능력"""
+    name: Optional[str] = None           # 능력명
+    description: Optional[str] = None    # 설명
+    rank: Optional[str] = None           # 등급 (S/A/B/C/D)
+    type: Optional[str] = None           # 능력 타입
+
+
+class ProfileExtraction(BaseModel):
+    """유저 정보 추출 응답 형식 (JSON 모드 스키마)"""
+    nickname: Optional[str] = None
+    ability: Optional[ExtractedAbility] = None
+    traits: List[str] = Field(default_factory=list)
+    action: Optional[str] = None
+    facts: List[str] = Field(default_factory=list)
+    likes: List[str] = Field(default_factory=list)
+    dislikes: List[str] = Field(default_factory=list)
+
+
 class UserProfile(BaseModel):
     """
     유저 프로필 (주인공 정보)
@@ -0,0 +1,382 @@
+"""
+채팅 턴 벤치마크
+SYNK MVP - 임시 DB + 가짜 LLM 백엔드로 동시 세션의 오프닝/채팅/리액션을 실행하고 턴 비용 측정
+
+측정 항목:
+- 채팅 턴 지연 시간 p50/p95/p99 (클라이언트 기준)
+- 턴당 LLM 호출 수 (호출 종류별), 턴당 DB 쿼리 수
+- 최대 RSS (프로세스 최대 메모리)
+
+사용법:
+    python scripts/benchmark_chat.py --sessions 20 --turns 5
+    python scripts/benchmark_chat.py --save-baseline          # 결과를 기준값으로 저장
+    python scripts/benchmark_chat.py --fail-on-regression     # 기준값보다 나빠지면 종료 코드 1
+"""
+import sys
+import os
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import io
+import json
+import random
+import resource
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# 경로 설정
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# 기준값과 비교할 항목 (모두 낮을수록 좋음)
+COMPARED_METRICS = [
+    ("turn_latency_ms.p50", "턴 지연 p50 (ms)"),
+    ("turn_latency_ms.p95", "턴 지연 p95 (ms)"),
+    ("turn_latency_ms.p99", "턴 지연 p99 (ms)"),
+    ("llm_calls_per_turn", "턴당 LLM 호출"),
+    ("db_queries_per_turn", "턴당 DB 쿼리"),
+    ("peak_rss_mb", "최대 RSS (MB)"),
+]
+
+SCENARIO_IDS = ["option_1", "option_2", "option_3", "option_4"]
+
+USER_MESSAGES = [
+    "안녕? 여기 처음 왔는데 잘 부탁해.",
+    "다들 뭐 하고 있었어?",
+    "나 오늘부터 여기서 지내게 됐어.",
+    "분위기가 왜 이렇게 살벌해?",
+    "혹시 이 근처에 쉴 만한 곳 있어?",
+    "너 능력이 뭐야? 궁금한데.",
+    "아까 그 얘기 계속해봐.",
+    "나 그렇게 만만한 사람 아니야.",
+]
+
+EMOJIS = ["❤️", "💢", "🔥", "⭐"]
+
+# DB 쿼리를 어느 단계에서 실행했는지 구분 (요청 처리와 그 안에서 만든 백그라운드 태스크에 전파)
+_phase: contextvars.ContextVar[str] = contextvars.ContextVar("benchmark_phase", default="other")
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    """q 분위수 (선형 보간, 표본이 없으면 None)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    position = q * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(samples: List[float]) -> Dict:
+    """지연 시간 요약 (ms)"""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean": round(sum(samples) / len(samples), 1),
+        "p50": round(percentile(samples, 0.5), 1),
+        "p95": round(percentile(samples, 0.95), 1),
+        "p99": round(percentile(samples, 0.99), 1),
+        "max": round(max(samples), 1),
+    }
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MB, Linux는 KB / macOS는 byte 단위로 보고됨)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def configure_environment(args, db_dir: str):
+    """앱 import 전에 임시 DB와 가짜 LLM 백엔드 설정"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(db_dir, 'benchmark.db')}"
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_LLM_LATENCY_SIGMA"] = str(args.latency_sigma)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+
+
+class BenchmarkRunner:
+    """동시 세션 실행 및 측정값 수집"""
+    
+    def __init__(self, args):
+        self.args = args
+        self.turn_latencies: List[float] = []
+        self.opening_latencies: List[float] = []
+        self.reaction_latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.db_queries: Dict[str, int] = {}
+    
+    def count_query(self, *_):
+        """SQLAlchemy before_cursor_execute 이벤트"""
+        phase = _phase.get()
+        self.db_queries[phase] = self.db_queries.get(phase, 0) + 1
+    
+    def record_error(self, phase: str, status_code):
+        key = f"{phase}:{status_code}"
+        self.errors[key] = self.errors.get(key, 0) + 1
+    
+    async def run_session(self, client, index: int):
+        """세션 1개: 오프닝 → (채팅 턴 → 리액션) × turns"""
+        user_id = f"bench_user_{index:04d}"
+        rng = random.Random(f"{self.args.seed}:{index}")
+        
+        _phase.set("opening")
+        started = time.perf_counter()
+        response = await client.post("/api/opening/start", json={
+            "user_id": user_id,
+            "scenario_id": SCENARIO_IDS[index % len(SCENARIO_IDS)]
+        })
+        self.opening_latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            self.record_error("opening", response.status_code)
+            return
+        opening = response.json()
+        session_id = opening["session_id"]
+        location_id = opening["location"]
+        
+        for _ in range(self.args.turns):
+            _phase.set("chat")
+            message = rng.choice(USER_MESSAGES)
+            payload = {
+                "user_id": user_id,
+                "location_id": location_id,
+                "message": message,
+                "session_id": session_id
+            }
+            started = time.perf_counter()
+            if self.args.stream:
+                turn = await self._stream_turn(client, location_id, payload)
+            else:
+                response = await client.post(f"/api/chat/location/{location_id}", json=payload)
+                turn = response.json() if response.status_code == 200 else None
+                if turn is None:
+                    self.record_error("chat", response.status_code)
+            self.turn_latencies.append((time.perf_counter() - started) * 1000)
+            if not turn:
+                continue
+            
+            # 메인 응답 캐릭터에게 리액션
+            mains = turn.get("main_responses") or []
+            if mains and rng.random() < self.args.reaction_rate:
+                _phase.set("reaction")
+                target = mains[0]
+                started = time.perf_counter()
+                response = await client.post("/api/reaction/", json={
+                    "user_id": user_id,
+                    "character_id": target["character_id"],
+                    "turn_id": turn["turn_id"],
+                    "emoji": rng.choice(EMOJIS),
+                    "user_message": message,
+                    "character_response": target["message"]
+                })
+                self.reaction_latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    self.record_error("reaction", response.status_code)
+    
+    async def _stream_turn(self, client, location_id: str, payload: Dict) -> Optional[Dict]:
+        """SSE 엔드포인트로 턴 실행 (done 이벤트의 결과 반환)"""
+        result = None
+        event = None
+        async with client.stream("POST", f"/api/chat/location/{location_id}/stream", json=payload) as response:
+            if response.status_code != 200:
+                self.record_error("chat", response.status_code)
+                return None
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:") and event == "done":
+                    result = json.loads(line[5:].strip())
+                elif line.startswith("data:") and event == "error":
+                    self.record_error("chat", json.loads(line[5:].strip()).get("status_code", "sse"))
+        return result
+    
+    async def run(self, app) -> float:
+        """모든 세션을 동시에 실행하고 경과 시간(초) 반환"""
+        import httpx
+        from api import chat_multi
+        
+        # 앱 내부 예외도 500 응답으로 받아 오류로 집계 (벤치마크 중단 없이)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(self.run_session(client, i) for i in range(self.args.sessions)))
+            # 턴이 남긴 백그라운드 작업(프로필 갱신 등)까지 턴 비용에 포함
+            while chat_multi._background_tasks:
+                await asyncio.gather(*list(chat_multi._background_tasks), return_exceptions=True)
+            return time.perf_counter() - started
+
+
+def build_report(args, runner: BenchmarkRunner, elapsed: float, llm_stats: Dict) -> Dict:
+    """측정 결과 정리"""
+    turns = len(runner.turn_latencies)
+    llm_by_type = {
+        call_type: stats["completed"] + stats["failed"]
+        for call_type, stats in llm_stats["call_types"].items()
+        if stats["completed"] + stats["failed"] > 0
+    }
+    llm_calls = sum(llm_by_type.values())
+    chat_queries = runner.db_queries.get("chat", 0)
+    
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "turns_per_session": args.turns,
+            "stream": args.stream,
+            "seed": args.seed,
+            "fake_latency_ms": args.latency_ms,
+            "fake_latency_sigma": args.latency_sigma,
+            "fake_error_rate": args.error_rate,
+        },
+        "turns": turns,
+        "errors": runner.errors,
+        "wall_seconds": round(elapsed, 2),
+        "turns_per_second": round(turns / elapsed, 2) if elapsed > 0 else None,
+        "turn_latency_ms": summarize_latencies(runner.turn_latencies),
+        "opening_latency_ms": summarize_latencies(runner.opening_latencies),
+        "reaction_latency_ms": summarize_latencies(runner.reaction_latencies),
+        "llm_calls_per_turn": round(llm_calls / turns, 2) if turns else None,
+        "llm_calls_by_type_per_turn": {k: round(v / turns, 2) for k, v in llm_by_type.items()} if turns else {},
+        "db_queries_per_turn": round(chat_queries / turns, 1) if turns else None,
+        "db_queries_by_phase": runner.db_queries,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _metric(report: Dict, path: str):
+    value = report
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def compare_with_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    기준값과 비교 출력
+    
+    Returns:
+        허용 범위(tolerance)를 넘게 나빠진 항목 이름 목록
+    """
+    regressions = []
+    print()
+    print(f"{'항목':<20} {'기준':>10} {'현재':>10} {'변화':>9}")
+    print("-" * 52)
+    for path, label in COMPARED_METRICS:
+        base = _metric(baseline, path)
+        current = _metric(report, path)
+        if base is None or current is None:
+            print(f"{label:<20} {'-':>10} {str(current):>10} {'':>9}")
+            continue
+        change = (current - base) / base if base else 0.0
+        flag = ""
+        if change > tolerance:
+            flag = " ⚠️"
+            regressions.append(label)
+        print(f"{label:<20} {base:>10} {current:>10} {change:>+8.1%}{flag}")
+    
+    if baseline.get("config") != report.get("config"):
+        print("⚠️ 기준값과 실행 설정이 다릅니다 (비교 결과 참고용)")
+    return regressions
+
+
+def print_report(report: Dict):
+    """결과 요약 출력"""
+    latency = report["turn_latency_ms"]
+    print("=" * 60)
+    print(f"📊 채팅 턴 벤치마크 ({report['config']['sessions']}세션 × {report['config']['turns_per_session']}턴"
+          f"{', SSE' if report['config']['stream'] else ''})")
+    print("=" * 60)
+    print(f"턴 수: {report['turns']}  오류: {report['errors'] or '없음'}  "
+          f"경과: {report['wall_seconds']}s  처리량: {report['turns_per_second']} 턴/s")
+    if latency.get("count"):
+        print(f"턴 지연 (ms): p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"턴당 LLM 호출: {report['llm_calls_per_turn']}  {report['llm_calls_by_type_per_turn']}")
+    print(f"턴당 DB 쿼리: {report['db_queries_per_turn']}  (단계별 전체: {report['db_queries_by_phase']})")
+    print(f"최대 RSS: {report['peak_rss_mb']} MB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SYNK 채팅 턴 벤치마크 (가짜 LLM 백엔드)")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--turns", type=int, default=5, help="세션당 채팅 턴 수")
+    parser.add_argument("--stream", action="store_true", help="SSE 스트리밍 엔드포인트 사용")
+    parser.add_argument("--reaction-rate", type=float, default=0.5, help="턴 뒤 이모지 리액션을 보낼 확률")
+    parser.add_argument("--seed", type=int, default=42, help="가짜 LLM/시나리오 시드")
+    parser.add_argument("--latency-ms", type=float, default=200, help="가짜 LLM 지연 중앙값 (ms)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="가짜 LLM 지연 분포 폭 (로그정규 sigma)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 LLM 일시적 오류 비율")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="회귀로 볼 악화 비율 (0.1 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    db_dir = tempfile.mkdtemp(prefix="synk_bench_")
+    configure_environment(args, db_dir)
+    
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with quiet:
+            from sqlalchemy import event
+            from db import character_db, database
+            from scripts.seed_characters import seed_locations, seed_characters
+            from utils.llm_scheduler import llm_scheduler
+            import main as app_module
+            
+            database.init_db()
+            character_db.init_character_db()
+            seed_locations()
+            seed_characters()
+            
+            runner = BenchmarkRunner(args)
+            for engine in {character_db.engine, database.engine}:
+                event.listen(engine, "before_cursor_execute", runner.count_query)
+            
+            elapsed = asyncio.run(runner.run(app_module.app))
+        
+        report = build_report(args, runner, elapsed, llm_scheduler.get_stats())
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+    
+    print_report(report)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    exit_code = 0
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 기준값 저장: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠️ 기준값 대비 {args.tolerance:.0%} 넘게 나빠진 항목: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                exit_code = 1
+    else:
+        print(f"\n기준값 없음 ({args.baseline}) - --save-baseline으로 저장할 수 있습니다.")
+    
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+말투 문구 모음 생성
+SYNK MVP - 캐릭터의 말투 예시/성격/감정 트리거로 서브 리액션용 문구를 만들어 DB(character_phrases)에 저장
+
+캐릭터를 API로 생성/수정하면 자동으로 다시 만들어지므로,
+시드 데이터나 DB에 직접 넣은 캐릭터, 생성 규칙(core/phrase_bank.py)을 바꾼 뒤에 실행
+
+사용법:
+    python scripts/build_phrase_bank.py
+    python scripts/build_phrase_bank.py --character-id npc_joo_changyun --dry-run
+"""
+import sys
+import os
+import argparse
+
+# 경로 설정
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.character_db import SessionLocal, init_character_db, get_all_characters, get_character
+from core.phrase_bank import build_phrase_bank, save_phrase_bank
+
+
+def build_all(character_id: str = None, dry_run: bool = False) -> int:
+    """
+    캐릭터 말투 문구 생성/저장
+    
+    Args:
+        character_id: 이 캐릭터만 (없으면 전체)
+        dry_run: 저장하지 않고 출력만
+    
+    Returns:
+        처리한 캐릭터 수
+    """
+    db = SessionLocal()
+    try:
+        if character_id:
+            character = get_character(character_id, db)
+            if not character:
+                raise SystemExit(f"❌ 캐릭터 '{character_id}'를 찾을 수 없습니다.")
+            characters = [character]
+        else:
+            characters = get_all_characters(db)
+        
+        for character in characters:
+            if dry_run:
+                phrases = build_phrase_bank(character)
+                print(f"📝 {character.name}: {len(phrases)}개")
+                for phrase in phrases:
+                    print(f"    [{phrase.mood}/{phrase.emotion}] {phrase.text} ({phrase.source})")
+            else:
+                count = save_phrase_bank(character, db)
+                print(f"✅ {character.name}: {count}개 저장")
+        return len(characters)
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SYNK 서브 리액션 말투 문구 모음 생성")
+    parser.add_argument("--character-id", help="이 캐릭터만 생성 (기본 전체)")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 생성 결과만 출력")
+    args = parser.parse_args(argv)
+    
+    init_character_db()
+    count = build_all(args.character_id, args.dry_run)
+    print(f"\n캐릭터 {count}명 처리 완료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
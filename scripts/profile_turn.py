@@ -0,0 +1,257 @@
+"""
+채팅 턴 프로파일링
+SYNK MVP - 임시 DB + 가짜 LLM 백엔드로 채팅 턴 1회를 재현하여 파이썬 실행 시간이 어디에 쓰였는지 측정
+
+- 기본: 샘플링 프로파일러 → folded stack 파일 (flamegraph.pl, speedscope에서 플레임 그래프로 보기)
+- --deterministic: cProfile → .pstats 파일 (snakeviz, pstats로 보기)
+- --turn-id: 운영 DB(--source-db)에 저장된 턴의 메시지를 재현 (같은 세션의 이전 턴은 프로파일링 없이 먼저 실행)
+
+사용법:
+    python scripts/profile_turn.py --message "주창윤 안녕"
+    python scripts/profile_turn.py --turn-id <turn_id> --source-db synk.db
+    python scripts/profile_turn.py --message "다들 뭐 해?" --deterministic --output turn.pstats
+"""
+import sys
+import os
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import io
+import pstats
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# 경로 설정
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_LOCATION_ID = "베타_동_로비"
+DEFAULT_MESSAGE = "안녕? 여기 처음 왔는데 잘 부탁해."
+
+
+def load_replay_turns(source_db: str, turn_id: str, with_history: bool) -> List[Dict]:
+    """
+    저장된 턴(story_summaries)과 같은 세션의 이전 턴 조회 (오래된 순, 마지막이 프로파일링할 턴)
+    
+    Args:
+        source_db: DB 경로 또는 SQLAlchemy URL
+        turn_id: 재현할 턴 ID
+        with_history: 이전 턴도 함께 조회할지
+    """
+    from sqlalchemy import create_engine, text
+    
+    url = source_db if "://" in source_db else f"sqlite:///{source_db}"
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            target = conn.execute(
+                text("SELECT session_id, user_id, location, turn_number, user_message FROM story_summaries WHERE turn_id = :turn_id"),
+                {"turn_id": turn_id}
+            ).mappings().first()
+            if target is None:
+                raise SystemExit(f"❌ 턴 '{turn_id}'을(를) {source_db}에서 찾을 수 없습니다.")
+            
+            rows = [target]
+            if with_history:
+                rows = conn.execute(
+                    text(
+                        "SELECT session_id, user_id, location, turn_number, user_message FROM story_summaries "
+                        "WHERE session_id = :session_id AND turn_number <= :turn_number ORDER BY turn_number"
+                    ),
+                    {"session_id": target["session_id"], "turn_number": target["turn_number"]}
+                ).mappings().all()
+            return [dict(row) for row in rows]
+    finally:
+        engine.dispose()
+
+
+def configure_environment(args, db_dir: str):
+    """앱 import 전에 임시 DB와 가짜 LLM 백엔드 설정"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(db_dir, 'profile.db')}"
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_LLM_ERROR_RATE"] = "0"
+
+
+def resolve_location_id(location: str) -> str:
+    """장소 이름(story_summaries에는 이름으로 저장됨) 또는 ID → 장소 ID"""
+    from db.character_db import SessionLocal, get_all_locations
+    
+    db = SessionLocal()
+    try:
+        for loc in get_all_locations(db):
+            if location in (loc.id, loc.name):
+                return loc.id
+    finally:
+        db.close()
+    raise SystemExit(f"❌ 장소 '{location}'을(를) 찾을 수 없습니다. (시드 데이터의 장소만 재현 가능)")
+
+
+class TurnProfiler:
+    """턴 실행 (이전 턴은 그대로, 마지막 턴만 프로파일링)"""
+    
+    def __init__(self, args):
+        self.args = args
+        self.profile = None
+        self.turn: Optional[Dict] = None
+        self.elapsed_ms = 0.0
+    
+    async def _post_turn(self, client, location_id: str, payload: Dict) -> Dict:
+        response = await client.post(f"/api/chat/location/{location_id}", json=payload)
+        if response.status_code != 200:
+            raise SystemExit(f"❌ 턴 실행 실패 ({response.status_code}): {response.text[:200]}")
+        return response.json()
+    
+    async def _drain_background(self):
+        """턴이 남긴 백그라운드 작업(프로필 갱신 등) 대기"""
+        from api import chat_multi
+        
+        while chat_multi._background_tasks:
+            await asyncio.gather(*list(chat_multi._background_tasks), return_exceptions=True)
+    
+    async def run(self, app, turns: List[Dict]):
+        import httpx
+        from utils.profiler import SamplingProfiler
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://profile", timeout=None) as client:
+            session_id = None
+            for i, turn in enumerate(turns):
+                payload = {
+                    "user_id": turn["user_id"],
+                    "location_id": turn["location_id"],
+                    "message": turn["user_message"],
+                    "session_id": session_id
+                }
+                if i < len(turns) - 1:
+                    session_id = (await self._post_turn(client, turn["location_id"], payload))["session_id"]
+                    await self._drain_background()
+                    continue
+                
+                if self.args.deterministic:
+                    profiler = cProfile.Profile()
+                    profiler.enable()
+                else:
+                    profiler = SamplingProfiler(self.args.interval_ms / 1000)
+                    profiler.start()
+                started = time.perf_counter()
+                try:
+                    self.turn = await self._post_turn(client, turn["location_id"], payload)
+                    if not self.args.skip_background:
+                        await self._drain_background()
+                finally:
+                    self.elapsed_ms = (time.perf_counter() - started) * 1000
+                    if self.args.deterministic:
+                        profiler.disable()
+                    else:
+                        profiler.stop()
+                self.profile = profiler
+            
+            # 프로파일링에서 제외한 백그라운드 작업도 끝까지 실행
+            await self._drain_background()
+
+
+def write_output(args, runner: TurnProfiler) -> str:
+    """결과 파일 저장 후 경로 반환"""
+    turn_id = runner.turn["turn_id"] if runner.turn else "turn"
+    if args.deterministic:
+        path = args.output or f"profile_{turn_id[:8]}.pstats"
+        runner.profile.dump_stats(path)
+    else:
+        path = args.output or f"profile_{turn_id[:8]}.folded"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in runner.profile.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    return path
+
+
+def print_report(args, runner: TurnProfiler, path: str):
+    print("=" * 60)
+    print("🔬 채팅 턴 프로파일")
+    print("=" * 60)
+    print(f"turn_id: {runner.turn['turn_id']}")
+    print(f"경과: {runner.elapsed_ms:.1f}ms (가짜 LLM 지연 중앙값 {args.latency_ms:.0f}ms)")
+    
+    if args.deterministic:
+        print(f"\n누적 시간 상위 {args.top}개 함수:")
+        stream = io.StringIO()
+        pstats.Stats(runner.profile, stream=stream).sort_stats("cumulative").print_stats(args.top)
+        print(stream.getvalue())
+    else:
+        own: Dict[str, int] = {}
+        for stack, count in runner.profile.stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            own[leaf] = own.get(leaf, 0) + count
+        total = max(1, runner.profile.samples)
+        print(f"샘플: {runner.profile.samples}개 ({args.interval_ms}ms 간격)")
+        print(f"\n실행 중이던 함수 상위 {args.top}개:")
+        for name, count in sorted(own.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {count / total:6.1%}  {name}")
+    
+    print(f"\n저장: {path}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SYNK 채팅 턴 프로파일링 (가짜 LLM 백엔드)")
+    parser.add_argument("--turn-id", help="재현할 턴 ID (--source-db의 story_summaries에서 조회)")
+    parser.add_argument("--source-db", help="턴을 조회할 DB (경로 또는 SQLAlchemy URL)")
+    parser.add_argument("--no-history", action="store_true", help="같은 세션의 이전 턴을 재현하지 않음")
+    parser.add_argument("--location", default=DEFAULT_LOCATION_ID, help="장소 ID 또는 이름 (--turn-id가 없을 때)")
+    parser.add_argument("--message", default=DEFAULT_MESSAGE, help="유저 메시지 (--turn-id가 없을 때)")
+    parser.add_argument("--user-id", default="profile_user", help="유저 ID (--turn-id가 없을 때)")
+    parser.add_argument("--seed", type=int, default=42, help="가짜 LLM 시드")
+    parser.add_argument("--latency-ms", type=float, default=0, help="가짜 LLM 지연 중앙값 (ms, 0이면 파이썬 실행 시간만 측정)")
+    parser.add_argument("--deterministic", action="store_true", help="샘플링 대신 cProfile 사용 (.pstats 저장)")
+    parser.add_argument("--interval-ms", type=float, default=1.0, help="샘플링 간격 (ms)")
+    parser.add_argument("--skip-background", action="store_true", help="턴 뒤 백그라운드 작업은 프로파일링에서 제외")
+    parser.add_argument("--top", type=int, default=25, help="출력할 상위 함수 수")
+    parser.add_argument("--output", help="결과 파일 경로 (기본 profile_<turn_id>.folded / .pstats)")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    args = parser.parse_args(argv)
+    if args.turn_id and not args.source_db:
+        parser.error("--turn-id에는 --source-db가 필요합니다.")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    
+    if args.turn_id:
+        turns = load_replay_turns(args.source_db, args.turn_id, with_history=not args.no_history)
+    else:
+        turns = [{"user_id": args.user_id, "location": args.location, "user_message": args.message}]
+    
+    db_dir = tempfile.mkdtemp(prefix="synk_profile_")
+    configure_environment(args, db_dir)
+    
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with quiet:
+            from db import character_db, database
+            from scripts.seed_characters import seed_locations, seed_characters
+            import main as app_module
+            
+            database.init_db()
+            character_db.init_character_db()
+            seed_locations()
+            seed_characters()
+            
+            for turn in turns:
+                turn["location_id"] = resolve_location_id(turn["location"])
+            
+            runner = TurnProfiler(args)
+            asyncio.run(runner.run(app_module.app, turns))
+        
+        path = write_output(args, runner)
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+    
+    print_report(args, runner, path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
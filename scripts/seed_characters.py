@@ -17,6 +17,7 @@ from db.character_db import (
     SessionLocal,
 )
 from models.character import CharacterPersona, Location
+from core.phrase_bank import save_phrase_bank
 
 
 def seed_locations():
@@ -464,7 +465,8 @@ def seed_characters():
         for char in characters:
             existing = get_character(char.id, db)
             if not existing:
-                create_character(char, db)
+                created = create_character(char, db)
+                save_phrase_bank(created, db)
                 print(f"✅ 캐릭터 생성: {char.name} ({char.location})")
             else:
                 print(f"⏭️ 캐릭터 이미 존재: {char.name}")
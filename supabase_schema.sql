@@ -25,6 +25,7 @@ CREATE TABLE IF NOT EXISTS works (
     target_audience VARCHAR(10) NOT NULL DEFAULT 'all' CHECK (target_audience IN ('all', 'male', 'female')),
     visibility VARCHAR(10) NOT NULL DEFAULT 'private' CHECK (visibility IN ('public', 'private', 'unlisted')),
     is_adult BOOLEAN DEFAULT FALSE,
+    generation_overrides JSONB DEFAULT '{}', -- 생성 설정 프로필 덮어쓰기 (프로필 이름 → 설정)
     
     -- 통계
     view_count INTEGER DEFAULT 0,
@@ -42,6 +43,9 @@ CREATE TABLE IF NOT EXISTS works (
     CONSTRAINT works_tags_limit CHECK (array_length(tags, 1) <= 10)
 );
 
+-- 기존 DB에 나중에 추가된 컬럼 (CREATE TABLE IF NOT EXISTS는 기존 테이블을 바꾸지 않음)
+ALTER TABLE works ADD COLUMN IF NOT EXISTS generation_overrides JSONB DEFAULT '{}';
+
 -- 인덱스 생성
 CREATE INDEX IF NOT EXISTS idx_works_creator_id ON works(creator_id);
 CREATE INDEX IF NOT EXISTS idx_works_visibility ON works(visibility);
@@ -0,0 +1,173 @@
+"""
+LLM 서킷 브레이커
+API 키 정지/할당량 소진처럼 LLM이 계속 실패하는 동안에는 호출을 보내지 않고 즉시 실패 (503)
+"""
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException
+from google.api_core import exceptions as google_exceptions
+
+from utils.llm_retry import is_retriable_error
+from utils.logger import get_logger
+from utils.config import (
+    get_llm_breaker_failure_threshold,
+    get_llm_breaker_open_seconds
+)
+
+logger = get_logger(__name__)
+
+# 브레이커 상태
+STATE_CLOSED = "closed"        # 정상 - 모든 호출 허용
+STATE_OPEN = "open"            # 차단 - 호출 없이 즉시 실패
+STATE_HALF_OPEN = "half_open"  # 시험 - 한 건만 보내 회복 여부 확인
+
+# 기다려도 회복되지 않는 오류 (한 번만 발생해도 바로 차단)
+FATAL_EXCEPTIONS = (
+    google_exceptions.PermissionDenied,
+    google_exceptions.Unauthenticated,
+)
+FATAL_MESSAGE_MARKERS = ("suspended", "api_key", "api key", "permission denied", "403")
+
+
+class CircuitOpenError(HTTPException):
+    """서킷 브레이커가 열려 있어 보내지 않은 LLM 호출"""
+    
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail="AI 응답 서비스가 일시적으로 중단되었습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, int(retry_after)))}
+        )
+
+
+def is_fatal_error(e: BaseException) -> bool:
+    """API 키 정지/권한 오류처럼 재시도로 회복되지 않는 오류인지 판단"""
+    if isinstance(e, FATAL_EXCEPTIONS):
+        return True
+    if isinstance(e, HTTPException):
+        return False
+    message = str(e).lower()
+    return any(marker in message for marker in FATAL_MESSAGE_MARKERS)
+
+
+class CircuitBreaker:
+    """
+    LLM 서킷 브레이커 (싱글톤 패턴)
+    
+    - 재시도까지 실패한 일시적 오류가 LLM_BREAKER_FAILURE_THRESHOLD회 연속되거나
+      API 키 정지/권한 오류가 한 번이라도 나면 열림
+    - 열려 있는 동안 모든 호출은 스케줄러 슬롯을 잡지 않고 CircuitOpenError(503)로 즉시 실패
+    - LLM_BREAKER_OPEN_SECONDS가 지나면 시험 호출 한 건만 허용하고,
+      성공하면 닫고 실패하면 다시 엶
+    - 404(모델 없음), 빈 응답 등 요청 자체의 문제는 실패로 세지 않음
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(CircuitBreaker, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.failure_threshold = max(1, get_llm_breaker_failure_threshold())
+        self.open_seconds = max(0.0, get_llm_breaker_open_seconds())
+        
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._last_error: Optional[str] = None
+        self._rejected = 0
+        self._initialized = True
+    
+    @property
+    def state(self) -> str:
+        """현재 상태 (열린 지 open_seconds가 지나면 half_open)"""
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+        return self._state
+    
+    def is_open(self) -> bool:
+        """지금 호출하면 즉시 실패하는지 (시험 호출이 진행 중인 half_open 포함)"""
+        state = self.state
+        return state == STATE_OPEN or (state == STATE_HALF_OPEN and self._probe_in_flight)
+    
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """
+        LLM 호출 보호 (async with로 사용)
+        
+        Raises:
+            CircuitOpenError: 브레이커가 열려 있는 경우 (503)
+        """
+        self._before_call()
+        try:
+            yield
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        except BaseException:
+            # 취소된 시험 호출은 결과를 알 수 없으므로 다음 호출이 다시 시험
+            self._probe_in_flight = False
+            raise
+        else:
+            self._record_success()
+    
+    def _before_call(self):
+        """호출 허용 여부 확인"""
+        state = self.state
+        if state == STATE_CLOSED:
+            return
+        if state == STATE_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            logger.info("시험 호출 허용 (half_open)")
+            return
+        self._rejected += 1
+        raise CircuitOpenError(retry_after=self.open_seconds - (time.monotonic() - self._opened_at))
+    
+    def _record_success(self):
+        """성공 - 닫힘으로 복귀"""
+        if self._state != STATE_CLOSED:
+            logger.info("LLM 호출 회복 - 브레이커 닫힘")
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+    
+    def _record_failure(self, e: Exception):
+        """실패 기록 - 임계치를 넘거나 치명적 오류면 열림"""
+        self._probe_in_flight = False
+        fatal = is_fatal_error(e)
+        if not fatal and not is_retriable_error(e):
+            # 요청 자체의 문제 (404, 빈 응답 등) - LLM 상태와 무관
+            if self._state == STATE_HALF_OPEN:
+                self._record_success()
+            return
+        
+        self._consecutive_failures += 1
+        self._last_error = f"{type(e).__name__}: {str(e)[:200]}"
+        if fatal or self._state == STATE_HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != STATE_OPEN:
+                logger.error("브레이커 열림 (%.0f초) - %s", self.open_seconds, self._last_error)
+            self._state = STATE_OPEN
+            self._opened_at = time.monotonic()
+    
+    def get_stats(self) -> Dict:
+        """브레이커 상태"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "open_seconds": self.open_seconds,
+            "rejected": self._rejected,
+            "last_error": self._last_error,
+        }
+
+
+# 전역 인스턴스
+llm_circuit_breaker = CircuitBreaker()
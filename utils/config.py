@@ -2,8 +2,10 @@
 환경 설정 유틸리티
 공통 환경 변수 로드 및 설정
 """
+import json
 import os
 from pathlib import Path
+from typing import Dict, List, Tuple
 from dotenv import load_dotenv
 
 
@@ -85,3 +87,610 @@ def get_supabase_secret_key() -> str:
         Supabase Secret Key
     """
     return os.getenv("SUPERBASE_SECRET_KEY")  # 사용자 오타 반영
+
+
+def get_idempotency_cache_size() -> int:
+    """
+    멱등 턴 결과 캐시 최대 개수
+    
+    Returns:
+        캐시 항목 수 (기본 500)
+    """
+    return int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "500"))
+
+
+def get_idempotency_ttl_seconds() -> float:
+    """
+    멱등 턴 결과 보관 시간
+    
+    Returns:
+        초 단위 TTL (기본 600초)
+    """
+    return float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+
+
+def get_llm_max_concurrency() -> int:
+    """
+    동시에 진행할 수 있는 LLM 호출 최대 개수 (전체)
+    
+    Returns:
+        동시 호출 수 (기본 8)
+    """
+    return int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+
+def get_llm_interactive_reserve() -> int:
+    """
+    대화 응답(메인/티키타카/끼어들기) 전용으로 남겨둘 LLM 호출 슬롯 수
+    
+    Returns:
+        예약 슬롯 수 (기본 2)
+    """
+    return int(os.getenv("LLM_INTERACTIVE_RESERVE", "2"))
+
+
+def get_llm_class_limits() -> Dict[str, int]:
+    """
+    호출 종류별 동시 호출 한도
+    
+    LLM_CLASS_LIMITS="sub=4,inner_thought=4,summary=2,profile=1" 형식
+    (지정하지 않은 종류는 전체 한도만 적용)
+    
+    Returns:
+        {호출 종류: 동시 호출 수}
+    """
+    raw = os.getenv("LLM_CLASS_LIMITS", "sub=4,inner_thought=4,summary=2,profile=1")
+    limits = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            print(f"⚠️ LLM_CLASS_LIMITS 항목 무시: {item}")
+    return limits
+
+
+def is_load_shedding_enabled() -> bool:
+    """
+    부하 시 선택 단계(끼어들기, 무반응 속마음, 서브 리액션, 티키타카) 자동 생략 여부
+    
+    Returns:
+        사용 여부 (기본 True, LOAD_SHEDDING_ENABLED=false로 끔)
+    """
+    return os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+
+
+def get_load_shed_target_p95_seconds() -> float:
+    """
+    부하 판단 기준 LLM 호출 p95 지연 시간 (이 값을 넘으면 단계 생략 시작)
+    
+    Returns:
+        초 단위 기준값 (기본 6초)
+    """
+    return float(os.getenv("LOAD_SHED_P95_SECONDS", "6"))
+
+
+def get_load_shed_target_queue_depth() -> int:
+    """
+    부하 판단 기준 LLM 대기열 길이 (이 값을 넘으면 단계 생략 시작)
+    
+    Returns:
+        대기 호출 수 (기본 8)
+    """
+    return int(os.getenv("LOAD_SHED_QUEUE_DEPTH", "8"))
+
+
+def get_load_shed_window_seconds() -> float:
+    """
+    p95 지연 시간을 계산할 최근 구간
+    
+    Returns:
+        초 단위 구간 (기본 60초)
+    """
+    return float(os.getenv("LOAD_SHED_WINDOW_SECONDS", "60"))
+
+
+def get_load_shed_hold_seconds() -> float:
+    """
+    단계 생략 수준을 낮추기 전 최소 유지 시간 (잦은 전환 방지)
+    
+    Returns:
+        초 단위 유지 시간 (기본 15초)
+    """
+    return float(os.getenv("LOAD_SHED_HOLD_SECONDS", "15"))
+
+
+def get_turn_deadline_seconds() -> float:
+    """
+    채팅 턴 전체 마감 시간 (넘기면 남은 단계는 생략하거나 기본 대사로 대체)
+    
+    Returns:
+        초 단위 마감 시간 (기본 30초, 0 이하면 마감 없음)
+    """
+    return float(os.getenv("TURN_DEADLINE_SECONDS", "30"))
+
+
+def get_llm_retry_max_attempts() -> int:
+    """
+    일시적 오류(429/5xx/타임아웃) 시 LLM 호출 최대 시도 횟수 (첫 시도 포함)
+    
+    Returns:
+        시도 횟수 (기본 3, 1이면 재시도 없음)
+    """
+    return int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))
+
+
+def get_llm_retry_base_delay() -> float:
+    """
+    재시도 지수 백오프 기본 대기 시간 (n번째 재시도는 최대 base * 2^(n-1)초, 지터 적용)
+    
+    Returns:
+        초 단위 대기 시간 (기본 0.5초)
+    """
+    return float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+
+
+def get_llm_retry_max_delay() -> float:
+    """
+    재시도 대기 시간 상한
+    
+    Returns:
+        초 단위 상한 (기본 8초)
+    """
+    return float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+
+
+def get_llm_retry_budget_ratio() -> float:
+    """
+    재시도 예산 (전체 호출 대비 재시도 비율 상한, 장애 시 재시도 폭증 방지)
+    
+    Returns:
+        비율 (기본 0.2 = 호출 10건당 재시도 2건)
+    """
+    return float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.2"))
+
+
+def is_llm_hedging_enabled() -> bool:
+    """
+    헤징 사용 여부 (응답이 지연 분위수보다 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용)
+    
+    Returns:
+        사용 여부 (기본 False, LLM_HEDGE_ENABLED=true로 켬)
+    """
+    return os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes", "on")
+
+
+def get_llm_hedge_percentile() -> float:
+    """
+    헤징 요청을 보낼 지연 분위수 (호출 종류별 최근 지연 기준)
+    
+    Returns:
+        분위 (기본 0.95 = p95보다 늦으면 헤징)
+    """
+    return float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+
+
+def get_llm_hedge_budget_ratio() -> float:
+    """
+    헤징 예산 (전체 호출 대비 헤징 요청 비율 상한, 장애 시 요청 증폭 방지)
+    
+    Returns:
+        비율 (기본 0.05 = 호출 20건당 헤징 1건)
+    """
+    return float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05"))
+
+
+def get_llm_breaker_failure_threshold() -> int:
+    """
+    서킷 브레이커를 여는 연속 실패 횟수 (재시도까지 모두 실패한 호출 기준)
+    
+    Returns:
+        연속 실패 횟수 (기본 5)
+    """
+    return int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+
+
+def get_llm_breaker_open_seconds() -> float:
+    """
+    서킷 브레이커가 열린 뒤 시험 호출을 허용하기까지의 시간
+    
+    Returns:
+        초 단위 시간 (기본 30초)
+    """
+    return float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+
+
+def get_llm_backend() -> str:
+    """
+    LLM 백엔드 선택
+    
+    Returns:
+        "gemini" (기본) 또는 "fake" (API 호출 없는 로컬 대체 - 부하/지연 테스트용)
+    """
+    return os.getenv("LLM_BACKEND", "gemini").strip().lower()
+
+
+def get_fake_llm_seed() -> int:
+    """
+    가짜 LLM 백엔드 시드 (같은 시드와 같은 호출 순서면 같은 응답/지연/오류)
+    
+    Returns:
+        시드 (기본 42)
+    """
+    return int(os.getenv("FAKE_LLM_SEED", "42"))
+
+
+def get_fake_llm_latency_ms() -> float:
+    """
+    가짜 LLM 백엔드 응답 지연 중앙값 (로그정규 분포)
+    
+    Returns:
+        밀리초 단위 중앙값 (기본 800ms, 0이면 지연 없음)
+    """
+    return float(os.getenv("FAKE_LLM_LATENCY_MS", "800"))
+
+
+def get_fake_llm_latency_sigma() -> float:
+    """
+    가짜 LLM 백엔드 지연 분포 폭 (로그정규 분포의 sigma, 클수록 꼬리가 김)
+    
+    Returns:
+        sigma (기본 0.5 ≈ p95가 중앙값의 2.3배)
+    """
+    return float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5"))
+
+
+def get_fake_llm_error_rate() -> float:
+    """
+    가짜 LLM 백엔드 일시적 오류(429/503) 비율
+    
+    Returns:
+        0.0 ~ 1.0 (기본 0.0)
+    """
+    return float(os.getenv("FAKE_LLM_ERROR_RATE", "0.0"))
+
+
+def get_admin_token() -> str:
+    """
+    관리자/디버그 엔드포인트 토큰 (X-Admin-Token 헤더로 전달)
+    
+    Returns:
+        토큰 문자열 (없으면 None - 디버그 엔드포인트 비활성화)
+    """
+    return os.getenv("ADMIN_TOKEN") or None
+
+
+def get_trace_buffer_size() -> int:
+    """
+    턴 트레이스 보관 개수 (최근 N턴, 디버그 엔드포인트에서 turn_id로 조회)
+    
+    Returns:
+        보관 개수 (기본 200, 0이면 보관하지 않음)
+    """
+    return int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+
+
+def get_log_level() -> str:
+    """
+    기본 로그 레벨
+    
+    Returns:
+        DEBUG/INFO/WARNING/ERROR (기본 INFO)
+    """
+    return os.getenv("LOG_LEVEL", "INFO")
+
+
+def get_log_levels() -> str:
+    """
+    모듈별 로그 레벨 (쉼표로 구분한 모듈=레벨 목록)
+    
+    Returns:
+        예: "core.scene_reaction=DEBUG,db=WARNING" (기본 빈 문자열)
+    """
+    return os.getenv("LOG_LEVELS", "")
+
+
+def get_log_format() -> str:
+    """
+    로그 출력 형식
+    
+    Returns:
+        "json" (기본, 한 줄 JSON) 또는 "text" (로컬 개발용)
+    """
+    return os.getenv("LOG_FORMAT", "json").strip().lower()
+
+
+def get_log_debug_sample_rate() -> float:
+    """
+    DEBUG 로그 샘플링 비율 (턴마다 반복되는 상세 로그의 출력량 제한)
+    
+    Returns:
+        0.0 ~ 1.0 (기본 0.1, 1이면 모두 출력)
+    """
+    return float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+
+
+def get_llm_user_daily_token_budget() -> int:
+    """
+    유저별 하루 LLM 토큰 예산 (프롬프트 + 출력 토큰, 넘기면 해당 유저의 LLM 호출을 429로 거절)
+    
+    Returns:
+        토큰 수 (기본 0, 0이면 제한 없음)
+    """
+    return int(os.getenv("LLM_USER_DAILY_TOKEN_BUDGET", "0"))
+
+
+def get_llm_user_token_budgets() -> Dict[str, int]:
+    """
+    유저별 하루 LLM 토큰 예산 개별 지정 (LLM_USER_DAILY_TOKEN_BUDGET보다 우선)
+    
+    LLM_USER_TOKEN_BUDGETS="user_a=200000,user_b=0" 형식 (0이면 해당 유저는 제한 없음)
+    
+    Returns:
+        {유저 ID: 토큰 수}
+    """
+    raw = os.getenv("LLM_USER_TOKEN_BUDGETS", "")
+    budgets = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        user_id, value = item.split("=", 1)
+        try:
+            budgets[user_id.strip()] = int(value)
+        except ValueError:
+            print(f"⚠️ LLM_USER_TOKEN_BUDGETS 항목 무시: {item}")
+    return budgets
+
+
+def get_llm_token_prices() -> Dict[str, Tuple[float, float]]:
+    """
+    모델별 토큰 단가 (USD / 100만 토큰, 비용 집계용)
+    
+    LLM_TOKEN_PRICES="gemini-2.0-flash=0.10/0.40" 형식 (모델=입력 단가/출력 단가)
+    
+    Returns:
+        {모델 이름: (입력 단가, 출력 단가)} (목록에 없는 모델은 비용 0으로 집계)
+    """
+    raw = os.getenv(
+        "LLM_TOKEN_PRICES",
+        "gemini-2.0-flash=0.10/0.40,gemini-2.0-flash-lite=0.075/0.30,gemini-2.5-flash=0.30/2.50,gemini-2.5-flash-lite=0.10/0.40"
+    )
+    prices = {}
+    for item in raw.split(","):
+        if "=" not in item or "/" not in item:
+            continue
+        model, value = item.split("=", 1)
+        try:
+            input_price, output_price = value.split("/", 1)
+            prices[model.strip()] = (float(input_price), float(output_price))
+        except ValueError:
+            print(f"⚠️ LLM_TOKEN_PRICES 항목 무시: {item}")
+    return prices
+
+
+def get_token_usage_flush_seconds() -> float:
+    """
+    토큰 사용량 집계를 DB에 반영하는 주기 (그 사이에는 메모리에 누적)
+    
+    Returns:
+        초 (기본 30, 0이면 호출마다 반영)
+    """
+    return float(os.getenv("TOKEN_USAGE_FLUSH_SECONDS", "30"))
+
+
+def get_profile_buffer_size() -> int:
+    """
+    요청 프로파일 보관 개수 (최근 N건, 디버그 엔드포인트에서 turn_id로 조회)
+    
+    Returns:
+        보관 개수 (기본 20, 0이면 보관하지 않음)
+    """
+    return int(os.getenv("PROFILE_BUFFER_SIZE", "20"))
+
+
+def get_profile_interval_ms() -> float:
+    """
+    프로파일러 샘플링 간격
+    
+    Returns:
+        밀리초 (기본 1)
+    """
+    return float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+
+
+def get_generation_profile_overrides() -> Dict[str, Dict]:
+    """
+    생성 설정 프로필 전역 덮어쓰기 (JSON, 프로필 이름 → 바꿀 값)
+    
+    GENERATION_PROFILE_OVERRIDES='{"sub_reaction": {"max_output_tokens": 32}}' 형식
+    
+    Returns:
+        {프로필 이름: {설정: 값}} (기본 빈 딕셔너리)
+    """
+    raw = os.getenv("GENERATION_PROFILE_OVERRIDES", "").strip()
+    if not raw:
+        return {}
+    try:
+        overrides = json.loads(raw)
+    except json.JSONDecodeError as e:
+        print(f"⚠️ GENERATION_PROFILE_OVERRIDES 무시 (JSON 오류: {e})")
+        return {}
+    return overrides if isinstance(overrides, dict) else {}
+
+
+def get_llm_model_tiers() -> List[Tuple[str, str]]:
+    """
+    모델 등급 (대체 순서대로)
+    
+    LLM_MODEL_TIERS="lite=gemini-2.0-flash-lite,standard=gemini-2.0-flash,pro=gemini-2.5-flash" 형식
+    (등급 모델이 404/한도 초과면 뒤의 등급, 마지막 등급이면 앞의 등급으로 대체)
+    
+    Returns:
+        [(등급, 모델 이름)]
+    """
+    raw = os.getenv("LLM_MODEL_TIERS", "lite=gemini-2.0-flash-lite,standard=gemini-2.0-flash,pro=gemini-2.5-flash")
+    tiers = []
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, model = item.split("=", 1)
+        if not name.strip() or not model.strip():
+            print(f"⚠️ LLM_MODEL_TIERS 항목 무시: {item}")
+            continue
+        tiers.append((name.strip(), model.strip()))
+    return tiers
+
+
+def get_llm_model_routes() -> Dict[str, str]:
+    """
+    호출 종류별 모델 등급
+    
+    LLM_MODEL_ROUTES="sub=lite,inner_thought=lite,profile=lite" 형식
+    (지정하지 않은 종류는 standard 등급)
+    
+    Returns:
+        {호출 종류: 등급}
+    """
+    raw = os.getenv("LLM_MODEL_ROUTES", "sub=lite,inner_thought=lite,profile=lite")
+    routes = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        name, tier = item.split("=", 1)
+        routes[name.strip()] = tier.strip()
+    return routes
+
+
+def get_llm_model_cooldown_seconds() -> float:
+    """
+    한도 초과(429)로 대체된 모델을 다시 쓰기까지 대기 시간
+    
+    Returns:
+        초 (기본 60)
+    """
+    return float(os.getenv("LLM_MODEL_COOLDOWN_SECONDS", "60"))
+
+
+def get_llm_cache_call_types() -> List[str]:
+    """
+    응답 캐시를 사용할 LLM 호출 종류
+    
+    LLM_CACHE_CALL_TYPES="main,summary,character_generate" 형식
+    
+    Returns:
+        호출 종류 목록 (기본 빈 목록 - 캐시 사용 안 함)
+    """
+    raw = os.getenv("LLM_CACHE_CALL_TYPES", "")
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+def get_llm_cache_ttl_seconds() -> float:
+    """
+    LLM 응답 캐시 보관 시간
+    
+    Returns:
+        초 단위 TTL (기본 86400초)
+    """
+    return float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+
+
+def get_llm_cache_max_entries() -> int:
+    """
+    LLM 응답 캐시 최대 개수 (메모리)
+    
+    Returns:
+        캐시 항목 수 (기본 1000)
+    """
+    return int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+
+def get_llm_cache_disk_path() -> str:
+    """
+    LLM 응답 캐시 디스크 파일 (SQLite, 재시작해도 유지)
+    
+    Returns:
+        파일 경로 (기본 llm_response_cache.db, 빈 값이면 메모리만 사용)
+    """
+    return os.getenv("LLM_CACHE_DISK_PATH", "llm_response_cache.db")
+
+
+def get_llm_cache_disk_max_entries() -> int:
+    """
+    LLM 응답 캐시 최대 개수 (디스크)
+    
+    Returns:
+        캐시 항목 수 (기본 10000)
+    """
+    return int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "10000"))
+
+
+def is_phrase_bank_enabled() -> bool:
+    """
+    서브 리액션을 캐릭터 말투 문구 모음에서 고를지 (LLM 호출 없음)
+    
+    Returns:
+        사용 여부 (기본 True, PHRASE_BANK_ENABLED=false로 끄면 항상 LLM 호출)
+    """
+    return os.getenv("PHRASE_BANK_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+
+
+def get_sub_reaction_llm_min_tension() -> int:
+    """
+    서브 리액션을 LLM으로 생성할 씬 긴장도 (말투 문구 모음 사용 중일 때)
+    
+    Returns:
+        긴장도 1~10 (기본 0 - 항상 말투 문구 모음 사용)
+    """
+    return int(os.getenv("SUB_REACTION_LLM_MIN_TENSION", "0"))
+
+
+def is_lazy_inner_thoughts_enabled() -> bool:
+    """
+    속마음을 턴에서 바로 생성하지 않고 핸들만 돌려줄지 (요청의 lazy_inner_thoughts가 없을 때 기본값)
+    
+    Returns:
+        사용 여부 (기본 False - 모든 캐릭터의 속마음을 턴에서 생성)
+    """
+    return os.getenv("LAZY_INNER_THOUGHTS", "false").lower() in ("1", "true", "yes", "on")
+
+
+def get_inner_thought_handle_ttl_seconds() -> int:
+    """
+    지연 속마음 핸들 보관 시간 (이 시간이 지나면 조회해도 404)
+    
+    Returns:
+        초 (기본 1800)
+    """
+    return int(os.getenv("INNER_THOUGHT_HANDLE_TTL_SECONDS", "1800"))
+
+
+def get_inner_thought_handle_max_entries() -> int:
+    """
+    지연 속마음 핸들 최대 보관 개수 (넘으면 오래된 핸들부터 제거)
+    
+    Returns:
+        개수 (기본 5000)
+    """
+    return int(os.getenv("INNER_THOUGHT_HANDLE_MAX_ENTRIES", "5000"))
+
+
+def get_reactor_max_main() -> int:
+    """
+    턴당 메인 응답 최대 인원 (반응 점수 상위, 티키타카/끼어들기 제외)
+    
+    Returns:
+        인원 (기본 3, 0이면 제한 없음)
+    """
+    return int(os.getenv("REACTOR_MAX_MAIN", "3"))
+
+
+def get_reactor_max_sub() -> int:
+    """
+    턴당 서브 리액션 + 무반응 속마음 최대 인원 (나머지는 LLM 호출 없이 무반응)
+    
+    Returns:
+        인원 (기본 8, 0이면 제한 없음)
+    """
+    return int(os.getenv("REACTOR_MAX_SUB", "8"))
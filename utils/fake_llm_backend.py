@@ -0,0 +1,233 @@
+"""
+가짜 LLM 백엔드
+Gemini 할당량을 쓰지 않고 전체 앱을 오프라인으로 실행하기 위한 결정적 로컬 백엔드 (부하/지연 테스트용)
+"""
+import asyncio
+import json
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+from utils.llm_backend import LLMBackend, TokenUsage, estimate_tokens
+from utils.llm_scheduler import LLMCallType
+from utils.config import (
+    get_fake_llm_seed,
+    get_fake_llm_latency_ms,
+    get_fake_llm_latency_sigma,
+    get_fake_llm_error_rate
+)
+
+# 프롬프트 종류
+FAMILY_DIALOGUE = "dialogue"
+FAMILY_SUB = "sub"
+FAMILY_INNER_THOUGHT = "inner_thought"
+FAMILY_SUMMARY = "summary"
+FAMILY_PROFILE = "profile"
+FAMILY_CHARACTER = "character"
+
+CALL_TYPE_FAMILIES = {
+    LLMCallType.SUB: FAMILY_SUB,
+    LLMCallType.INNER_THOUGHT: FAMILY_INNER_THOUGHT,
+    LLMCallType.SUMMARY: FAMILY_SUMMARY,
+    LLMCallType.PROFILE: FAMILY_PROFILE,
+    LLMCallType.CHARACTER_GENERATE: FAMILY_CHARACTER,
+}
+
+# 스트리밍 시 전체 지연 중 첫 조각까지 걸리는 비율
+FIRST_CHUNK_RATIO = 0.4
+
+ACTIONS = ["고개를 갸웃하며", "팔짱을 끼며", "피식 웃으며", "시선을 돌리며", "한숨을 쉬며", "눈을 가늘게 뜨며"]
+OPENERS = ["뭐야,", "흠...", "아,", "그래서?", "하,", "글쎄."]
+LINES = [
+    "그런 말을 나한테 하는 이유가 뭔데?",
+    "처음 보는 얼굴인데, 꽤 당돌하네.",
+    "재미있는 소리를 하는구나.",
+    "여기서는 말조심하는 게 좋을 거야.",
+    "궁금한 게 있으면 똑바로 물어봐.",
+    "나쁘지 않네. 계속 말해봐.",
+]
+SUB_LINES = ["크큭...", "*코웃음*", "흥...", "*눈을 가늘게 뜨며*", "후후...", "*조용히 지켜본다*"]
+EMOTIONS = ["냉정", "호기심", "경계", "무관심", "긴장", "흥미"]
+EVALUATIONS = ["만만해 보이지만 경계 필요", "생각보다 재미있는 녀석", "아직 판단하기 이르다"]
+ATTITUDES = ["경계", "관심", "무시", "호감"]
+INTENTIONS = ["떠보는 중", "일단 관망", "기선제압하려 함"]
+TRAITS = ["도발적", "소심함", "유머러스", "자신감"]
+
+
+def detect_family(prompt: str, call_type: LLMCallType) -> str:
+    """프롬프트 종류 판단 (프롬프트 형식 우선, 없으면 호출 종류)"""
+    if "ai_summary:" in prompt and "ai_analysis:" in prompt:
+        return FAMILY_SUMMARY
+    if "[추출할 정보]" in prompt:
+        return FAMILY_PROFILE
+    if "속마음을 작성하세요" in prompt:
+        return FAMILY_INNER_THOUGHT
+    return CALL_TYPE_FAMILIES.get(call_type, FAMILY_DIALOGUE)
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    결정적 가짜 LLM 백엔드 (LLM_BACKEND=fake)
+    
+    - 응답 내용: 시드 + 프롬프트로 결정 (같은 프롬프트면 항상 같은 응답)
+    - 지연/오류: 시드로 초기화한 난수열에서 호출 순서대로 결정
+      (FAKE_LLM_LATENCY_MS 중앙값, FAKE_LLM_LATENCY_SIGMA 폭의 로그정규 분포,
+       FAKE_LLM_ERROR_RATE 비율로 429/503 발생)
+    - 대사, 서브 리액션, 속마음 JSON, 스토리 요약(ai_summary/ai_analysis),
+      프로필 JSON, 캐릭터 프롬프트를 각 파서가 받아들이는 형식으로 생성
+    """
+    
+    name = "fake"
+    
+    def __init__(self):
+        self.seed = get_fake_llm_seed()
+        self.latency_ms = max(0.0, get_fake_llm_latency_ms())
+        self.latency_sigma = max(0.0, get_fake_llm_latency_sigma())
+        self.error_rate = min(1.0, max(0.0, get_fake_llm_error_rate()))
+        self._rng = random.Random(self.seed)
+        print(
+            f"🧪 가짜 LLM 백엔드 사용 (seed={self.seed}, 지연 중앙값 {self.latency_ms:.0f}ms, "
+            f"sigma {self.latency_sigma}, 오류율 {self.error_rate})"
+        )
+    
+    @property
+    def configured(self) -> bool:
+        return True
+    
+    async def generate(
+        self,
+        prompt: str,
+        model_name: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> str:
+        latency, error = self._next_outcome()
+        await asyncio.sleep(latency)
+        if error:
+            raise error
+        return self._render_with_usage(prompt, call_type, generation_config, usage)
+    
+    async def stream(
+        self,
+        prompt: str,
+        model_name: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        latency, error = self._next_outcome()
+        await asyncio.sleep(latency * FIRST_CHUNK_RATIO)
+        if error:
+            raise error
+        
+        chunks = self._split_chunks(self._render_with_usage(prompt, call_type, generation_config, usage))
+        interval = latency * (1 - FIRST_CHUNK_RATIO) / max(1, len(chunks) - 1)
+        for i, chunk in enumerate(chunks):
+            if i > 0 and interval > 0:
+                await asyncio.sleep(interval)
+            yield chunk
+    
+    def _next_outcome(self):
+        """다음 호출의 지연 시간(초)과 오류 (오류가 없으면 None)"""
+        latency = 0.0
+        if self.latency_ms > 0:
+            latency = self._rng.lognormvariate(math.log(self.latency_ms), self.latency_sigma) / 1000
+        error = None
+        if self.error_rate > 0 and self._rng.random() < self.error_rate:
+            if self._rng.random() < 0.5:
+                error = google_exceptions.TooManyRequests("429 Resource has been exhausted (fake backend)")
+            else:
+                error = google_exceptions.ServiceUnavailable("503 The service is currently unavailable (fake backend)")
+        return latency, error
+    
+    def _render_with_usage(
+        self,
+        prompt: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]],
+        usage: Optional[TokenUsage]
+    ) -> str:
+        """응답 생성 + 생성 설정 적용 + 토큰 사용량 추정 기록 (가짜 백엔드는 실제 토큰 수가 없음)"""
+        text = self.apply_generation_config(self.render(prompt, call_type), generation_config)
+        if usage is not None:
+            usage.fill_estimates(prompt, text)
+        return text
+    
+    @staticmethod
+    def apply_generation_config(text: str, generation_config: Optional[Dict[str, Any]]) -> str:
+        """
+        중단 시퀀스/최대 출력 토큰 적용 (실제 API처럼 중단 시퀀스에서 자르고 토큰 상한을 넘는 부분은 버림)
+        
+        토큰 수는 estimate_tokens와 같은 기준 (UTF-8 4바이트당 1토큰)
+        """
+        if not generation_config:
+            return text
+        for stop in generation_config.get("stop_sequences") or []:
+            index = text.find(stop)
+            if index >= 0:
+                text = text[:index]
+        max_tokens = generation_config.get("max_output_tokens")
+        if max_tokens and estimate_tokens(text) > max_tokens:
+            text = text.encode("utf-8")[:max_tokens * 4].decode("utf-8", errors="ignore")
+        return text
+    
+    @staticmethod
+    def _split_chunks(text: str) -> List[str]:
+        """스트리밍용 조각 (단어 2개씩, 공백 포함)"""
+        words = re.findall(r"\S+\s*", text)
+        return ["".join(words[i:i + 2]) for i in range(0, len(words), 2)] or [text]
+    
+    def render(self, prompt: str, call_type: LLMCallType) -> str:
+        """프롬프트 종류에 맞는 응답 생성 (시드 + 프롬프트로 결정)"""
+        rng = random.Random(f"{self.seed}:{call_type.value}:{prompt}")
+        family = detect_family(prompt, call_type)
+        
+        if family == FAMILY_INNER_THOUGHT:
+            surface, inner = rng.sample(EMOTIONS, 2)
+            return json.dumps({
+                "thought": f"{rng.choice(OPENERS)} {rng.choice(LINES)}",
+                "surface_emotion": surface,
+                "inner_emotion": inner,
+                "emotion_gap": surface != inner,
+                "user_evaluation": rng.choice(EVALUATIONS),
+                "attitude_toward_user": rng.choice(ATTITUDES),
+                "intention": rng.choice(INTENTIONS)
+            }, ensure_ascii=False)
+        
+        if family == FAMILY_SUMMARY:
+            return (
+                f"ai_summary: 유저가 말을 걸자 캐릭터들이 {rng.choice(ACTIONS)} 반응했다. "
+                f"분위기는 {rng.choice(EMOTIONS)}에 가까웠다.\n"
+                f"ai_analysis: 로비에 잠시 정적이 흘렀다. 캐릭터들은 {rng.choice(ACTIONS)} 유저를 바라봤다. "
+                f"누군가는 {rng.choice(LINES)}라고 중얼거렸다. 서로의 눈치를 보는 시선이 오갔다. "
+                f"긴장감은 쉽게 가라앉지 않았다."
+            )
+        
+        if family == FAMILY_PROFILE:
+            return json.dumps({
+                "nickname": None,
+                "ability": None,
+                "traits": rng.sample(TRAITS, rng.randint(0, 2)),
+                "action": None,
+                "facts": [],
+                "likes": [],
+                "dislikes": []
+            }, ensure_ascii=False)
+        
+        if family == FAMILY_CHARACTER:
+            return (
+                "## 기본 정보\n가짜 백엔드가 생성한 캐릭터입니다.\n\n"
+                f"## 성격\n{', '.join(rng.sample(TRAITS, 2))}\n\n"
+                "## 말투\n짧고 단정적인 반말\n\n"
+                f"## 행동 지침\n- {rng.choice(INTENTIONS)}\n\n"
+                f"예시 대사: \"{rng.choice(LINES)}\", \"{rng.choice(LINES)}\""
+            )
+        
+        if family == FAMILY_SUB:
+            return rng.choice(SUB_LINES)
+        
+        return f"*{rng.choice(ACTIONS)}* {rng.choice(OPENERS)} {rng.choice(LINES)} {rng.choice(LINES)}"
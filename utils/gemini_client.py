@@ -2,16 +2,93 @@
 Gemini API 클라이언트
 공통 Gemini API 설정 및 응답 생성 유틸리티
 """
+import asyncio
+import functools
 import os
-import google.generativeai as genai
-from typing import Optional
+import time
+from typing import Optional, AsyncIterator
 from fastapi import HTTPException
+from google.api_core import exceptions as google_exceptions
 
 from utils.config import load_env, get_gemini_api_key
+from utils.llm_backend import create_llm_backend, estimate_tokens, GeminiBackend, TokenUsage
+from utils.llm_scheduler import llm_scheduler, LLMCallType
+from utils.llm_retry import llm_retry
+from utils.circuit_breaker import llm_circuit_breaker, CircuitOpenError
+from utils.token_accounting import token_accountant, TokenBudgetExceededError
+from utils.generation_profiles import GenerationProfile, profile_for_call_type
+from utils.model_router import model_router
+from utils.response_cache import response_cache
+from utils.metrics import metrics, SIZE_BUCKETS
+
+# LLM 호출 지표 (/metrics) - 재시도/헤징/대기 시간을 포함한 호출 단위
+llm_calls = metrics.counter("llm_calls_total", "LLM calls by outcome", ["call_type", "model", "outcome"])
+llm_call_seconds = metrics.histogram("llm_call_duration_seconds", "LLM call latency including queueing and retries", ["call_type", "model"])
+llm_errors = metrics.counter("llm_errors_total", "LLM call errors by class", ["call_type", "error_class"])
+llm_prompt_chars = metrics.histogram("llm_prompt_chars", "Prompt size in characters", ["call_type"], buckets=SIZE_BUCKETS)
+llm_response_chars = metrics.histogram("llm_response_chars", "Response size in characters", ["call_type"], buckets=SIZE_BUCKETS)
+llm_prompt_tokens = metrics.histogram("llm_prompt_tokens", "Prompt size in tokens (API usage, estimated if unavailable)", ["call_type"], buckets=SIZE_BUCKETS)
+llm_response_tokens = metrics.histogram("llm_response_tokens", "Response size in tokens (API usage, estimated if unavailable)", ["call_type"], buckets=SIZE_BUCKETS)
+llm_in_flight = metrics.gauge("llm_in_flight", "LLM calls holding a scheduler slot", ["call_type"])
+llm_queue_depth = metrics.gauge("llm_queue_depth", "LLM calls waiting for a scheduler slot", ["call_type"])
+llm_circuit_open = metrics.gauge("llm_circuit_open", "1 if the LLM circuit breaker is open or half-open")
+
+
+def classify_llm_error(e: BaseException) -> str:
+    """
+    오류 분류 (지표 라벨용)
+    
+    Returns:
+        not_found(404) / forbidden(403) / timeout / rate_limited(429) / server_error(5xx) /
+        circuit_open / budget_exceeded / empty_response / other
+    """
+    if isinstance(e, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(e, TokenBudgetExceededError):
+        return "budget_exceeded"
+    if isinstance(e, ValueError):
+        return "empty_response"
+    if isinstance(e, (asyncio.TimeoutError, google_exceptions.DeadlineExceeded, google_exceptions.GatewayTimeout)):
+        return "timeout"
+    if isinstance(e, google_exceptions.NotFound):
+        return "not_found"
+    if isinstance(e, (google_exceptions.PermissionDenied, google_exceptions.Unauthenticated)):
+        return "forbidden"
+    if isinstance(e, google_exceptions.TooManyRequests):
+        return "rate_limited"
+    if isinstance(e, google_exceptions.ServerError):
+        return "server_error"
+    
+    message = str(e).lower()
+    if "404" in message or "not found" in message:
+        return "not_found"
+    if "403" in message or "permission denied" in message or "suspended" in message:
+        return "forbidden"
+    if "429" in message or "resource exhausted" in message:
+        return "rate_limited"
+    if "timeout" in message or "deadline" in message:
+        return "timeout"
+    return "other"
+
+
+def _collect_llm_metrics():
+    """스케줄러 대기열/실행 수, 서킷 브레이커 상태 갱신"""
+    for call_type, stats in llm_scheduler.get_stats()["call_types"].items():
+        llm_in_flight.set(stats["in_flight"], call_type=call_type)
+        llm_queue_depth.set(stats["queued"], call_type=call_type)
+    llm_circuit_open.set(0 if llm_circuit_breaker.state == "closed" else 1)
+
+
+metrics.on_collect(_collect_llm_metrics)
 
 
 class GeminiClient:
-    """Gemini API 클라이언트 싱글톤"""
+    """
+    Gemini API 클라이언트 싱글톤
+    
+    실제 생성은 LLM_BACKEND로 고른 백엔드가 수행 (gemini: Gemini API, fake: 로컬 가짜 백엔드)
+    스케줄링/재시도/서킷 브레이커/오류 변환은 백엔드와 무관하게 동일하게 적용
+    """
     _instance = None
     _initialized = False
     
@@ -26,17 +103,23 @@ class GeminiClient:
             # 최적화 전: chat_multi.py에서 직접 load_dotenv 호출
             load_env()
             
+            self.backend = create_llm_backend()
+            
             # API 키 설정 (최적화 전 방식과 동일)
             # 최적화 전: GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
             api_key = get_gemini_api_key()
             
-            if api_key:
+            if not isinstance(self.backend, GeminiBackend):
+                # 로컬 백엔드는 API 키 불필요
+                self.api_key = api_key
+                self.configured = self.backend.configured
+            elif api_key:
                 # API 키 일부만 로그에 표시 (보안)
                 masked_key = f"{api_key[:10]}...{api_key[-5:]}" if len(api_key) > 15 else "***"
                 print(f"✅ Gemini API 키 로드됨: {masked_key} (길이: {len(api_key)})")
                 
                 # 최적화 전 방식과 동일: genai.configure(api_key=GEMINI_API_KEY)
-                genai.configure(api_key=api_key)
+                self.backend.configure(api_key)
                 self.api_key = api_key
                 self.configured = True
             else:
@@ -52,27 +135,39 @@ class GeminiClient:
         """
         load_env()
         new_api_key = get_gemini_api_key()
-        if new_api_key:
+        if new_api_key and isinstance(self.backend, GeminiBackend):
             if new_api_key != self.api_key:
                 masked_key = f"{new_api_key[:10]}...{new_api_key[-5:]}" if len(new_api_key) > 15 else "***"
                 print(f"🔄 Gemini API 키 재로드됨: {masked_key} (길이: {len(new_api_key)})")
-                genai.configure(api_key=new_api_key)
+                self.backend.configure(new_api_key)
                 self.api_key = new_api_key
                 self.configured = True
                 return True
         return False
     
-    def generate_response(
+    async def generate_response_async(
         self,
         prompt: str,
-        model_name: str = "gemini-2.0-flash"
+        model_name: Optional[str] = None,
+        call_type: LLMCallType = LLMCallType.MAIN,
+        generation: Optional[GenerationProfile] = None
     ) -> str:
         """
-        Gemini API로 응답 생성
+        Gemini API로 응답 생성 (비동기)
+        
+        이벤트 루프를 막지 않으며, 호출한 태스크가 취소되면 요청도 함께 취소됨
+        호출은 llm_scheduler를 거쳐 호출 종류의 우선순위에 따라 시작됨
+        일시적 오류(429/5xx)는 llm_retry 정책에 따라 재시도/헤징 후에만 실패로 처리
+        모델이 404/한도 초과로 실패하면 model_router의 다음 등급 모델로 다시 호출
+        서킷 브레이커가 열려 있으면 호출 없이 즉시 503
+        응답 캐시를 사용하는 호출 종류는 같은 호출의 저장된 응답이 있으면 호출 없이 반환
+        (다음 등급 모델로 대체된 응답은 첫 후보 모델의 키로 저장하지 않음)
         
         Args:
             prompt: 프롬프트
-            model_name: 모델 이름
+            model_name: 모델 이름 (없으면 model_router가 호출 종류의 등급 모델 선택)
+            call_type: 호출 종류 (스케줄링 우선순위, 모델 등급)
+            generation: 생성 설정 프로필 (없으면 호출 종류의 기본 프로필)
         
         Returns:
             생성된 응답 텍스트
@@ -86,71 +181,227 @@ class GeminiClient:
                 detail="GEMINI_API_KEY가 설정되지 않았습니다. .env 파일에 GEMINI_API_KEY=your_api_key 형식으로 추가해주세요."
             )
         
+        started = time.perf_counter()
+        candidates = model_router.candidates(call_type, model_name)
+        model_name = candidates[0]
+        generation = generation or profile_for_call_type(call_type)
+        cache_key = response_cache.key_for(call_type, model_name, generation, prompt)
+        if cache_key:
+            cached = await response_cache.get_async(cache_key)
+            if cached is not None:
+                return cached
         try:
-            # 모델 이름 정규화
-            # Google Generative AI SDK는 "models/" 접두사가 있는 전체 경로를 받습니다
-            if not model_name.startswith("models/"):
-                model_name = f"models/{model_name}"
+            generation_config = generation.to_generation_config()
             
-            # 안정적인 모델로 변경 (실험 버전 제외)
-            if "exp" in model_name.lower() or "preview" in model_name.lower():
-                model_name = "models/gemini-2.0-flash"
-                print(f"⚠️ 실험 버전 모델 감지, 안정 버전으로 변경: {model_name}")
+            async def attempt(model_name: str):
+                # 시도마다 슬롯을 새로 받아 백오프 대기 중에는 다른 호출이 슬롯을 사용
+                usage = TokenUsage()
+                async with llm_scheduler.slot(call_type):
+                    response_text = await self.backend.generate(
+                        prompt, model_name, call_type, generation_config=generation_config, usage=usage
+                    )
+                # 헤징으로 함께 끝난 요청도 과금되므로 시도 단위로 집계
+                self._record_usage(call_type, model_name, prompt, response_text, usage)
+                return response_text, usage
             
-            # 모델명 그대로 사용 (접두사 포함)
-            model = genai.GenerativeModel(model_name)
-            response = model.generate_content(prompt)
-            character_response = response.text.strip()
+            async with llm_circuit_breaker.guard():
+                for index, model_name in enumerate(candidates):
+                    try:
+                        response_text, usage = await llm_retry.call(
+                            functools.partial(attempt, model_name), call_type, hedge=True
+                        )
+                        break
+                    except Exception as e:
+                        if index + 1 >= len(candidates) or not model_router.fall_back(call_type, model_name, candidates[index + 1], e):
+                            raise
+            character_response = response_text.strip()
             
             if not character_response:
                 raise ValueError("캐릭터 응답이 비어있습니다.")
             
+            self._record_call(call_type, model_name, prompt, started, response=character_response, usage=usage)
+            # 다른 모델로 대체된 응답은 저장하지 않음 (키는 첫 후보 모델 기준)
+            if cache_key and model_name == candidates[0]:
+                await response_cache.put_async(cache_key, character_response)
             return character_response
         
         except Exception as e:
-            error_detail = str(e)
-            
-            # 모델을 찾을 수 없는 오류 처리
-            if "404" in error_detail or "not found" in error_detail.lower() or "not supported" in error_detail.lower():
-                available_models = [
-                    "gemini-2.0-flash",
-                    "gemini-2.5-flash",
-                    "gemini-flash-latest",
-                    "gemini-pro-latest"
-                ]
-                # 실제 사용한 모델명 표시 (접두사 제거된 버전)
-                actual_model = model_name if not model_name.startswith("models/") else model_name[7:]
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"모델 '{actual_model}'을 찾을 수 없거나 지원되지 않습니다. 사용 가능한 모델: {', '.join(available_models)}"
-                )
-            
-            # API 키 관련 오류 처리
-            if "API_KEY" in error_detail or "api key" in error_detail.lower():
-                raise HTTPException(
-                    status_code=500,
-                    detail="Gemini API 키가 유효하지 않습니다. .env 파일의 GEMINI_API_KEY를 확인해주세요."
-                )
-            
-            # API 키 정지 오류 처리
-            if "suspended" in error_detail.lower() or "CONSUMER_SUSPENDED" in error_detail:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Gemini API 키가 정지되었습니다. Google Cloud Console에서 API 키 상태를 확인하거나 새로운 API 키를 발급받아 .env 파일에 설정해주세요."
-                )
-            
-            # 권한 거부 오류 처리
-            if "permission denied" in error_detail.lower() or "403" in error_detail:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Gemini API 접근이 거부되었습니다. API 키가 유효한지, API가 활성화되어 있는지 확인해주세요."
-                )
-            
-            # 기타 오류
+            self._record_call(call_type, model_name, prompt, started, error=e)
+            self._raise_api_error(e, model_name)
+    
+    async def stream_response(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        call_type: LLMCallType = LLMCallType.MAIN,
+        generation: Optional[GenerationProfile] = None
+    ) -> AsyncIterator[str]:
+        """
+        Gemini API로 응답을 스트리밍 생성 (토큰 델타 단위)
+        
+        스트림이 끝날 때까지 llm_scheduler 슬롯을 점유함
+        첫 조각을 받기 전의 일시적 오류만 재시도 (이미 보낸 조각이 있으면 중복되므로 재시도하지 않음)
+        첫 조각을 받기 전에 모델이 404/한도 초과로 실패하면 model_router의 다음 등급 모델로 다시 호출
+        서킷 브레이커가 열려 있으면 호출 없이 즉시 503
+        응답 캐시를 사용하는 호출 종류는 같은 호출의 저장된 응답이 있으면 호출 없이 반환
+        (다음 등급 모델로 대체된 응답은 첫 후보 모델의 키로 저장하지 않음)
+        
+        Args:
+            prompt: 프롬프트
+            model_name: 모델 이름 (없으면 model_router가 호출 종류의 등급 모델 선택)
+            call_type: 호출 종류 (스케줄링 우선순위, 모델 등급)
+            generation: 생성 설정 프로필 (없으면 호출 종류의 기본 프로필)
+        
+        Yields:
+            생성된 텍스트 조각 (델타)
+        
+        Raises:
+            HTTPException: API 키가 없거나 생성 실패 시
+        """
+        if not self.configured:
+            raise HTTPException(
+                status_code=500,
+                detail="GEMINI_API_KEY가 설정되지 않았습니다. .env 파일에 GEMINI_API_KEY=your_api_key 형식으로 추가해주세요."
+            )
+        
+        started = time.perf_counter()
+        response_parts = []
+        usage = TokenUsage()
+        candidates = model_router.candidates(call_type, model_name)
+        index = 0
+        model_name = candidates[index]
+        generation = generation or profile_for_call_type(call_type)
+        cache_key = response_cache.key_for(call_type, model_name, generation, prompt)
+        if cache_key:
+            cached = await response_cache.get_async(cache_key)
+            if cached is not None:
+                # 저장된 응답은 한 조각으로 전달
+                yield cached
+                return
+        try:
+            generation_config = generation.to_generation_config()
+            async with llm_circuit_breaker.guard():
+                llm_retry.record_call()
+                attempt = 0
+                while True:
+                    yielded = False
+                    try:
+                        async with llm_scheduler.slot(call_type):
+                            stream = self.backend.stream(
+                                prompt, model_name, call_type, generation_config=generation_config, usage=usage
+                            )
+                            try:
+                                async for delta in stream:
+                                    yielded = True
+                                    response_parts.append(delta)
+                                    yield delta
+                            finally:
+                                await stream.aclose()
+                        response_text = "".join(response_parts)
+                        self._record_usage(call_type, model_name, prompt, response_text, usage)
+                        self._record_call(call_type, model_name, prompt, started, response=response_text, usage=usage)
+                        if cache_key and model_name == candidates[0]:
+                            await response_cache.put_async(cache_key, response_text.strip())
+                        return
+                    except Exception as e:
+                        if yielded:
+                            raise
+                        if not llm_retry.should_retry(e, attempt, call_type):
+                            if index + 1 >= len(candidates) or not model_router.fall_back(call_type, model_name, candidates[index + 1], e):
+                                raise
+                            # 다음 등급 모델은 재시도 횟수를 새로 셈
+                            index += 1
+                            model_name = candidates[index]
+                            attempt = 0
+                            continue
+                    await asyncio.sleep(llm_retry.next_delay(attempt))
+                    attempt += 1
+        
+        except Exception as e:
+            self._record_call(call_type, model_name, prompt, started, error=e)
+            self._raise_api_error(e, model_name)
+    
+    def _record_call(
+        self,
+        call_type: LLMCallType,
+        model_name: str,
+        prompt: str,
+        started: float,
+        response: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        usage: Optional[TokenUsage] = None
+    ):
+        """호출 1건의 지표 기록 (결과, 지연 시간, 프롬프트/응답 크기, 오류 분류)"""
+        labels = {
+            "call_type": call_type.value,
+            "model": model_name[7:] if model_name.startswith("models/") else model_name
+        }
+        llm_calls.inc(outcome="error" if error is not None else "success", **labels)
+        llm_call_seconds.observe(time.perf_counter() - started, **labels)
+        llm_prompt_chars.observe(len(prompt), call_type=call_type.value)
+        if usage is not None and usage.prompt_tokens is not None:
+            llm_prompt_tokens.observe(usage.prompt_tokens, call_type=call_type.value)
+        else:
+            llm_prompt_tokens.observe(estimate_tokens(prompt), call_type=call_type.value)
+        if response is not None:
+            llm_response_chars.observe(len(response), call_type=call_type.value)
+            output_tokens = usage.output_tokens if usage is not None and usage.output_tokens is not None else estimate_tokens(response)
+            llm_response_tokens.observe(output_tokens, call_type=call_type.value)
+        if error is not None:
+            llm_errors.inc(call_type=call_type.value, error_class=classify_llm_error(error))
+    
+    def _record_usage(self, call_type: LLMCallType, model_name: str, prompt: str, response: str, usage: TokenUsage):
+        """응답을 받은 요청 1회의 토큰 사용량 집계 (API가 알려주지 않은 값은 추정)"""
+        token_accountant.record(call_type.value, model_name, usage.fill_estimates(prompt, response))
+    
+    def _raise_api_error(self, e: Exception, model_name: str):
+        """API 오류를 HTTPException으로 변환하여 발생"""
+        if isinstance(e, HTTPException):
+            raise e
+        
+        error_detail = str(e)
+        
+        # 모델을 찾을 수 없는 오류 처리
+        if "404" in error_detail or "not found" in error_detail.lower() or "not supported" in error_detail.lower():
+            available_models = [
+                "gemini-2.0-flash",
+                "gemini-2.5-flash",
+                "gemini-flash-latest",
+                "gemini-pro-latest"
+            ]
+            # 실제 사용한 모델명 표시 (접두사 제거된 버전)
+            actual_model = model_name if not model_name.startswith("models/") else model_name[7:]
+            raise HTTPException(
+                status_code=404,
+                detail=f"모델 '{actual_model}'을 찾을 수 없거나 지원되지 않습니다. 사용 가능한 모델: {', '.join(available_models)}"
+            )
+        
+        # API 키 관련 오류 처리
+        if "API_KEY" in error_detail or "api key" in error_detail.lower():
             raise HTTPException(
                 status_code=500,
-                detail=f"캐릭터 응답 생성 오류: {error_detail[:200]}"  # 오류 메시지 길이 제한
+                detail="Gemini API 키가 유효하지 않습니다. .env 파일의 GEMINI_API_KEY를 확인해주세요."
             )
+        
+        # API 키 정지 오류 처리
+        if "suspended" in error_detail.lower() or "CONSUMER_SUSPENDED" in error_detail:
+            raise HTTPException(
+                status_code=403,
+                detail="Gemini API 키가 정지되었습니다. Google Cloud Console에서 API 키 상태를 확인하거나 새로운 API 키를 발급받아 .env 파일에 설정해주세요."
+            )
+        
+        # 권한 거부 오류 처리
+        if "permission denied" in error_detail.lower() or "403" in error_detail:
+            raise HTTPException(
+                status_code=403,
+                detail="Gemini API 접근이 거부되었습니다. API 키가 유효한지, API가 활성화되어 있는지 확인해주세요."
+            )
+        
+        # 기타 오류
+        raise HTTPException(
+            status_code=500,
+            detail=f"캐릭터 응답 생성 오류: {error_detail[:200]}"  # 오류 메시지 길이 제한
+        )
 
 
 # 싱글톤 인스턴스
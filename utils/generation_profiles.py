@@ -0,0 +1,221 @@
+"""
+생성 설정 프로필
+호출 종류별 생성 설정(최대 출력 토큰, temperature, top_p, 중단 시퀀스, JSON 응답)을 이름 붙은 프로필로 관리
+작품/캐릭터의 generation_overrides로 프로필별 값을 덮어쓸 수 있음
+"""
+from typing import Any, Dict, List, Optional
+
+from utils.llm_scheduler import LLMCallType
+from utils.logger import get_logger
+from utils.config import get_generation_profile_overrides
+
+logger = get_logger(__name__)
+
+# 프로필 이름
+PROFILE_DIALOGUE = "dialogue"                      # 메인 응답/티키타카/끼어들기 대사
+PROFILE_SUB_REACTION = "sub_reaction"              # 서브 리액션 ("크큭...", "*코웃음*")
+PROFILE_INNER_THOUGHT = "inner_thought"            # 속마음 JSON
+PROFILE_SUMMARY = "summary"                        # 스토리 요약 (ai_summary/ai_analysis)
+PROFILE_EXTRACTION = "profile_extraction"          # 유저 프로필 추출 JSON
+PROFILE_CHARACTER_GENERATE = "character_generate"  # 창작자 캐릭터 프롬프트 생성
+
+# 덮어쓰기 값 범위
+MAX_OUTPUT_TOKENS_LIMIT = 65536
+TEMPERATURE_RANGE = (0.0, 2.0)
+TOP_P_RANGE = (0.0, 1.0)
+MAX_STOP_SEQUENCES = 5
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_override_value(key: str, value: Any) -> Optional[str]:
+    """
+    덮어쓰기 값 1개 검사
+    
+    Returns:
+        잘못된 값이면 이유, 올바르면 None (None 값은 모델 기본값 사용으로 허용)
+    """
+    if value is None:
+        return None
+    if key == "max_output_tokens":
+        if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= MAX_OUTPUT_TOKENS_LIMIT:
+            return f"1~{MAX_OUTPUT_TOKENS_LIMIT} 사이의 정수여야 합니다"
+    elif key == "temperature":
+        if not _is_number(value) or not TEMPERATURE_RANGE[0] <= value <= TEMPERATURE_RANGE[1]:
+            return f"{TEMPERATURE_RANGE[0]}~{TEMPERATURE_RANGE[1]} 사이의 숫자여야 합니다"
+    elif key == "top_p":
+        if not _is_number(value) or not TOP_P_RANGE[0] <= value <= TOP_P_RANGE[1]:
+            return f"{TOP_P_RANGE[0]}~{TOP_P_RANGE[1]} 사이의 숫자여야 합니다"
+    elif key == "stop_sequences":
+        if (
+            not isinstance(value, list)
+            or len(value) > MAX_STOP_SEQUENCES
+            or not all(isinstance(item, str) and item for item in value)
+        ):
+            return f"빈 문자열이 아닌 문자열 목록(최대 {MAX_STOP_SEQUENCES}개)이어야 합니다"
+    elif key == "json_mode":
+        if not isinstance(value, bool):
+            return "true/false여야 합니다"
+    else:
+        return "알 수 없는 설정입니다"
+    return None
+
+
+class GenerationProfile:
+    """
+    생성 설정 프로필
+    
+    None인 값은 모델 기본값 사용
+    response_schema는 호출하는 쪽이 응답 형식에 맞춰 붙이는 값 (덮어쓰기 대상 아님)
+    """
+    
+    FIELDS = ("max_output_tokens", "temperature", "top_p", "stop_sequences", "json_mode")
+    
+    def __init__(
+        self,
+        name: str,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        stop_sequences: Optional[List[str]] = None,
+        json_mode: bool = False,
+        response_schema: Optional[Dict[str, Any]] = None
+    ):
+        self.name = name
+        self.max_output_tokens = max_output_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.stop_sequences = stop_sequences
+        self.json_mode = json_mode
+        self.response_schema = response_schema
+    
+    def with_overrides(self, overrides: Optional[Dict[str, Any]]) -> "GenerationProfile":
+        """일부 값을 바꾼 새 프로필 (알 수 없는 키나 범위를 벗어난 값은 무시)"""
+        if not overrides:
+            return self
+        values = self.to_dict()
+        for key, value in overrides.items():
+            error = check_override_value(key, value)
+            if error:
+                logger.warning("생성 설정 프로필 '%s': %s 무시 (%s)", self.name, key, error)
+                continue
+            values[key] = value
+        return GenerationProfile(self.name, response_schema=self.response_schema, **values)
+    
+    def with_response_schema(self, schema: Optional[Dict[str, Any]]) -> "GenerationProfile":
+        """JSON 응답 스키마를 붙인 새 프로필 (json_mode일 때만 요청에 포함)"""
+        return GenerationProfile(self.name, response_schema=schema, **self.to_dict())
+    
+    def to_generation_config(self) -> Dict[str, Any]:
+        """Gemini generation_config 딕셔너리 (지정한 값만)"""
+        config: Dict[str, Any] = {}
+        if self.max_output_tokens is not None:
+            config["max_output_tokens"] = self.max_output_tokens
+        if self.temperature is not None:
+            config["temperature"] = self.temperature
+        if self.top_p is not None:
+            config["top_p"] = self.top_p
+        if self.stop_sequences:
+            config["stop_sequences"] = list(self.stop_sequences)
+        if self.json_mode:
+            config["response_mime_type"] = "application/json"
+            if self.response_schema:
+                config["response_schema"] = self.response_schema
+        return config
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+# 기본 프로필 (출력 토큰 상한은 프롬프트가 요구하는 길이에 여유를 둔 값)
+GENERATION_PROFILES: Dict[str, GenerationProfile] = {
+    PROFILE_DIALOGUE: GenerationProfile(
+        PROFILE_DIALOGUE, max_output_tokens=512, temperature=0.9, top_p=0.95
+    ),
+    # 1~2문장 짧은 반응 - 길어지지 않도록 상한을 작게, 빈 줄이 나오면 중단
+    PROFILE_SUB_REACTION: GenerationProfile(
+        PROFILE_SUB_REACTION, max_output_tokens=64, temperature=1.0, top_p=0.95, stop_sequences=["\n\n"]
+    ),
+    PROFILE_INNER_THOUGHT: GenerationProfile(
+        PROFILE_INNER_THOUGHT, max_output_tokens=320, temperature=0.8, json_mode=True
+    ),
+    PROFILE_SUMMARY: GenerationProfile(
+        PROFILE_SUMMARY, max_output_tokens=1024, temperature=0.7
+    ),
+    PROFILE_EXTRACTION: GenerationProfile(
+        PROFILE_EXTRACTION, max_output_tokens=320, temperature=0.2, json_mode=True
+    ),
+    # 최대 16,000자 캐릭터 프롬프트
+    PROFILE_CHARACTER_GENERATE: GenerationProfile(
+        PROFILE_CHARACTER_GENERATE, max_output_tokens=8192, temperature=0.9
+    ),
+}
+
+# 호출 종류별 기본 프로필 (호출하는 쪽에서 프로필을 넘기지 않았을 때)
+CALL_TYPE_PROFILES: Dict[LLMCallType, str] = {
+    LLMCallType.MAIN: PROFILE_DIALOGUE,
+    LLMCallType.TIKITAKA: PROFILE_DIALOGUE,
+    LLMCallType.INTERVENTION: PROFILE_DIALOGUE,
+    LLMCallType.SUB: PROFILE_SUB_REACTION,
+    LLMCallType.INNER_THOUGHT: PROFILE_INNER_THOUGHT,
+    LLMCallType.SUMMARY: PROFILE_SUMMARY,
+    LLMCallType.PROFILE: PROFILE_EXTRACTION,
+    LLMCallType.CHARACTER_GENERATE: PROFILE_CHARACTER_GENERATE,
+}
+
+# GENERATION_PROFILE_OVERRIDES 적용
+for _name, _overrides in get_generation_profile_overrides().items():
+    if _name in GENERATION_PROFILES:
+        GENERATION_PROFILES[_name] = GENERATION_PROFILES[_name].with_overrides(_overrides)
+    else:
+        logger.warning("GENERATION_PROFILE_OVERRIDES: 알 수 없는 프로필 무시 (%s)", _name)
+
+
+def get_generation_profile(
+    name: str,
+    character=None,
+    work_overrides: Optional[Dict[str, Dict[str, Any]]] = None
+) -> GenerationProfile:
+    """
+    생성 설정 프로필 조회 (작품 → 캐릭터 순으로 덮어씀)
+    
+    Args:
+        name: 프로필 이름 (GENERATION_PROFILES의 키)
+        character: 캐릭터 (generation_overrides가 있으면 적용)
+        work_overrides: 작품의 generation_overrides
+    """
+    profile = GENERATION_PROFILES[name]
+    if work_overrides:
+        profile = profile.with_overrides(work_overrides.get(name))
+    character_overrides = getattr(character, "generation_overrides", None)
+    if character_overrides:
+        profile = profile.with_overrides(character_overrides.get(name))
+    return profile
+
+
+def validate_generation_overrides(overrides: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    작품/캐릭터 generation_overrides 검사 (요청 모델 검증용)
+    
+    Raises:
+        ValueError: 알 수 없는 프로필/설정이거나 값의 형식/범위가 잘못된 경우
+    """
+    if not overrides:
+        return overrides
+    for name, values in overrides.items():
+        if name not in GENERATION_PROFILES:
+            raise ValueError(f"알 수 없는 생성 설정 프로필: {name}")
+        if not isinstance(values, dict):
+            raise ValueError(f"{name}: 설정은 객체여야 합니다")
+        for key, value in values.items():
+            error = check_override_value(key, value)
+            if error:
+                raise ValueError(f"{name}.{key}: {error}")
+    return overrides
+
+
+def profile_for_call_type(call_type: LLMCallType) -> GenerationProfile:
+    """호출 종류의 기본 프로필"""
+    return GENERATION_PROFILES[CALL_TYPE_PROFILES[call_type]]
@@ -0,0 +1,171 @@
+"""
+LLM 백엔드 인터페이스
+GeminiClient가 실제 생성을 맡기는 백엔드 (Gemini API / 로컬 가짜 백엔드)
+"""
+import google.generativeai as genai
+from typing import Any, AsyncIterator, Dict, Optional
+
+from utils.config import get_llm_backend
+from utils.llm_scheduler import LLMCallType
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (UTF-8 4바이트당 약 1토큰 - 영문 약 4자, 한글 약 1.3자당 1토큰)
+    
+    API가 토큰 수를 알려주지 않을 때 크기 지표용으로만 사용
+    """
+    if not text:
+        return 0
+    return max(1, round(len(text.encode("utf-8")) / 4))
+
+
+class TokenUsage:
+    """
+    호출 1회의 토큰 사용량 (백엔드가 채움)
+    
+    API 응답에 사용량이 있으면 그 값을, 없으면 estimate_tokens 추정값을 사용 (estimated=True)
+    """
+    
+    __slots__ = ("prompt_tokens", "output_tokens", "estimated")
+    
+    def __init__(self):
+        self.prompt_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self.estimated = False
+    
+    def set_from_metadata(self, metadata):
+        """Gemini 응답의 usage_metadata에서 토큰 수 기록 (없으면 무시)"""
+        if metadata is None:
+            return
+        prompt_tokens = getattr(metadata, "prompt_token_count", None)
+        output_tokens = getattr(metadata, "candidates_token_count", None)
+        if prompt_tokens:
+            self.prompt_tokens = prompt_tokens
+        if output_tokens:
+            self.output_tokens = output_tokens
+    
+    def fill_estimates(self, prompt: str, response: str) -> "TokenUsage":
+        """백엔드가 채우지 못한 값을 추정값으로 채움"""
+        if self.prompt_tokens is None:
+            self.prompt_tokens = estimate_tokens(prompt)
+            self.estimated = True
+        if self.output_tokens is None:
+            self.output_tokens = estimate_tokens(response)
+            self.estimated = True
+        return self
+    
+    @property
+    def total_tokens(self) -> int:
+        return (self.prompt_tokens or 0) + (self.output_tokens or 0)
+
+
+class LLMBackend:
+    """
+    LLM 백엔드 기본 클래스
+    
+    스케줄링/재시도/서킷 브레이커/오류 변환은 GeminiClient가 담당하고,
+    백엔드는 요청 1회만 수행 (실패 시 원래 예외를 그대로 발생)
+    usage를 받으면 알 수 있는 토큰 사용량을 기록 (비워 두면 GeminiClient가 추정)
+    generation_config: 생성 설정 프로필 값 (max_output_tokens, temperature, top_p, stop_sequences, response_mime_type)
+    """
+    
+    name = "base"
+    
+    @property
+    def configured(self) -> bool:
+        """호출 가능한 상태인지"""
+        return False
+    
+    async def generate(
+        self,
+        prompt: str,
+        model_name: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> str:
+        """응답 생성 (비동기)"""
+        raise NotImplementedError
+    
+    def stream(
+        self,
+        prompt: str,
+        model_name: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        """응답 스트리밍 (텍스트 델타를 내보내는 async generator)"""
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Generative AI SDK 백엔드"""
+    
+    name = "gemini"
+    
+    def __init__(self):
+        self.api_key = None
+    
+    @property
+    def configured(self) -> bool:
+        return self.api_key is not None
+    
+    def configure(self, api_key: str):
+        """API 키 설정"""
+        genai.configure(api_key=api_key)
+        self.api_key = api_key
+    
+    async def generate(
+        self,
+        prompt: str,
+        model_name: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> str:
+        model = genai.GenerativeModel(model_name)
+        response = await model.generate_content_async(prompt, generation_config=generation_config)
+        if usage is not None:
+            usage.set_from_metadata(getattr(response, "usage_metadata", None))
+        return response.text
+    
+    async def stream(
+        self,
+        prompt: str,
+        model_name: str,
+        call_type: LLMCallType,
+        generation_config: Optional[Dict[str, Any]] = None,
+        usage: Optional[TokenUsage] = None
+    ) -> AsyncIterator[str]:
+        model = genai.GenerativeModel(model_name)
+        response = await model.generate_content_async(prompt, generation_config=generation_config, stream=True)
+        
+        async for chunk in response:
+            # 사용량은 마지막 청크에 누적값으로 들어옴
+            if usage is not None:
+                usage.set_from_metadata(getattr(chunk, "usage_metadata", None))
+            try:
+                delta = chunk.text
+            except ValueError:
+                # 텍스트가 없는 청크 (안전 필터 등)는 건너뜀
+                continue
+            if delta:
+                yield delta
+
+
+def create_llm_backend() -> LLMBackend:
+    """
+    LLM_BACKEND 환경 변수에 맞는 백엔드 생성
+    
+    Returns:
+        GeminiBackend (기본) 또는 FakeLLMBackend (LLM_BACKEND=fake)
+    """
+    backend = get_llm_backend()
+    if backend == "fake":
+        from utils.fake_llm_backend import FakeLLMBackend
+        return FakeLLMBackend()
+    if backend != "gemini":
+        print(f"⚠️ 알 수 없는 LLM_BACKEND: {backend} (gemini 사용)")
+    return GeminiBackend()
@@ -0,0 +1,265 @@
+"""
+LLM 호출 재시도/헤징 정책
+일시적 오류(429/5xx/타임아웃)는 지터가 적용된 지수 백오프로 재시도하고,
+응답이 느린 호출은 같은 요청을 한 번 더 보내 먼저 끝난 응답을 사용
+"""
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+from google.api_core import exceptions as google_exceptions
+
+from utils.llm_scheduler import llm_scheduler, LLMCallType
+from utils.logger import get_logger
+from utils.config import (
+    get_llm_retry_max_attempts,
+    get_llm_retry_base_delay,
+    get_llm_retry_max_delay,
+    get_llm_retry_budget_ratio,
+    is_llm_hedging_enabled,
+    get_llm_hedge_percentile,
+    get_llm_hedge_budget_ratio
+)
+
+T = TypeVar("T")
+
+logger = get_logger(__name__)
+
+# 재시도 대상 Google API 오류 (429 한도 초과, 5xx, 서버 측 타임아웃)
+RETRIABLE_EXCEPTIONS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.BadGateway,
+    ConnectionError,
+    asyncio.TimeoutError,
+)
+
+# 예외 타입으로 구분되지 않을 때 메시지로 판단
+RETRIABLE_MESSAGE_MARKERS = ("429", "500", "502", "503", "504", "unavailable", "resource exhausted", "deadline exceeded")
+
+# 예산 버킷 최대 적립량 (조용한 기간에 쌓인 예산으로 한꺼번에 재시도가 몰리지 않도록)
+BUDGET_MAX_TOKENS = 10.0
+
+# 헤징 기준 분위수를 계산할 최소 표본 수 / 최근 구간 (초)
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW_SECONDS = 300
+
+
+def is_retriable_error(e: BaseException) -> bool:
+    """
+    재시도해도 되는 일시적 오류인지 판단
+    
+    404(모델 없음), API 키/권한 오류, 빈 응답, 이미 변환된 HTTPException은 재시도하지 않음
+    """
+    if isinstance(e, (HTTPException, ValueError)):
+        return False
+    if isinstance(e, RETRIABLE_EXCEPTIONS):
+        return True
+    if isinstance(e, google_exceptions.GoogleAPICallError):
+        return False
+    message = str(e).lower()
+    return any(marker in message for marker in RETRIABLE_MESSAGE_MARKERS)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    n번째 재시도 전 대기 시간 (full jitter: 0 ~ min(max_delay, base * 2^n) 사이 균등 분포)
+    
+    Args:
+        attempt: 재시도 순번 (0부터)
+        base_delay: 기본 대기 시간 (초)
+        max_delay: 대기 시간 상한 (초)
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class RetryBudget:
+    """
+    재시도/헤징 예산 (토큰 버킷)
+    
+    호출마다 ratio만큼 적립하고 재시도/헤징 1회에 1을 사용
+    → 장애로 모든 호출이 실패해도 추가 요청은 전체 호출의 ratio 비율을 넘지 않음
+    """
+    
+    def __init__(self, ratio: float, max_tokens: float = BUDGET_MAX_TOKENS):
+        self.ratio = max(0.0, ratio)
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens if self.ratio > 0 else 0.0
+    
+    def deposit(self):
+        """호출 1건만큼 적립"""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+    
+    def try_spend(self) -> bool:
+        """예산이 있으면 1 사용"""
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class LLMRetryPolicy:
+    """
+    LLM 호출 재시도/헤징 정책 (싱글톤 패턴)
+    
+    - 재시도: 일시적 오류만 LLM_RETRY_MAX_ATTEMPTS회까지, 지터 적용 지수 백오프
+      (LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY)
+    - 헤징 (LLM_HEDGE_ENABLED): 호출 종류별 최근 지연 분위수(LLM_HEDGE_PERCENTILE)가 지나도
+      응답이 없으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답 사용, 나머지는 취소
+    - 재시도와 헤징은 각각 예산(LLM_RETRY_BUDGET_RATIO, LLM_HEDGE_BUDGET_RATIO) 안에서만 수행
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMRetryPolicy, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.max_attempts = max(1, get_llm_retry_max_attempts())
+        self.base_delay = max(0.0, get_llm_retry_base_delay())
+        self.max_delay = max(self.base_delay, get_llm_retry_max_delay())
+        self.hedging_enabled = is_llm_hedging_enabled()
+        self.hedge_percentile = get_llm_hedge_percentile()
+        
+        self.retry_budget = RetryBudget(get_llm_retry_budget_ratio())
+        self.hedge_budget = RetryBudget(get_llm_hedge_budget_ratio())
+        
+        self._stats: Dict[str, int] = {
+            "calls": 0,
+            "retries": 0,
+            "retry_budget_exhausted": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "hedge_budget_exhausted": 0,
+        }
+        self._initialized = True
+    
+    async def call(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        call_type: LLMCallType,
+        hedge: bool = False
+    ) -> T:
+        """
+        재시도/헤징을 적용하여 LLM 호출
+        
+        Args:
+            factory: 호출 1회를 수행하는 코루틴 함수 (시도마다 새로 호출, 스케줄러 슬롯 포함)
+            call_type: 호출 종류 (헤징 기준 지연 시간 계산)
+            hedge: 헤징 허용 여부 (스트리밍처럼 중복 요청이 의미 없는 호출은 False)
+        
+        Returns:
+            factory 결과
+        
+        Raises:
+            마지막 시도의 예외 (재시도 대상이 아니거나 횟수/예산 소진 시)
+        """
+        self.record_call()
+        attempt = 0
+        while True:
+            try:
+                if hedge and self.hedging_enabled:
+                    return await self._call_with_hedge(factory, call_type)
+                return await factory()
+            except Exception as e:
+                if not self.should_retry(e, attempt, call_type):
+                    raise
+                await asyncio.sleep(self.next_delay(attempt))
+                attempt += 1
+    
+    def record_call(self):
+        """호출 1건 기록 (예산 적립)"""
+        self._stats["calls"] += 1
+        self.retry_budget.deposit()
+        self.hedge_budget.deposit()
+    
+    def should_retry(self, e: BaseException, attempt: int, call_type: LLMCallType) -> bool:
+        """
+        실패한 시도를 재시도할지 결정 (재시도하면 예산 1 사용)
+        
+        Args:
+            e: 시도에서 발생한 예외
+            attempt: 실패한 재시도 순번 (첫 시도는 0)
+            call_type: 호출 종류 (로그용)
+        """
+        if not is_retriable_error(e) or attempt + 1 >= self.max_attempts:
+            return False
+        if not self.retry_budget.try_spend():
+            self._stats["retry_budget_exhausted"] += 1
+            logger.warning("%s: 재시도 예산 소진 - 재시도하지 않음 (%s)", call_type.value, type(e).__name__)
+            return False
+        self._stats["retries"] += 1
+        logger.info("%s: 일시적 오류로 재시도 %d/%d (%s: %s)", call_type.value, attempt + 1, self.max_attempts - 1, type(e).__name__, str(e)[:100])
+        return True
+    
+    def next_delay(self, attempt: int) -> float:
+        """재시도 전 대기 시간 (초)"""
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+    
+    async def _call_with_hedge(
+        self,
+        factory: Callable[[], Awaitable[T]],
+        call_type: LLMCallType
+    ) -> T:
+        """첫 요청이 지연 분위수를 넘기면 헤징 요청을 보내 먼저 성공한 결과 사용"""
+        threshold = llm_scheduler.latency_percentile(
+            self.hedge_percentile,
+            call_type,
+            window_seconds=HEDGE_WINDOW_SECONDS,
+            min_samples=HEDGE_MIN_SAMPLES
+        )
+        if threshold is None:
+            # 표본이 부족하면 기준을 정할 수 없으므로 헤징하지 않음
+            return await factory()
+        
+        primary = asyncio.ensure_future(factory())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if not done:
+                if self.hedge_budget.try_spend():
+                    self._stats["hedges"] += 1
+                    tasks.add(asyncio.ensure_future(factory()))
+                else:
+                    self._stats["hedge_budget_exhausted"] += 1
+            
+            # 먼저 성공한 결과 사용 (하나가 실패하면 나머지를 계속 기다림)
+            last_error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # 취소된 요청이 스케줄러 슬롯을 반환할 때까지 대기
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def get_stats(self) -> Dict:
+        """재시도/헤징 통계"""
+        return {
+            **self._stats,
+            "max_attempts": self.max_attempts,
+            "hedging_enabled": self.hedging_enabled,
+            "retry_budget_tokens": round(self.retry_budget.tokens, 2),
+            "hedge_budget_tokens": round(self.hedge_budget.tokens, 2),
+        }
+
+
+# 전역 인스턴스
+llm_retry = LLMRetryPolicy()
@@ -0,0 +1,264 @@
+"""
+LLM 요청 스케줄러
+우선순위별로 LLM 호출을 조율하여 유저가 기다리는 대사가 백그라운드 호출에 밀리지 않도록 함
+"""
+import asyncio
+import bisect
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from utils.token_accounting import token_accountant
+from utils.config import (
+    get_llm_max_concurrency,
+    get_llm_interactive_reserve,
+    get_llm_class_limits
+)
+
+
+class LLMCallType(str, Enum):
+    """LLM 호출 종류"""
+    MAIN = "main"                              # 메인 응답 (유저가 기다리는 대사)
+    TIKITAKA = "tikitaka"                      # 캐릭터 간 티키타카
+    INTERVENTION = "intervention"              # 끼어들기
+    SUB = "sub"                                # 서브 리액션
+    INNER_THOUGHT = "inner_thought"            # 속마음
+    SUMMARY = "summary"                        # 스토리 요약
+    PROFILE = "profile"                        # 유저 프로필 추출
+    CHARACTER_GENERATE = "character_generate"  # 창작자 캐릭터 프롬프트 생성
+
+
+# 호출 종류별 우선순위 (낮을수록 먼저 처리)
+# 메인 > 티키타카/끼어들기 > 서브 > 속마음 > 요약 > 프로필
+CALL_PRIORITIES: Dict[LLMCallType, int] = {
+    LLMCallType.MAIN: 0,
+    LLMCallType.CHARACTER_GENERATE: 0,
+    LLMCallType.TIKITAKA: 1,
+    LLMCallType.INTERVENTION: 1,
+    LLMCallType.SUB: 2,
+    LLMCallType.INNER_THOUGHT: 3,
+    LLMCallType.SUMMARY: 4,
+    LLMCallType.PROFILE: 5,
+}
+
+# 이 우선순위까지는 대화 응답으로 보고 예약 슬롯 사용 가능
+INTERACTIVE_PRIORITY = 1
+
+# 통계용 최근 표본 수
+STATS_WINDOW = 200
+
+
+class _Waiter:
+    """슬롯을 기다리는 호출"""
+    
+    def __init__(self, call_type: LLMCallType, seq: int):
+        self.call_type = call_type
+        self.priority = CALL_PRIORITIES[call_type]
+        self.seq = seq
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+    
+    def sort_key(self):
+        return (self.priority, self.seq)
+
+
+class _CallTypeStats:
+    """호출 종류별 통계 (최근 STATS_WINDOW개 표본)"""
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.latencies: Deque[Tuple[float, float]] = deque(maxlen=STATS_WINDOW)  # (완료 시각, 지연 시간)
+        self.queue_waits: Deque[float] = deque(maxlen=STATS_WINDOW)
+
+
+def _percentile(samples, q: float) -> Optional[float]:
+    """표본의 q 분위수 (표본이 없으면 None)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class LLMScheduler:
+    """
+    LLM 요청 스케줄러 (싱글톤 패턴)
+    
+    - 전체 동시 호출 한도 (LLM_MAX_CONCURRENCY)
+    - 호출 종류별 동시 호출 한도 (LLM_CLASS_LIMITS)
+    - 대화 응답 전용 예약 슬롯 (LLM_INTERACTIVE_RESERVE): 서브/속마음/요약/프로필은
+      예약분을 제외한 슬롯만 사용하므로 부하 중에도 메인 대사가 바로 시작됨
+    - 슬롯이 비면 우선순위가 높은 대기 호출부터 시작 (같은 우선순위는 도착 순서)
+    - 호출 종류별 지연 시간/대기 시간/대기열 길이 통계
+    - 유저별 하루 토큰 예산 확인 (token_accountant, 예산을 넘긴 유저의 호출은 대기열에 넣지 않고 429)
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMScheduler, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.max_concurrency = max(1, get_llm_max_concurrency())
+        self.interactive_reserve = min(max(0, get_llm_interactive_reserve()), self.max_concurrency - 1)
+        self.class_limits: Dict[LLMCallType, int] = {}
+        for name, limit in get_llm_class_limits().items():
+            try:
+                self.class_limits[LLMCallType(name)] = max(1, limit)
+            except ValueError:
+                print(f"⚠️ 알 수 없는 LLM 호출 종류: {name}")
+        
+        self._in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._stats: Dict[LLMCallType, _CallTypeStats] = {t: _CallTypeStats() for t in LLMCallType}
+        self._initialized = True
+    
+    @asynccontextmanager
+    async def slot(self, call_type: LLMCallType) -> AsyncIterator[None]:
+        """
+        LLM 호출 슬롯 획득 (async with로 사용)
+        
+        Args:
+            call_type: 호출 종류 (우선순위와 종류별 한도 결정)
+        
+        Raises:
+            TokenBudgetExceededError: 현재 유저가 하루 토큰 예산을 모두 쓴 경우
+        """
+        await token_accountant.check_budget_async(call_type.value)
+        await self._acquire(call_type)
+        stats = self._stats[call_type]
+        started_at = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            stats.failed += 1
+            raise
+        else:
+            stats.completed += 1
+            finished_at = time.monotonic()
+            stats.latencies.append((finished_at, finished_at - started_at))
+        finally:
+            self._release(call_type)
+    
+    async def _acquire(self, call_type: LLMCallType):
+        """슬롯을 얻을 때까지 대기"""
+        waiter = _Waiter(call_type, next(self._seq))
+        keys = [w.sort_key() for w in self._waiters]
+        self._waiters.insert(bisect.bisect(keys, waiter.sort_key()), waiter)
+        self._stats[call_type].queued += 1
+        self._dispatch()
+        
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 받은 직후 취소됨 - 슬롯 반환
+                self._release(call_type)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._stats[call_type].queued -= 1
+            raise
+        
+        self._stats[call_type].queue_waits.append(time.monotonic() - waiter.enqueued_at)
+    
+    def _release(self, call_type: LLMCallType):
+        """슬롯 반환 후 대기 호출 시작"""
+        self._in_flight -= 1
+        self._stats[call_type].in_flight -= 1
+        self._dispatch()
+    
+    def _can_start(self, waiter: _Waiter) -> bool:
+        """전체 한도, 예약 슬롯, 종류별 한도 확인"""
+        capacity = self.max_concurrency
+        if waiter.priority > INTERACTIVE_PRIORITY:
+            capacity -= self.interactive_reserve
+        if self._in_flight >= capacity:
+            return False
+        limit = self.class_limits.get(waiter.call_type)
+        return limit is None or self._stats[waiter.call_type].in_flight < limit
+    
+    def _dispatch(self):
+        """우선순위 순으로 시작 가능한 대기 호출에 슬롯 배정"""
+        for waiter in list(self._waiters):
+            if self._in_flight >= self.max_concurrency:
+                break
+            if waiter.future.done() or not self._can_start(waiter):
+                # 종류별 한도/예약 슬롯에 걸린 호출은 건너뛰고 다음 우선순위 확인
+                continue
+            self._waiters.remove(waiter)
+            stats = self._stats[waiter.call_type]
+            stats.queued -= 1
+            stats.in_flight += 1
+            self._in_flight += 1
+            waiter.future.set_result(None)
+    
+    def queue_depth(self) -> int:
+        """슬롯을 기다리는 호출 수"""
+        return len(self._waiters)
+    
+    def latency_percentile(
+        self,
+        q: float,
+        call_type: Optional[LLMCallType] = None,
+        window_seconds: Optional[float] = None,
+        min_samples: int = 1
+    ) -> Optional[float]:
+        """
+        최근 LLM 호출 지연 시간 분위수 (초)
+        
+        Args:
+            q: 분위 (0.95 = p95)
+            call_type: 호출 종류 (None이면 전체)
+            window_seconds: 최근 몇 초 안에 끝난 호출만 볼지 (None이면 보관 중인 표본 전체)
+            min_samples: 표본이 이보다 적으면 None
+        """
+        stats_list = [self._stats[call_type]] if call_type is not None else self._stats.values()
+        since = time.monotonic() - window_seconds if window_seconds is not None else None
+        samples = [
+            latency
+            for stats in stats_list
+            for finished_at, latency in stats.latencies
+            if since is None or finished_at >= since
+        ]
+        if len(samples) < min_samples:
+            return None
+        return _percentile(samples, q)
+    
+    def get_stats(self) -> Dict:
+        """스케줄러 상태 및 호출 종류별 통계"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "interactive_reserve": self.interactive_reserve,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth(),
+            "call_types": {
+                call_type.value: {
+                    "priority": CALL_PRIORITIES[call_type],
+                    "limit": self.class_limits.get(call_type),
+                    "in_flight": stats.in_flight,
+                    "queued": stats.queued,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                    "latency_p50": self.latency_percentile(0.5, call_type),
+                    "latency_p95": self.latency_percentile(0.95, call_type),
+                    "queue_wait_p95": _percentile(stats.queue_waits, 0.95),
+                }
+                for call_type, stats in self._stats.items()
+            }
+        }
+
+
+# 전역 인스턴스
+llm_scheduler = LLMScheduler()
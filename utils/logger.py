@@ -0,0 +1,188 @@
+"""
+구조화 로깅
+이벤트 루프에서는 로그 레코드를 큐에 넣기만 하고, 실제 출력은 백그라운드 스레드(QueueListener)가 수행
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from utils.config import get_log_level, get_log_levels, get_log_format, get_log_debug_sample_rate
+
+# 로그 상관관계 필드 (턴 처리 중 자동으로 모든 로그에 포함)
+_session_id: ContextVar[Optional[str]] = ContextVar("log_session_id", default=None)
+_turn_id: ContextVar[Optional[str]] = ContextVar("log_turn_id", default=None)
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 JSON에 추가하기 위해 제외)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "session_id", "turn_id", "sample_rate", "correlation"}
+
+_setup_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class ContextFilter(logging.Filter):
+    """현재 태스크의 session_id/turn_id를 레코드에 추가 (로그를 남긴 쪽에서 실행)"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.session_id = _session_id.get()
+        record.turn_id = _turn_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    DEBUG 로그 샘플링 (LOG_DEBUG_SAMPLE_RATE 비율만 통과, INFO 이상은 항상 통과)
+    
+    extra={"sample_rate": 0.01}로 줄마다 비율 지정 가능
+    """
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        rate = getattr(record, "sample_rate", self.rate)
+        return rate >= 1.0 or random.random() < rate
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """메시지/예외만 미리 문자열로 만들고 extra 필드는 유지한 채 큐에 전달"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (ts, level, logger, msg, session_id, turn_id, extra 필드, exc)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "session_id", None):
+            data["session_id"] = record.session_id
+        if getattr(record, "turn_id", None):
+            data["turn_id"] = record.turn_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """사람이 읽기 쉬운 한 줄 형식 (로컬 개발용)"""
+    
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s%(correlation)s %(message)s")
+    
+    def format(self, record: logging.LogRecord) -> str:
+        turn_id = getattr(record, "turn_id", None)
+        record.correlation = f" [turn {turn_id[:8]}]" if turn_id else ""
+        return super().format(record)
+
+
+class StdoutHandler(logging.StreamHandler):
+    """출력 시점의 sys.stdout에 기록 (stdout을 바꿔 끼워도 따라감)"""
+    
+    @property
+    def stream(self):
+        return sys.stdout
+    
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _parse_levels(spec: str) -> Dict[str, int]:
+    """"core.scene_reaction=DEBUG,db=WARNING" → {모듈: 레벨}"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        level_no = logging.getLevelName(level.strip().upper())
+        if isinstance(level_no, int):
+            levels[name.strip()] = level_no
+    return levels
+
+
+def setup_logging():
+    """
+    로깅 초기화 (한 번만 수행, get_logger에서 자동 호출)
+    
+    - 루트 로거에 큐 핸들러 연결, 백그라운드 스레드가 stdout으로 출력
+    - LOG_LEVEL: 기본 레벨, LOG_LEVELS: 모듈별 레벨 (예: core.scene_reaction=DEBUG,db=WARNING)
+    - LOG_FORMAT: json(기본) 또는 text
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        
+        output = StdoutHandler()
+        output.setFormatter(TextFormatter() if get_log_format() == "text" else JsonFormatter())
+        
+        handler = StructuredQueueHandler(queue.SimpleQueue())
+        handler.addFilter(ContextFilter())
+        handler.addFilter(SamplingFilter(get_log_debug_sample_rate()))
+        
+        root = logging.getLogger()
+        root.addHandler(handler)
+        level = logging.getLevelName(get_log_level().upper())
+        root.setLevel(level if isinstance(level, int) else logging.INFO)
+        for name, module_level in _parse_levels(get_log_levels()).items():
+            logging.getLogger(name).setLevel(module_level)
+        
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    모듈 로거 (모듈에서 logger = get_logger(__name__)로 사용)
+    
+    Args:
+        name: 로거 이름 (모듈 경로 - LOG_LEVELS의 모듈별 레벨 기준)
+    """
+    setup_logging()
+    return logging.getLogger(name)
+
+
+@contextmanager
+def log_context(session_id: Optional[str] = None, turn_id: Optional[str] = None) -> Iterator[None]:
+    """
+    블록 안의 로그에 session_id/turn_id 포함 (asyncio 태스크 생성 시 복사되어 자식 태스크에도 적용)
+    """
+    session_token = _session_id.set(session_id) if session_id is not None else None
+    turn_token = _turn_id.set(turn_id) if turn_id is not None else None
+    try:
+        yield
+    finally:
+        if turn_token is not None:
+            _turn_id.reset(turn_token)
+        if session_token is not None:
+            _session_id.reset(session_token)
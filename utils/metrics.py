@@ -0,0 +1,289 @@
+"""
+운영 지표 수집
+LLM/DB/세션 상태를 카운터·게이지·히스토그램으로 모아 Prometheus 텍스트 형식(/metrics)으로 노출
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 지표 이름 접두사
+METRIC_PREFIX = "synk_"
+
+# 기본 히스토그램 구간
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+DB_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    """라벨 값 이스케이프 (역슬래시, 따옴표, 줄바꿈)"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """{a="1",b="2"} 형식 라벨 문자열"""
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """지표 공통 (이름, 설명, 라벨 이름, 라벨 조합별 값)"""
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._render_samples())
+        return lines
+    
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    
+    type_name = "counter"
+    
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        super().__init__(name, description, label_names)
+        self._values: Dict[LabelKey, float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+    
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 (수집 시점에 갱신하는 값은 on_collect 콜백에서 set)"""
+    
+    type_name = "gauge"
+    
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        super().__init__(name, description, label_names)
+        self._values: Dict[LabelKey, float] = {}
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """구간별 누적 분포 히스토그램 (_bucket, _sum, _count)"""
+    
+    type_name = "histogram"
+    
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # 라벨 조합 → (구간별 개수, 합계, 전체 개수)
+        self._values: Dict[LabelKey, List] = {}
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+    
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()]
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    지표 저장소 (싱글톤 패턴)
+    
+    - counter/gauge/histogram: 같은 이름이면 이미 등록된 지표 반환 (여러 모듈에서 공유 가능)
+    - on_collect: /metrics 수집 직전에 호출할 콜백 등록 (세션 수처럼 그때그때 계산하는 게이지용)
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsRegistry, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._initialized = True
+    
+    def _register(self, metric_class, name: str, *args, **kwargs):
+        name = f"{METRIC_PREFIX}{name}"
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"지표 '{name}'이(가) 다른 종류로 이미 등록되어 있습니다.")
+        return metric
+    
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, description, label_names)
+    
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, description, label_names)
+    
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, description, label_names, buckets=buckets)
+    
+    def on_collect(self, callback: Callable[[], None]):
+        """수집 직전 콜백 등록"""
+        self._collectors.append(callback)
+    
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        for callback in list(self._collectors):
+            try:
+                callback()
+            except Exception as e:
+                logger.warning("지표 수집 콜백 오류: %s", e)
+        
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 인스턴스
+metrics = MetricsRegistry()
+
+# 캐시 조회 결과 (cache: 캐시 이름, result: hit/miss)
+cache_requests = metrics.counter("cache_requests_total", "Cache lookups by result", ["cache", "result"])
+cache_hit_ratio = metrics.gauge("cache_hit_ratio", "Cache hit ratio since process start", ["cache"])
+_cache_names = set()
+
+# DB 쿼리 지연 (db: 엔진 이름, statement: select/insert/update/delete/other)
+db_query_seconds = metrics.histogram(
+    "db_query_duration_seconds", "DB query latency", ["db", "statement"], buckets=DB_LATENCY_BUCKETS
+)
+db_pool_checked_out = metrics.gauge("db_pool_checked_out", "DB connections currently checked out", ["db"])
+_engines: Dict[str, object] = {}
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """
+    캐시 조회 결과 기록
+    
+    Args:
+        cache: 캐시 이름 (예: relationship, idempotency)
+        hit: 캐시 적중 여부
+    """
+    _cache_names.add(cache)
+    cache_requests.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def instrument_engine(engine, db_name: str):
+    """
+    SQLAlchemy 엔진에 쿼리 지연 측정 이벤트 연결
+    
+    Args:
+        engine: SQLAlchemy 엔진
+        db_name: 지표 라벨로 쓸 DB 이름
+    """
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        verb = statement.lstrip().split(" ", 1)[0].lower()
+        if verb not in ("select", "insert", "update", "delete"):
+            verb = "other"
+        db_query_seconds.observe(elapsed, db=db_name, statement=verb)
+    
+    _engines[db_name] = engine
+
+
+def _collect_shared_metrics():
+    """캐시 적중률, DB 커넥션 풀 사용량 갱신"""
+    for cache in list(_cache_names):
+        hits = cache_requests.get(cache=cache, result="hit")
+        total = hits + cache_requests.get(cache=cache, result="miss")
+        cache_hit_ratio.set(hits / total if total else 0.0, cache=cache)
+    
+    for db_name, engine in _engines.items():
+        checked_out = getattr(engine.pool, "checkedout", None)
+        if checked_out is not None:
+            db_pool_checked_out.set(checked_out(), db=db_name)
+
+
+metrics.on_collect(_collect_shared_metrics)
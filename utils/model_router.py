@@ -0,0 +1,222 @@
+"""
+모델 라우터
+호출 종류를 모델 등급(lite/standard/pro)에 연결하고,
+등급 모델이 404(모델 없음)나 한도 초과(429)로 실패하면 다음 등급 모델로 대체
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from google.api_core import exceptions as google_exceptions
+
+from utils.llm_scheduler import LLMCallType
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.config import get_llm_model_tiers, get_llm_model_routes, get_llm_model_cooldown_seconds
+
+logger = get_logger(__name__)
+
+# 라우팅 표에 없는 호출 종류의 등급
+DEFAULT_TIER = "standard"
+
+# 실험/프리뷰 모델 대신 쓸 안정 모델 (standard 등급이 없을 때)
+STABLE_MODEL = "models/gemini-2.0-flash"
+
+# 404로 대체된 모델을 다시 시도하기까지 대기 시간 (초) - 모델이 사라진 경우라 길게
+NOT_FOUND_COOLDOWN_SECONDS = 3600
+
+# 대체 사유
+REASON_NOT_FOUND = "not_found"
+REASON_QUOTA = "quota"
+
+# 모델 대체 지표 (/metrics)
+llm_model_fallbacks = metrics.counter(
+    "llm_model_fallbacks_total",
+    "LLM calls moved to the next model tier",
+    ["call_type", "from_model", "to_model", "reason"]
+)
+
+
+def _short_name(model_name: str) -> str:
+    return model_name[7:] if model_name.startswith("models/") else model_name
+
+
+def fallback_reason(e: BaseException) -> Optional[str]:
+    """
+    다른 모델로 대체할 오류인지 판단
+    
+    Returns:
+        not_found(모델 없음/미지원) / quota(429 한도 초과) / None(대체 대상 아님)
+    """
+    if isinstance(e, HTTPException):
+        # 토큰 예산 초과, 서킷 브레이커 등 - 모델과 무관
+        return None
+    if isinstance(e, google_exceptions.NotFound):
+        return REASON_NOT_FOUND
+    if isinstance(e, google_exceptions.TooManyRequests):
+        return REASON_QUOTA
+    if isinstance(e, google_exceptions.GoogleAPICallError):
+        return None
+    
+    message = str(e).lower()
+    if "404" in message or "not found" in message or "not supported" in message:
+        return REASON_NOT_FOUND
+    if "429" in message or "quota" in message or "resource exhausted" in message:
+        return REASON_QUOTA
+    return None
+
+
+class ModelRouter:
+    """
+    모델 라우터 (싱글톤 패턴)
+    
+    - LLM_MODEL_TIERS: 등급과 모델 (나열 순서가 대체 순서)
+    - LLM_MODEL_ROUTES: 호출 종류별 등급 (지정하지 않은 종류는 standard)
+    - 대체된 모델은 대기 시간(404: 1시간, 429: LLM_MODEL_COOLDOWN_SECONDS) 동안 후보에서 뒤로 밀림
+    - 실험/프리뷰 모델 이름은 안정 모델로 바꿔서 사용
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ModelRouter, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self._warned_unstable = set()
+        tiers = get_llm_model_tiers() or [(DEFAULT_TIER, STABLE_MODEL)]
+        self.stable_model = dict(tiers).get(DEFAULT_TIER, STABLE_MODEL)
+        if not self.stable_model.startswith("models/"):
+            self.stable_model = f"models/{self.stable_model}"
+        self.tiers: List[tuple] = [(name, self.normalize(model)) for name, model in tiers]
+        self.default_tier = DEFAULT_TIER if DEFAULT_TIER in dict(self.tiers) else self.tiers[0][0]
+        
+        self.routes: Dict[str, str] = {}
+        for call_type, tier in get_llm_model_routes().items():
+            if call_type not in {member.value for member in LLMCallType}:
+                logger.warning("LLM_MODEL_ROUTES: 알 수 없는 호출 종류 무시 (%s)", call_type)
+            elif tier not in dict(self.tiers):
+                logger.warning("LLM_MODEL_ROUTES: 알 수 없는 등급 무시 (%s=%s)", call_type, tier)
+            else:
+                self.routes[call_type] = tier
+        
+        self.cooldown_seconds = max(0.0, get_llm_model_cooldown_seconds())
+        self._lock = threading.Lock()
+        # 모델 → 다시 후보로 올릴 시각 (monotonic)
+        self._unavailable_until: Dict[str, float] = {}
+        self._fallbacks = 0
+        self._initialized = True
+    
+    def normalize(self, model_name: str) -> str:
+        """
+        모델 이름 정규화
+        
+        Google Generative AI SDK는 "models/" 접두사가 있는 전체 경로를 받습니다
+        실험/프리뷰 버전은 안정 모델로 변경
+        """
+        if not model_name.startswith("models/"):
+            model_name = f"models/{model_name}"
+        
+        lowered = model_name.lower()
+        if "exp" in lowered or "preview" in lowered:
+            if model_name not in self._warned_unstable:
+                self._warned_unstable.add(model_name)
+                logger.warning("실험 버전 모델 감지, 안정 버전으로 변경: %s → %s", model_name, self.stable_model)
+            model_name = self.stable_model
+        
+        return model_name
+    
+    def tier_for(self, call_type: LLMCallType) -> str:
+        """호출 종류의 등급"""
+        return self.routes.get(call_type.value, self.default_tier)
+    
+    def chain_for(self, tier: str) -> List[str]:
+        """등급에서 시작하는 대체 순서 (뒤의 등급, 그다음 앞의 등급을 가까운 순으로)"""
+        names = [name for name, _ in self.tiers]
+        index = names.index(tier)
+        ordered = self.tiers[index:] + list(reversed(self.tiers[:index]))
+        chain = []
+        for _, model in ordered:
+            if model not in chain:
+                chain.append(model)
+        return chain
+    
+    def candidates(self, call_type: LLMCallType, model_name: Optional[str] = None) -> List[str]:
+        """
+        호출에 시도할 모델 목록 (앞에서부터 시도)
+        
+        Args:
+            call_type: 호출 종류
+            model_name: 지정한 모델 (있으면 맨 앞, 등급 모델은 대체 후보)
+        """
+        chain = self.chain_for(self.tier_for(call_type))
+        if model_name:
+            first = self.normalize(model_name)
+            chain = [first] + [model for model in chain if model != first]
+        
+        now = time.monotonic()
+        with self._lock:
+            available = [model for model in chain if self._unavailable_until.get(model, 0.0) <= now]
+            cooling = [model for model in chain if model not in available]
+        # 대기 중인 모델은 다른 후보가 모두 실패했을 때만 시도
+        return available + cooling
+    
+    def fall_back(self, call_type: LLMCallType, model_name: str, next_model: str, e: BaseException) -> bool:
+        """
+        실패한 모델을 다음 모델로 대체할지 결정 (대체하면 실패한 모델은 대기 시간 동안 뒤로 밀림)
+        
+        Args:
+            call_type: 호출 종류
+            model_name: 실패한 모델
+            next_model: 다음으로 시도할 모델
+            e: 발생한 예외
+        
+        Returns:
+            대체 여부 (False면 호출하는 쪽에서 예외를 그대로 처리)
+        """
+        reason = fallback_reason(e)
+        if reason is None:
+            return False
+        
+        cooldown = NOT_FOUND_COOLDOWN_SECONDS if reason == REASON_NOT_FOUND else self.cooldown_seconds
+        with self._lock:
+            self._unavailable_until[model_name] = time.monotonic() + cooldown
+            self._fallbacks += 1
+        llm_model_fallbacks.inc(
+            call_type=call_type.value,
+            from_model=_short_name(model_name),
+            to_model=_short_name(next_model),
+            reason=reason
+        )
+        logger.warning(
+            "%s: %s 모델 대체 (%s) → %s",
+            call_type.value, _short_name(model_name), reason, _short_name(next_model),
+            extra={"error": str(e)[:200]}
+        )
+        return True
+    
+    def get_stats(self) -> Dict:
+        """라우팅 표와 대기 중인 모델"""
+        now = time.monotonic()
+        with self._lock:
+            cooling = {
+                _short_name(model): round(until - now, 1)
+                for model, until in self._unavailable_until.items()
+                if until > now
+            }
+            fallbacks = self._fallbacks
+        return {
+            "tiers": {name: _short_name(model) for name, model in self.tiers},
+            "routes": {call_type.value: self.tier_for(call_type) for call_type in LLMCallType},
+            "cooling_down": cooling,
+            "fallbacks": fallbacks,
+        }
+
+
+# 전역 인스턴스
+model_router = ModelRouter()
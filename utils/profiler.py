@@ -0,0 +1,214 @@
+"""
+요청 프로파일러
+별도 스레드가 이벤트 루프 스레드의 스택을 주기적으로 샘플링하여
+플레임 그래프 도구(flamegraph.pl, speedscope)가 읽는 folded stack 형식으로 집계
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from utils.config import get_profile_buffer_size, get_profile_interval_ms
+
+# 스택 프레임 경로를 프로젝트 기준 상대 경로로 줄이기 위한 루트
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 스택 최대 깊이 (무한 재귀 등으로 깊어진 스택은 바깥쪽을 자름)
+MAX_STACK_DEPTH = 200
+
+
+def _frame_label(code) -> str:
+    """프레임 이름 (함수 (파일:시작 줄)) - 같은 함수의 다른 줄은 하나로 합침"""
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    샘플링 프로파일러
+    
+    대상 스레드의 스택을 interval마다 기록 (함수 호출마다 개입하는 cProfile보다 오버헤드가 작음)
+    asyncio에서는 이벤트 루프 스레드 전체를 샘플링하므로 같은 시간에 처리 중인 다른 요청도 함께 잡힘
+    """
+    
+    def __init__(self, interval: float, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """샘플링 시작"""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """샘플링 종료 (스레드가 끝날 때까지 대기)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            labels = []
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            # folded 형식은 바깥 호출부터
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+
+class RequestProfile:
+    """요청 1건의 프로파일 결과"""
+    
+    def __init__(self, method: str, path: str, interval: float):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.turn_id: Optional[str] = None
+        self.method = method
+        self.path = path
+        self.interval = interval
+        self.started_at = datetime.now()
+        self.duration_ms: Optional[float] = None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._profiler = SamplingProfiler(interval)
+        self._started = 0.0
+    
+    def start(self):
+        """현재 스레드 샘플링 시작"""
+        self._started = time.perf_counter()
+        self._profiler.start()
+    
+    def stop(self):
+        """샘플링 종료 및 결과 반영"""
+        self._profiler.stop()
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self.stacks = self._profiler.stacks
+        self.samples = self._profiler.samples
+    
+    def folded(self) -> str:
+        """folded stack 텍스트 (줄마다 "바깥;...;안쪽 샘플 수")"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+    
+    def top_functions(self, limit: int = 20) -> List[Dict]:
+        """샘플에서 가장 안쪽(실행 중이던) 함수 기준 상위 목록"""
+        own: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total = max(1, self.samples)
+        return [
+            {"function": name, "samples": count, "ratio": round(count / total, 3)}
+            for name, count in own.most_common(limit)
+        ]
+    
+    def to_dict(self, top: int = 20) -> Dict:
+        return {
+            "profile_id": self.profile_id,
+            "turn_id": self.turn_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2) if self.duration_ms is not None else None,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "top_functions": self.top_functions(top),
+        }
+
+
+class ProfileStore:
+    """
+    최근 프로파일 보관소 (싱글톤 패턴)
+    
+    profile_id와 turn_id 모두로 조회 가능, PROFILE_BUFFER_SIZE개까지 보관
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ProfileStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.max_profiles = max(0, get_profile_buffer_size())
+        self.interval = max(0.0005, get_profile_interval_ms() / 1000)
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._initialized = True
+    
+    def add(self, profile: RequestProfile):
+        """프로파일 등록 (가장 오래된 것부터 제거)"""
+        if self.max_profiles <= 0:
+            return
+        with self._lock:
+            self._profiles[profile.profile_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[RequestProfile]:
+        """profile_id 또는 turn_id로 조회"""
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                return profile
+            for candidate in reversed(self._profiles.values()):
+                if candidate.turn_id == key:
+                    return candidate
+        return None
+    
+    def list(self) -> List[Dict]:
+        """보관 중인 프로파일 요약 (최근 순)"""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [profile.to_dict(top=3) for profile in reversed(profiles)]
+
+
+# 현재 요청의 프로파일 (프로파일링 중인 요청에서만 설정)
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def start_request_profile(method: str, path: str) -> RequestProfile:
+    """
+    현재 요청의 프로파일링 시작 (현재 스레드 = 이벤트 루프 스레드 샘플링)
+    
+    요청이 끝나면 finish_request_profile로 종료
+    """
+    profile = RequestProfile(method, path, profile_store.interval)
+    _current_profile.set(profile)
+    profile.start()
+    return profile
+
+
+def finish_request_profile(profile: RequestProfile):
+    """샘플링 종료 후 보관소에 등록"""
+    profile.stop()
+    profile_store.add(profile)
+
+
+def bind_profile_turn(turn_id: str):
+    """프로파일링 중인 요청이면 turn_id 연결 (turn_id로 조회 가능하도록)"""
+    profile = _current_profile.get()
+    if profile is not None and profile.turn_id is None:
+        profile.turn_id = turn_id
+
+
+# 전역 인스턴스
+profile_store = ProfileStore()
@@ -0,0 +1,286 @@
+"""
+LLM 응답 캐시
+같은 (모델, 생성 설정 프로필, 정규화한 프롬프트) 호출은 저장된 응답을 재사용
+(오프닝 직후 턴, 같은 장소의 같은 인사, 캐릭터 생성 재시도 등)
+
+- 메모리: TTL + 최대 개수(LRU)
+- 디스크: SQLite 파일 (재시작해도 유지, 메모리에서 밀려난 항목도 TTL 동안 조회)
+- LLM_CACHE_CALL_TYPES로 지정한 호출 종류만 사용 (캐시 불가 종류는 지정해도 무시)
+"""
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from utils.llm_scheduler import LLMCallType
+from utils.generation_profiles import GenerationProfile
+from utils.logger import get_logger
+from utils.metrics import record_cache_lookup
+from utils.config import (
+    get_llm_cache_call_types,
+    get_llm_cache_ttl_seconds,
+    get_llm_cache_max_entries,
+    get_llm_cache_disk_path,
+    get_llm_cache_disk_max_entries
+)
+
+logger = get_logger(__name__)
+
+# 캐시 불가 호출 종류
+# 티키타카/끼어들기는 같은 턴에 방금 나온 대사에 즉흥적으로 반응하는 호출이라 같은 대사를 재생하면 안 됨
+NON_CACHEABLE_CALL_TYPES = frozenset({LLMCallType.TIKITAKA, LLMCallType.INTERVENTION})
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """캐시 키용 프롬프트 정규화 (연속 공백/줄바꿈을 공백 하나로, 앞뒤 공백 제거)"""
+    return _WHITESPACE_PATTERN.sub(" ", prompt).strip()
+
+
+def cache_key(model_name: str, generation: GenerationProfile, prompt: str) -> str:
+    """
+    캐시 키 (모델, 생성 설정 프로필, 정규화한 프롬프트의 SHA-256)
+    
+    프로필은 이름과 실제 요청에 들어가는 설정값을 모두 포함 (캐릭터/작품 덮어쓰기가 다르면 다른 키)
+    """
+    settings = json.dumps(
+        {"model": model_name, "profile": generation.name, "config": generation.to_generation_config()},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    digest = hashlib.sha256(settings.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_prompt(prompt).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    LLM 응답 캐시 (싱글톤 패턴)
+    
+    - 메모리 항목은 TTL 동안 보관하고, 최대 개수를 넘으면 오래 조회되지 않은 항목부터 제거 (LRU)
+    - 디스크 항목도 같은 TTL을 적용하고 LLM_CACHE_DISK_MAX_ENTRIES를 넘으면 LRU로 제거
+    - 디스크 오류가 나면 디스크 캐시만 끄고 메모리 캐시는 계속 사용
+    - 빈 응답/실패한 호출은 저장하지 않음
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ResponseCache, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        known = {member.value: member for member in LLMCallType}
+        self.call_types = set()
+        for name in get_llm_cache_call_types():
+            call_type = known.get(name)
+            if call_type is None:
+                logger.warning("LLM_CACHE_CALL_TYPES: 알 수 없는 호출 종류 무시 (%s)", name)
+            elif call_type in NON_CACHEABLE_CALL_TYPES:
+                logger.warning("LLM_CACHE_CALL_TYPES: 캐시할 수 없는 호출 종류 무시 (%s)", name)
+            else:
+                self.call_types.add(call_type)
+        
+        self.ttl_seconds = get_llm_cache_ttl_seconds()
+        self.max_entries = get_llm_cache_max_entries()
+        self.disk_path = get_llm_cache_disk_path() if self.call_types else ""
+        self.disk_max_entries = get_llm_cache_disk_max_entries()
+        
+        # 키 → (응답, 저장 시각) - 디스크와 같은 기준이 되도록 벽시계 시각 사용
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._initialized = True
+    
+    def enabled(self, call_type: LLMCallType) -> bool:
+        """호출 종류에 캐시를 사용하는지"""
+        return call_type in self.call_types
+    
+    def key_for(
+        self,
+        call_type: LLMCallType,
+        model_name: str,
+        generation: GenerationProfile,
+        prompt: str
+    ) -> Optional[str]:
+        """
+        호출의 캐시 키
+        
+        Returns:
+            캐시 키 (호출 종류에 캐시를 사용하지 않으면 None)
+        """
+        if not self.enabled(call_type):
+            return None
+        return cache_key(model_name, generation, prompt)
+    
+    async def get_async(self, key: str) -> Optional[str]:
+        """
+        저장된 응답 조회 (메모리 → 디스크 순, 디스크 적중은 메모리로 올림)
+        디스크 조회는 스레드에서 실행해 이벤트 루프를 막지 않음
+        
+        Returns:
+            응답 (없거나 만료되었으면 None)
+        """
+        response = self._memory_get(key)
+        if response is None and self.disk_path:
+            response = await asyncio.to_thread(self._disk_get, key)
+        return self._finish_lookup(response)
+    
+    async def put_async(self, key: str, response: str):
+        """응답 저장 (메모리 + 디스크, 디스크 쓰기는 스레드에서 실행)"""
+        if not response:
+            return
+        stored_at = time.time()
+        self._stats["stores"] += 1
+        self._memory_put(key, response, stored_at)
+        if self.disk_path:
+            await asyncio.to_thread(self._disk_put, key, response, stored_at)
+    
+    def clear(self) -> int:
+        """
+        캐시 비우기 (메모리 + 디스크)
+        
+        Returns:
+            삭제한 메모리 항목 수
+        """
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+        if self.disk_path:
+            self._disk_execute(lambda conn: conn.execute("DELETE FROM llm_response_cache"))
+        return removed
+    
+    def get_stats(self) -> Dict:
+        """캐시 설정과 적중 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+            memory_entries = len(self._entries)
+        disk_entries = None
+        if self.disk_path:
+            disk_entries = self._disk_execute(
+                lambda conn: conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+            )
+        return {
+            "call_types": sorted(call_type.value for call_type in self.call_types),
+            "non_cacheable": sorted(call_type.value for call_type in NON_CACHEABLE_CALL_TYPES),
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+            "memory_entries": memory_entries,
+            "disk_path": self.disk_path or None,
+            "disk_entries": disk_entries,
+            **stats,
+        }
+    
+    def _finish_lookup(self, response: Optional[str]) -> Optional[str]:
+        record_cache_lookup("llm_response", response is not None)
+        if response is None:
+            with self._lock:
+                self._stats["misses"] += 1
+        return response
+    
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return now - stored_at > self.ttl_seconds
+    
+    def _memory_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, stored_at = entry
+            if self._expired(stored_at, time.time()):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return response
+    
+    def _memory_put(self, key: str, response: str, stored_at: float):
+        with self._lock:
+            self._entries[key] = (response, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def _disk_get(self, key: str) -> Optional[str]:
+        now = time.time()
+        
+        def lookup(conn: sqlite3.Connection):
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1], now):
+                conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_response_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row
+        
+        row = self._disk_execute(lookup)
+        if row is None:
+            return None
+        response, stored_at = row
+        with self._lock:
+            self._stats["disk_hits"] += 1
+        self._memory_put(key, response, stored_at)
+        return response
+    
+    def _disk_put(self, key: str, response: str, stored_at: float):
+        def store(conn: sqlite3.Connection):
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, stored_at, stored_at)
+            )
+            conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN "
+                "(SELECT key FROM llm_response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_entries,)
+            )
+        
+        self._disk_execute(store)
+    
+    def _disk_execute(self, operation):
+        """디스크 작업 실행 (연결은 처음 쓸 때 생성, 오류가 나면 디스크 캐시를 끄고 None)"""
+        with self._disk_lock:
+            if not self.disk_path:
+                return None
+            try:
+                if self._disk is None:
+                    self._disk = self._open_disk()
+                with self._disk:
+                    return operation(self._disk)
+            except sqlite3.Error as e:
+                logger.warning("LLM 응답 캐시: 디스크 캐시 비활성화 (%s)", e)
+                self.disk_path = ""
+                return None
+    
+    def _open_disk(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.disk_path, check_same_thread=False)
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_accessed_at ON llm_response_cache (accessed_at)"
+            )
+            # 재시작 사이에 만료된 항목 정리
+            conn.execute("DELETE FROM llm_response_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        return conn
+
+
+# 전역 인스턴스
+response_cache = ResponseCache()
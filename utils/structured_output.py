@@ -0,0 +1,204 @@
+"""
+구조화 출력 (JSON 모드)
+pydantic 모델을 Gemini 응답 스키마로 변환하고, 응답 JSON을 관대하게 파싱
+파싱에 실패하면 모델에 한 번만 JSON 수정을 요청
+"""
+import json
+import re
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from utils.gemini_client import gemini_client
+from utils.generation_profiles import profile_for_call_type
+from utils.llm_scheduler import LLMCallType
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# 파싱 결과 지표 (/metrics)
+# - parsed: 그대로 JSON, tolerant: 코드 블록/후행 쉼표 등 정리 후 성공,
+#   repaired: 수정 요청 후 성공, failed: 수정 요청까지 실패 (호출하는 쪽 기본값 사용)
+structured_output_results = metrics.counter(
+    "llm_structured_output_total",
+    "Structured (JSON) LLM responses by parse outcome",
+    ["call_type", "outcome"]
+)
+
+# 수정 요청에 넣을 원래 응답 최대 길이
+REPAIR_MAX_CHARS = 2000
+
+REPAIR_PROMPT = """
+아래 [응답]을 [스키마]에 맞는 JSON 객체 하나로 고치세요.
+내용은 바꾸지 말고 형식만 고치세요. JSON만 출력하세요.
+
+[스키마]
+{schema}
+
+[응답]
+{response}
+"""
+
+_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+_PYTHON_LITERALS = ((re.compile(r"\bTrue\b"), "true"), (re.compile(r"\bFalse\b"), "false"), (re.compile(r"\bNone\b"), "null"))
+
+_schema_cache: Dict[Type[BaseModel], Dict[str, Any]] = {}
+
+
+def _convert_schema(node: Dict[str, Any], defs: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON Schema 노드 → Gemini 스키마 (OpenAPI 부분집합: $ref/anyOf 없음, null은 nullable)"""
+    if "$ref" in node:
+        node = defs[node["$ref"].rsplit("/", 1)[-1]]
+    
+    if "anyOf" in node:
+        options = [option for option in node["anyOf"] if option.get("type") != "null"]
+        schema = _convert_schema(options[0], defs) if len(options) == 1 else {"type": "string"}
+        if len(options) < len(node["anyOf"]):
+            schema["nullable"] = True
+        return schema
+    
+    schema: Dict[str, Any] = {"type": node.get("type", "string")}
+    if node.get("description") and schema["type"] != "object":
+        # 모델 클래스 docstring은 제외하고 필드 설명만 전달
+        schema["description"] = node["description"]
+    if node.get("enum"):
+        schema["enum"] = [str(value) for value in node["enum"]]
+    if schema["type"] == "object":
+        properties = {name: _convert_schema(child, defs) for name, child in node.get("properties", {}).items()}
+        schema["properties"] = properties
+        # null을 허용하지 않는 필드는 모두 채우도록 요청 (파싱할 때는 기본값 허용)
+        schema["required"] = [name for name, child in properties.items() if not child.get("nullable")]
+    elif schema["type"] == "array":
+        schema["items"] = _convert_schema(node.get("items", {"type": "string"}), defs)
+    return schema
+
+
+def gemini_schema(model_cls: Type[BaseModel]) -> Dict[str, Any]:
+    """pydantic 모델의 Gemini 응답 스키마 (response_schema, 모델별로 한 번만 변환)"""
+    schema = _schema_cache.get(model_cls)
+    if schema is None:
+        json_schema = model_cls.model_json_schema()
+        schema = _schema_cache[model_cls] = _convert_schema(json_schema, json_schema.get("$defs", {}))
+    return schema
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    """JSON 객체로 읽기 (객체 하나짜리 배열도 허용, 실패하면 None)"""
+    try:
+        data = json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    return data if isinstance(data, dict) else None
+
+
+def parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    관대한 JSON 객체 파싱
+    
+    코드 블록(```json), 앞뒤 설명 문장, 후행 쉼표, 따옴표 모양, 파이썬 리터럴(True/None)을 정리
+    
+    Returns:
+        JSON 객체 (읽을 수 없으면 None)
+    """
+    fence = _FENCE_PATTERN.search(text)
+    if fence:
+        text = fence.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start >= 0 and end > start:
+        text = text[start:end + 1]
+    
+    data = _loads_object(text)
+    if data is not None:
+        return data
+    
+    text = text.replace("“", '"').replace("”", '"')
+    text = _TRAILING_COMMA_PATTERN.sub(r"\1", text)
+    for pattern, literal in _PYTHON_LITERALS:
+        text = pattern.sub(literal, text)
+    return _loads_object(text)
+
+
+def _validate(model_cls: Type[ModelT], data: Optional[Dict[str, Any]]) -> Optional[ModelT]:
+    """스키마 검증 (null 값은 기본값으로 대체, 맞지 않으면 None)"""
+    if data is None:
+        return None
+    try:
+        return model_cls(**{key: value for key, value in data.items() if value is not None})
+    except ValidationError:
+        return None
+
+
+def _parse_fast(text: str, model_cls: Type[ModelT]) -> Optional[ModelT]:
+    """JSON 모드 응답 그대로 파싱 (정리 없이)"""
+    return _validate(model_cls, _loads_object(text.strip()))
+
+
+async def parse_structured(
+    response_text: str,
+    model_cls: Type[ModelT],
+    call_type: LLMCallType,
+    repair: bool = True
+) -> Optional[ModelT]:
+    """
+    LLM 응답을 pydantic 모델로 파싱
+    
+    그대로 → 관대한 파싱 → (repair면) 수정 요청 1회 순으로 시도, 결과는 llm_structured_output_total에 기록
+    
+    Args:
+        response_text: LLM 응답
+        model_cls: 응답 형식 모델
+        call_type: 원래 호출 종류 (수정 요청도 같은 종류/모델 등급으로 보냄)
+        repair: 관대한 파싱까지 실패하면 수정 요청할지
+    
+    Returns:
+        파싱 결과 (모두 실패하면 None - 호출하는 쪽에서 기본값 사용)
+    """
+    result = _parse_fast(response_text, model_cls)
+    if result is not None:
+        structured_output_results.inc(call_type=call_type.value, outcome="parsed")
+        return result
+    
+    result = _validate(model_cls, parse_json_object(response_text))
+    if result is not None:
+        structured_output_results.inc(call_type=call_type.value, outcome="tolerant")
+        return result
+    
+    if repair:
+        result = await _repair(response_text, model_cls, call_type)
+        if result is not None:
+            structured_output_results.inc(call_type=call_type.value, outcome="repaired")
+            return result
+    
+    structured_output_results.inc(call_type=call_type.value, outcome="failed")
+    logger.warning(
+        "%s: 구조화 응답 파싱 실패 - 기본값 사용",
+        call_type.value,
+        extra={"response_preview": response_text[:200]}
+    )
+    return None
+
+
+async def _repair(response_text: str, model_cls: Type[ModelT], call_type: LLMCallType) -> Optional[ModelT]:
+    """모델에 JSON 수정 요청 (1회, 낮은 temperature)"""
+    schema = gemini_schema(model_cls)
+    generation = profile_for_call_type(call_type).with_overrides(
+        {"temperature": 0.0, "json_mode": True}
+    ).with_response_schema(schema)
+    prompt = REPAIR_PROMPT.format(
+        schema=json.dumps(schema, ensure_ascii=False),
+        response=response_text[:REPAIR_MAX_CHARS]
+    )
+    try:
+        repaired = await gemini_client.generate_response_async(prompt, call_type=call_type, generation=generation)
+    except HTTPException as e:
+        # 서킷 브레이커/예산 초과 등 - 수정 없이 실패 처리
+        logger.info("%s: JSON 수정 요청 실패 (%s)", call_type.value, e.detail)
+        return None
+    return _validate(model_cls, parse_json_object(repaired))
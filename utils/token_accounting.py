@@ -0,0 +1,314 @@
+"""
+LLM 토큰 사용량/비용 집계
+호출마다 프롬프트/출력 토큰 수를 호출 종류, 유저, 세션, 작품별로 모아 DB에 일별로 반영하고
+유저별 하루 토큰 예산을 관리
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+from fastapi import HTTPException
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+from utils.config import (
+    get_llm_user_daily_token_budget,
+    get_llm_user_token_budgets,
+    get_llm_token_prices,
+    get_token_usage_flush_seconds
+)
+
+if TYPE_CHECKING:
+    from utils.llm_backend import TokenUsage
+
+logger = get_logger(__name__)
+
+# 토큰/비용 지표 (/metrics)
+llm_tokens = metrics.counter("llm_tokens_total", "LLM tokens by kind (prompt/output)", ["call_type", "model", "kind"])
+llm_cost = metrics.counter("llm_cost_usd_total", "Estimated LLM cost in USD", ["call_type", "model"])
+llm_budget_rejections = metrics.counter("llm_budget_rejections_total", "LLM calls rejected by per-user daily token budget", ["call_type"])
+
+# 사용량 태그 (턴/요청 처리 중 자동으로 모든 LLM 호출에 붙음)
+_usage_tags: ContextVar[Dict[str, str]] = ContextVar("usage_tags", default={})
+
+# 집계 키: (날짜, 유저, 세션, 작품, 호출 종류, 모델)
+RollupKey = Tuple[str, str, str, str, str, str]
+
+
+class TokenBudgetExceededError(HTTPException):
+    """유저의 하루 토큰 예산을 넘겨 보내지 않은 LLM 호출"""
+    
+    def __init__(self, retry_after: float):
+        super().__init__(
+            status_code=429,
+            detail="오늘 사용할 수 있는 AI 응답 한도를 모두 사용했습니다. 내일 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, int(retry_after)))}
+        )
+
+
+@contextmanager
+def usage_tags(
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    work_id: Optional[str] = None
+) -> Iterator[None]:
+    """
+    블록 안의 LLM 호출에 유저/세션/작품 태그 지정 (바깥 태그에 덮어씀, 자식 태스크에도 적용)
+    """
+    tags = dict(_usage_tags.get())
+    for key, value in (("user_id", user_id), ("session_id", session_id), ("work_id", work_id)):
+        if value is not None:
+            tags[key] = value
+    token = _usage_tags.set(tags)
+    try:
+        yield
+    finally:
+        _usage_tags.reset(token)
+
+
+def _seconds_until_tomorrow() -> float:
+    now = datetime.now()
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (tomorrow - now).total_seconds()
+
+
+class TokenAccountant:
+    """
+    토큰 사용량 집계기 (싱글톤 패턴)
+    
+    - record: 호출 1건의 사용량을 메모리 집계에 누적, TOKEN_USAGE_FLUSH_SECONDS마다 DB(llm_usage_daily)에 반영
+      (이벤트 루프 안에서는 백그라운드 태스크가 스레드에서 반영)
+    - check_budget_async: 현재 유저가 하루 예산(LLM_USER_DAILY_TOKEN_BUDGET / LLM_USER_TOKEN_BUDGETS)을
+      넘겼으면 TokenBudgetExceededError (llm_scheduler가 슬롯을 주기 전에 호출, DB 조회는 스레드에서)
+    - 비용: LLM_TOKEN_PRICES 단가로 계산한 추정치
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TokenAccountant, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.default_budget = max(0, get_llm_user_daily_token_budget())
+        self.user_budgets = get_llm_user_token_budgets()
+        self.prices = get_llm_token_prices()
+        self.flush_seconds = max(0.0, get_token_usage_flush_seconds())
+        
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # DB 반영과 오늘 사용량 첫 조회 직렬화
+        self._pending: Dict[RollupKey, Dict] = {}
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Task] = None
+        # 예산 확인용 오늘 유저별 사용량 (예산이 있는 유저만, 처음 확인할 때 DB에서 불러옴)
+        self._day = date.today().isoformat()
+        self._daily_tokens: Dict[str, int] = {}
+        self._stats = {"calls": 0, "flushes": 0, "flush_errors": 0, "budget_rejections": 0}
+        self._initialized = True
+    
+    def get_tags(self) -> Dict[str, str]:
+        """현재 태스크의 사용량 태그"""
+        return dict(_usage_tags.get())
+    
+    def budget_for(self, user_id: str) -> int:
+        """유저의 하루 토큰 예산 (0이면 제한 없음)"""
+        return max(0, self.user_budgets.get(user_id, self.default_budget))
+    
+    def cost_of(self, model: str, prompt_tokens: int, output_tokens: int) -> float:
+        """추정 비용 (USD)"""
+        input_price, output_price = self.prices.get(model, (0.0, 0.0))
+        return (prompt_tokens * input_price + output_tokens * output_price) / 1_000_000
+    
+    def record(self, call_type: str, model_name: str, usage: "TokenUsage"):
+        """
+        호출 1건의 토큰 사용량 기록
+        
+        Args:
+            call_type: 호출 종류 (LLMCallType 값)
+            model_name: 모델 이름 ("models/" 접두사 포함 가능)
+            usage: 토큰 사용량 (추정값 포함)
+        """
+        model = model_name[7:] if model_name.startswith("models/") else model_name
+        prompt_tokens = usage.prompt_tokens or 0
+        output_tokens = usage.output_tokens or 0
+        cost = self.cost_of(model, prompt_tokens, output_tokens)
+        tags = _usage_tags.get()
+        user_id = tags.get("user_id", "")
+        
+        llm_tokens.inc(prompt_tokens, call_type=call_type, model=model, kind="prompt")
+        llm_tokens.inc(output_tokens, call_type=call_type, model=model, kind="output")
+        llm_cost.inc(cost, call_type=call_type, model=model)
+        
+        day = date.today().isoformat()
+        key = (day, user_id, tags.get("session_id", ""), tags.get("work_id", ""), call_type, model)
+        with self._lock:
+            self._stats["calls"] += 1
+            rollup = self._pending.get(key)
+            if rollup is None:
+                rollup = self._pending[key] = {
+                    "calls": 0, "estimated_calls": 0, "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0
+                }
+            rollup["calls"] += 1
+            rollup["estimated_calls"] += 1 if usage.estimated else 0
+            rollup["prompt_tokens"] += prompt_tokens
+            rollup["output_tokens"] += output_tokens
+            rollup["cost_usd"] += cost
+            
+            self._roll_day(day)
+            if user_id in self._daily_tokens:
+                self._daily_tokens[user_id] += prompt_tokens + output_tokens
+            
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+        
+        if due:
+            self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """DB 반영 예약 (이벤트 루프 안이면 백그라운드 태스크, 진행 중인 반영이 있으면 생략)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = loop.create_task(self.flush_async())
+    
+    async def flush_async(self):
+        """flush를 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        await asyncio.to_thread(self.flush)
+    
+    def flush(self):
+        """
+        메모리 집계를 DB에 반영 (동기 DB 호출, 실패하면 다음 반영 때 다시 시도)
+        
+        반영 중인 집계는 DB에도 메모리에도 없으므로, 끝날 때까지 _flush_lock으로
+        오늘 사용량 첫 조회(get_user_tokens_today)와 겹치지 않게 함
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+            if not pending:
+                return
+            
+            rollups = [
+                {
+                    "day": day, "user_id": user_id, "session_id": session_id,
+                    "work_id": work_id, "call_type": call_type, "model": model, **values
+                }
+                for (day, user_id, session_id, work_id, call_type, model), values in pending.items()
+            ]
+            # db.database → utils → llm_scheduler → 이 모듈 순환 import를 피하기 위해 사용 시점에 import
+            from db.database import SessionLocal, add_llm_usage
+            
+            db = SessionLocal()
+            try:
+                add_llm_usage(rollups, db)
+                self._stats["flushes"] += 1
+            except Exception as e:
+                db.rollback()
+                self._stats["flush_errors"] += 1
+                logger.warning("토큰 사용량 DB 반영 실패 (%d건, 다음에 재시도): %s", len(rollups), e)
+                with self._lock:
+                    for key, values in pending.items():
+                        rollup = self._pending.setdefault(key, {name: 0 for name in values})
+                        for name, value in values.items():
+                            rollup[name] += value
+            finally:
+                db.close()
+    
+    def _roll_day(self, day: str):
+        """날짜가 바뀌면 오늘 사용량 초기화 (lock 안에서 호출)"""
+        if day != self._day:
+            self._day = day
+            self._daily_tokens = {}
+    
+    def _cached_tokens_today(self, user_id: str) -> Optional[int]:
+        """이미 불러온 유저의 오늘 토큰 사용량 (없으면 None)"""
+        with self._lock:
+            self._roll_day(date.today().isoformat())
+            return self._daily_tokens.get(user_id)
+    
+    def get_user_tokens_today(self, user_id: str) -> int:
+        """유저의 오늘 토큰 사용량 (DB 반영분 + 메모리 집계분, 처음 조회 시 동기 DB 호출)"""
+        cached = self._cached_tokens_today(user_id)
+        if cached is not None:
+            return cached
+        
+        day = date.today().isoformat()
+        from db.database import SessionLocal, get_user_daily_tokens
+        
+        # 반영 중인 집계가 DB 조회와 메모리 합산 양쪽에서 빠지지 않도록 flush와 직렬화
+        with self._flush_lock:
+            db = SessionLocal()
+            try:
+                stored = get_user_daily_tokens(user_id, day, db)
+            finally:
+                db.close()
+            
+            with self._lock:
+                if user_id not in self._daily_tokens:
+                    pending = sum(
+                        values["prompt_tokens"] + values["output_tokens"]
+                        for key, values in self._pending.items()
+                        if key[0] == day and key[1] == user_id
+                    )
+                    self._daily_tokens[user_id] = stored + pending
+                return self._daily_tokens[user_id]
+    
+    async def check_budget_async(self, call_type: str):
+        """
+        현재 유저의 하루 토큰 예산 확인 (오늘 처음 확인하는 유저만 스레드에서 DB 조회)
+        
+        Raises:
+            TokenBudgetExceededError: 예산을 모두 쓴 경우 (429, 자정까지 Retry-After)
+        """
+        user_id = _usage_tags.get().get("user_id")
+        if not user_id:
+            return
+        budget = self.budget_for(user_id)
+        if budget <= 0:
+            return
+        used = self._cached_tokens_today(user_id)
+        if used is None:
+            used = await asyncio.to_thread(self.get_user_tokens_today, user_id)
+        if used >= budget:
+            self._stats["budget_rejections"] += 1
+            llm_budget_rejections.inc(call_type=call_type)
+            raise TokenBudgetExceededError(retry_after=_seconds_until_tomorrow())
+    
+    def get_budget_status(self, user_id: str) -> Dict:
+        """유저의 오늘 예산/사용량"""
+        budget = self.budget_for(user_id)
+        used = self.get_user_tokens_today(user_id)
+        return {
+            "user_id": user_id,
+            "day": date.today().isoformat(),
+            "budget_tokens": budget or None,
+            "used_tokens": used,
+            "remaining_tokens": max(0, budget - used) if budget else None,
+        }
+    
+    def get_stats(self) -> Dict:
+        """집계 상태"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            **self._stats,
+            "pending_rollups": pending,
+            "default_budget": self.default_budget or None,
+            "flush_seconds": self.flush_seconds,
+        }
+
+
+# 전역 인스턴스
+token_accountant = TokenAccountant()
@@ -0,0 +1,273 @@
+"""
+턴 단계별 트레이서
+채팅 턴 1회를 스팬 트리(시작/종료, 속성, 부모)로 기록하여 turn_id로 조회하고
+Server-Timing 헤더로 요약
+"""
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.config import get_trace_buffer_size
+
+# 스팬 상태
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+
+class Span:
+    """트레이스 구간 1개 (시각은 트레이스 시작 기준 perf_counter)"""
+    
+    __slots__ = ("span_id", "parent_id", "name", "attributes", "start", "end", "status", "error")
+    
+    def __init__(self, span_id: int, parent_id: Optional[int], name: str, attributes: Dict[str, Any]):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.status = STATUS_OK
+        self.error: Optional[str] = None
+    
+    @property
+    def duration_ms(self) -> Optional[float]:
+        """소요 시간 (밀리초, 진행 중이면 None)"""
+        if self.end is None:
+            return None
+        return (self.end - self.start) * 1000
+    
+    def set_attribute(self, key: str, value: Any):
+        """속성 추가/변경"""
+        self.attributes[key] = value
+    
+    def finish(self, error: Optional[BaseException] = None):
+        """스팬 종료 (예외가 있으면 상태 기록)"""
+        self.end = time.perf_counter()
+        if isinstance(error, asyncio.CancelledError):
+            self.status = STATUS_CANCELLED
+        elif error is not None:
+            self.status = STATUS_ERROR
+            self.error = f"{type(error).__name__}: {str(error)[:200]}"
+    
+    def to_dict(self, origin: float) -> Dict:
+        """딕셔너리 변환 (시작 시각은 트레이스 시작 기준 밀리초)"""
+        duration = self.duration_ms
+        data = {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(duration, 2) if duration is not None else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class TurnTrace:
+    """턴 1회의 스팬 모음 (첫 스팬이 루트)"""
+    
+    def __init__(self, turn_id: str):
+        self.turn_id = turn_id
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+    
+    @property
+    def root(self) -> Optional[Span]:
+        return self.spans[0] if self.spans else None
+    
+    def new_span(self, name: str, parent: Optional[Span], attributes: Dict[str, Any]) -> Span:
+        """스팬 생성 및 등록"""
+        span = Span(
+            span_id=len(self.spans) + 1,
+            parent_id=parent.span_id if parent else None,
+            name=name,
+            attributes=attributes
+        )
+        self.spans.append(span)
+        return span
+    
+    def server_timing(self) -> str:
+        """
+        Server-Timing 헤더 값 (루트 바로 아래 단계별 소요 시간 합계 + 전체, 백그라운드 작업 제외)
+        
+        예: location;dur=1.2, scene_reaction;dur=2310.5, summary;dur=812.0, total;dur=3190.4
+        """
+        root = self.root
+        if root is None:
+            return ""
+        
+        totals: Dict[str, float] = OrderedDict()
+        for span in self.spans:
+            if span.parent_id != root.span_id or span.duration_ms is None:
+                continue
+            # 턴과 분리된 백그라운드 작업은 응답 시간에 포함되지 않으므로 제외
+            if not span.attributes.get("background"):
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        
+        metrics = [f"{name};dur={duration:.1f}" for name, duration in totals.items()]
+        if root.duration_ms is not None:
+            metrics.append(f"total;dur={root.duration_ms:.1f}")
+        return ", ".join(metrics)
+    
+    def to_dict(self) -> Dict:
+        """스팬 트리 딕셔너리 (children으로 중첩)"""
+        nodes = {span.span_id: {**span.to_dict(self.origin), "children": []} for span in self.spans}
+        roots = []
+        for span in self.spans:
+            node = nodes[span.span_id]
+            if span.parent_id in nodes:
+                nodes[span.parent_id]["children"].append(node)
+            else:
+                roots.append(node)
+        
+        root = self.root
+        return {
+            "turn_id": self.turn_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(root.duration_ms, 2) if root and root.duration_ms is not None else None,
+            "span_count": len(self.spans),
+            "spans": roots,
+        }
+
+
+class TraceStore:
+    """
+    최근 턴 트레이스 보관소 (싱글톤 패턴)
+    
+    turn_id 기준 LRU로 TRACE_BUFFER_SIZE개까지 보관 (진행 중인 턴도 조회 가능)
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TraceStore, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        if self._initialized:
+            return
+        self.max_traces = max(0, get_trace_buffer_size())
+        self._traces: "OrderedDict[str, TurnTrace]" = OrderedDict()
+        self._initialized = True
+    
+    def add(self, trace: TurnTrace):
+        """트레이스 등록 (가장 오래된 트레이스부터 제거)"""
+        if self.max_traces <= 0:
+            return
+        self._traces[trace.turn_id] = trace
+        self._traces.move_to_end(trace.turn_id)
+        while len(self._traces) > self.max_traces:
+            self._traces.popitem(last=False)
+    
+    def get(self, turn_id: str) -> Optional[TurnTrace]:
+        """turn_id로 트레이스 조회"""
+        return self._traces.get(turn_id)
+    
+    def get_stats(self) -> Dict:
+        """보관 현황"""
+        return {"traces": len(self._traces), "max_traces": self.max_traces}
+
+
+# 현재 태스크의 트레이스/스팬 (asyncio 태스크 생성 시 복사되어 자식 태스크의 스팬이 부모 아래에 붙음)
+_current_trace: ContextVar[Optional[TurnTrace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def start_trace(turn_id: str, name: str = "turn", **attributes) -> Iterator[TurnTrace]:
+    """
+    턴 트레이스 시작 (루트 스팬 생성, 보관소에 등록)
+    
+    Args:
+        turn_id: 턴 ID (디버그 엔드포인트 조회 키)
+        name: 루트 스팬 이름
+        **attributes: 루트 스팬 속성
+    """
+    trace = TurnTrace(turn_id)
+    trace_store.add(trace)
+    trace_token = _current_trace.set(trace)
+    try:
+        with span(name, **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(trace_token)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    현재 스팬 아래에 자식 스팬 기록 (async 함수 안에서도 with로 사용)
+    
+    진행 중인 트레이스가 없으면 아무것도 기록하지 않음 (None 반환)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    
+    current = trace.new_span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.finish(e)
+        raise
+    else:
+        current.finish()
+    finally:
+        _current_span.reset(token)
+
+
+def traced(name: str, **attribute_getters: Callable[[Dict[str, Any]], Any]):
+    """
+    async 함수 호출 전체를 스팬으로 기록하는 데코레이터
+    
+    Args:
+        name: 스팬 이름
+        **attribute_getters: 속성 이름 → 호출 인자 딕셔너리에서 값을 꺼내는 함수
+            예: @traced("main_response", character=lambda args: args["character"].name)
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return await func(*args, **kwargs)
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            attributes = {key: getter(arguments) for key, getter in attribute_getters.items()}
+            with span(name, **attributes):
+                return await func(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
+
+
+def set_span_attributes(**attributes):
+    """현재 스팬에 속성 추가 (트레이스 밖이면 무시)"""
+    current = _current_span.get()
+    if current is not None and _current_trace.get() is not None:
+        current.attributes.update(attributes)
+
+
+def get_current_trace() -> Optional[TurnTrace]:
+    """현재 태스크의 트레이스"""
+    return _current_trace.get()
+
+
+# 전역 인스턴스
+trace_store = TraceStore()